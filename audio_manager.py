@@ -1,10 +1,13 @@
 # Arquivo: audio_manager.py
 # Gerenciador de áudio multiplataforma para POBChecker
 
+import logging
 import platform
 import subprocess
 import os
 
+logger = logging.getLogger(__name__)
+
 class AudioManager:
     """
     Classe para gerenciar reprodução de áudio em diferentes sistemas operacionais.
@@ -64,7 +67,7 @@ class AudioManager:
             bool: True se o som foi reproduzido com sucesso, False caso contrário
         """
         if not self.audio_available:
-            print(f"BEEP! (Áudio não disponível no sistema {self.system})")
+            logger.warning("BEEP! (Áudio não disponível no sistema %s)", self.system)
             return False
             
         try:
@@ -75,11 +78,11 @@ class AudioManager:
             elif self.system == "Darwin":
                 return self._play_macos_sound()
             else:
-                print(f"BEEP! (Sistema {self.system} não suportado)")
+                logger.warning("BEEP! (Sistema %s não suportado)", self.system)
                 return False
                 
         except Exception as e:
-            print(f"BEEP! (Erro ao reproduzir som: {e})")
+            logger.error("BEEP! (Erro ao reproduzir som: %s)", e)
             return False
     
     def _play_windows_beep(self, frequency, duration):
@@ -91,10 +94,10 @@ class AudioManager:
             winsound.Beep(frequency, duration)
             return True
         except ImportError:
-            print("BEEP! (winsound não disponível)")
+            logger.warning("BEEP! (winsound não disponível)")
             return False
         except Exception as e:
-            print(f"BEEP! (Erro no Windows: {e})")
+            logger.error("BEEP! (Erro no Windows: %s)", e)
             return False
     
     def _play_linux_sound(self, frequency, duration):
@@ -148,7 +151,7 @@ class AudioManager:
         except:
             pass
             
-        print("BEEP! (Nenhum método de áudio funcionou no Linux)")
+        logger.warning("BEEP! (Nenhum método de áudio funcionou no Linux)")
         return False
     
     def _play_macos_sound(self):
@@ -172,7 +175,7 @@ class AudioManager:
                 except:
                     continue
         
-        print("BEEP! (Nenhum som do sistema encontrado no macOS)")
+        logger.warning("BEEP! (Nenhum som do sistema encontrado no macOS)")
         return False
     
     def play_success_sound(self):
@@ -261,6 +264,8 @@ def play_error_sound():
 
 # Teste da funcionalidade (só executa se o script for chamado diretamente)
 if __name__ == "__main__":
+    from log_manager import setup_logging
+    setup_logging()
     print("=== Teste do AudioManager ===")
     print(f"Sistema: {audio_manager.system}")
     print(f"Áudio disponível: {audio_manager.audio_available}")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo: badge_corpus.py
+Descrição: Gerador de corpus sintético de crachás para medir a decodificação de QR.
+           Renderiza crachás no formato compacto P1 (qr_payload), como os impressos por
+           helper_generate_qrcodes, metade com nome e metade sem, e aplica distorções
+           controladas (desfoque, perspectiva, rotação, ruído, reflexo e escala).
+
+Uso:
+    python benchmarks/badge_corpus.py --output corpus_crachas --payloads 20
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+import cv2
+import numpy as np
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helper.helper_generate_qrcodes import build_qr_image
+from helper.helper_pob_generate import generate_cpf
+from qr_payload import encode_payload
+
+# Resolução de captura simulada (a mesma do CameraManager)
+FRAME_SIZE = (320, 240)
+
+# Lado do QR em relação à altura do frame, sem distorção
+DEFAULT_SCALE = 0.8
+
+# Cor de fundo (crachá segurado na frente da câmera)
+BACKGROUND = 200
+
+# Distorções e seus níveis, do mais leve ao mais severo
+DISTORTIONS = {
+    "clean": [0],
+    "blur": [1.0, 2.0, 3.0],               # sigma do desfoque gaussiano
+    "perspective": [0.05, 0.10, 0.15],     # deslocamento dos cantos (fração do frame)
+    "rotation": [15, 30, 45],              # graus
+    "noise": [10, 25, 40],                 # desvio padrão do ruído
+    "glare": [0.4, 0.7, 0.9],              # intensidade do reflexo
+    "scale": [0.6, 0.4, 0.25],             # lado do QR (fração da altura do frame)
+}
+
+FIRST_NAMES = ["João", "Maria", "José", "Ana", "Francisco", "Antônia", "Carlos", "Adriana",
+               "Paulo", "Juliana", "Luís", "Márcia", "Sebastião", "Conceição", "Raimundo"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+              "Pereira", "Lima", "Gomes", "Ribeiro", "Carvalho", "Araújo", "Conceição"]
+
+
+def random_payload(rng, include_name=True):
+    """Gera um conteúdo de crachá sintético no formato P1, com nome (P1...|NOME) ou sem."""
+    nome = " ".join([rng.choice(FIRST_NAMES)] + rng.sample(LAST_NAMES, rng.randint(1, 3)))
+    return encode_payload(generate_cpf(), nome if include_name else None)
+
+
+def render_badge(payload, scale=DEFAULT_SCALE):
+    """Renderiza o QR do crachá centralizado em um frame em cinza do tamanho de captura."""
+    width, height = FRAME_SIZE
+    qr = np.array(build_qr_image(payload, box_size=4, border=4).convert("L"))
+    side = max(21, int(height * scale))
+    qr = cv2.resize(qr, (side, side), interpolation=cv2.INTER_AREA)
+
+    frame = np.full((height, width), BACKGROUND, dtype=np.uint8)
+    top, left = (height - side) // 2, (width - side) // 2
+    frame[top:top + side, left:left + side] = qr
+    return frame
+
+
+def apply_distortion(frame, distortion, level, rng):
+    """Aplica uma distorção ao frame em cinza."""
+    height, width = frame.shape
+
+    if distortion == "blur":
+        return cv2.GaussianBlur(frame, (0, 0), level)
+
+    if distortion == "perspective":
+        src = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        jitter = np.float32([[rng.uniform(-1, 1), rng.uniform(-1, 1)] for _ in range(4)])
+        dst = src + jitter * level * np.float32([width, height])
+        matrix = cv2.getPerspectiveTransform(src, dst)
+        return cv2.warpPerspective(frame, matrix, (width, height), borderValue=BACKGROUND)
+
+    if distortion == "rotation":
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), level, 1.0)
+        return cv2.warpAffine(frame, matrix, (width, height), borderValue=BACKGROUND)
+
+    if distortion == "noise":
+        noise = np.random.default_rng(rng.randint(0, 2 ** 32 - 1)).normal(0, level, frame.shape)
+        return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+    if distortion == "glare":
+        cx = width / 2 + rng.uniform(-0.2, 0.2) * width
+        cy = height / 2 + rng.uniform(-0.2, 0.2) * height
+        radius = 0.3 * height
+        ys, xs = np.mgrid[0:height, 0:width]
+        glare = level * 255 * np.exp(-((xs - cx) ** 2 + (ys - cy) ** 2) / (2 * radius ** 2))
+        return np.clip(frame + glare, 0, 255).astype(np.uint8)
+
+    return frame
+
+
+def generate_corpus(payload_count=20, seed=42):
+    """
+    Gera o corpus: cada conteúdo é renderizado em todas as distorções e níveis.
+
+    Returns:
+        list: Amostras {'image', 'expected', 'distortion', 'level'} com imagem BGR
+    """
+    rng = random.Random(seed)
+    random.seed(seed)  # generate_cpf usa o gerador global
+    samples = []
+
+    for i in range(payload_count):
+        # Alterna crachás com e sem nome (helper_generate_qrcodes.INCLUDE_NAME)
+        payload = random_payload(rng, include_name=i % 2 == 0)
+        for distortion, levels in DISTORTIONS.items():
+            for level in levels:
+                if distortion == "scale":
+                    frame = render_badge(payload, scale=level)
+                else:
+                    frame = apply_distortion(render_badge(payload), distortion, level, rng)
+                samples.append({
+                    'image': cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR),
+                    'expected': payload,
+                    'distortion': distortion,
+                    'level': level,
+                })
+    return samples
+
+
+def save_corpus(samples, folder):
+    """Salva as imagens do corpus em PNG com um manifest.json."""
+    os.makedirs(folder, exist_ok=True)
+    manifest = []
+    for i, sample in enumerate(samples):
+        filename = f"{i:05d}_{sample['distortion']}_{sample['level']}.png"
+        cv2.imwrite(os.path.join(folder, filename), sample['image'])
+        manifest.append({
+            'file': filename,
+            'expected': sample['expected'],
+            'distortion': sample['distortion'],
+            'level': sample['level'],
+        })
+    with open(os.path.join(folder, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def load_corpus(folder):
+    """Carrega um corpus salvo por save_corpus."""
+    with open(os.path.join(folder, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    samples = []
+    for entry in manifest:
+        image = cv2.imread(os.path.join(folder, entry['file']), cv2.IMREAD_COLOR)
+        if image is not None:
+            samples.append(dict(entry, image=image))
+    return samples
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Gera o corpus sintético de crachás")
+    parser.add_argument("--output", default="corpus_crachas", help="Pasta de saída")
+    parser.add_argument("--payloads", type=int, default=20, help="Número de crachás diferentes")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório")
+    args = parser.parse_args()
+
+    print("POBCHECKER - GERADOR DE CORPUS DE CRACHÁS")
+    print("=" * 50)
+    samples = generate_corpus(args.payloads, args.seed)
+    save_corpus(samples, args.output)
+    print(f"✅ {len(samples)} imagens salvas em {os.path.abspath(args.output)}/")
+
+
+if __name__ == "__main__":
+    main()
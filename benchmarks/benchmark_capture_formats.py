@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo: benchmark_capture_formats.py
+Descrição: Compara o custo de CPU por frame dos formatos de captura (MJPEG x YUYV)
+           em 320x240, 640x480 e 1280x720: conversão do frame, extração da luminância
+           e decodificação de QR.
+
+Uso:
+    python benchmarks/benchmark_capture_formats.py              # câmera 0
+    python benchmarks/benchmark_capture_formats.py --camera 1 --frames 200
+    python benchmarks/benchmark_capture_formats.py --synthetic  # sem câmera
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qr_decoder import QRDecoder, to_gray
+
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720)]
+FORMATS = ["MJPG", "YUYV"]
+
+
+def fourcc_to_str(value):
+    """Converte o valor numérico de CAP_PROP_FOURCC em texto."""
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)) if value else "?"
+
+
+def bgr_to_yuyv(frame):
+    """Empacota um frame BGR em YUYV (4:2:2), como entregue pelo driver da câmera."""
+    yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV)
+    yuyv = np.empty(frame.shape[:2] + (2,), dtype=np.uint8)
+    yuyv[:, :, 0] = yuv[:, :, 0]
+    yuyv[:, 0::2, 1] = yuv[:, 0::2, 1]
+    yuyv[:, 1::2, 1] = yuv[:, 1::2, 2]
+    return yuyv
+
+
+def synthetic_frame(resolution):
+    """Cria um frame de teste com ruído e um padrão de alto contraste."""
+    width, height = resolution
+    rng = np.random.default_rng(42)
+    frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    cv2.rectangle(frame, (width // 4, height // 4), (3 * width // 4, 3 * height // 4), (255, 255, 255), -1)
+    cv2.rectangle(frame, (width // 3, height // 3), (2 * width // 3, 2 * height // 3), (0, 0, 0), -1)
+    return frame
+
+
+def cpu_ms(func, repeat):
+    """Executa func repetidamente e retorna (ms de CPU por chamada, último resultado)."""
+    result = None
+    start = time.process_time()
+    for _ in range(repeat):
+        result = func()
+    return (time.process_time() - start) * 1000 / repeat, result
+
+
+def benchmark_synthetic(fmt, resolution, frames, decoder):
+    """Mede o trabalho do retrieve() de cada formato a partir de um frame sintético."""
+    frame = synthetic_frame(resolution)
+
+    if fmt == "MJPG":
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        retrieve_ms, bgr = cpu_ms(lambda: cv2.imdecode(encoded, cv2.IMREAD_COLOR), frames)
+        gray_ms, gray = cpu_ms(lambda: to_gray(bgr), frames)
+    else:
+        yuyv = bgr_to_yuyv(frame)
+        # Com CAP_PROP_CONVERT_RGB = 0 o retrieve() não converte; o preview converte se necessário
+        retrieve_ms = 0.0
+        gray_ms, gray = cpu_ms(lambda: to_gray(yuyv), frames)
+
+    decode_ms, _ = cpu_ms(lambda: decoder.decode(gray), frames)
+    return {
+        'format': fmt,
+        'resolution': f"{resolution[0]}x{resolution[1]}",
+        'actual': f"{resolution[0]}x{resolution[1]} (sintético)",
+        'retrieve_ms': retrieve_ms,
+        'gray_ms': gray_ms,
+        'decode_ms': decode_ms,
+        'total_ms': retrieve_ms + gray_ms + decode_ms,
+    }
+
+
+def benchmark_camera(camera_index, fmt, resolution, frames, decoder):
+    """Mede o custo real de CPU por frame com a câmera no formato e resolução pedidos."""
+    cap = cv2.VideoCapture(camera_index)
+    if not cap.isOpened():
+        return None
+
+    try:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fmt))
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 0 if fmt == "YUYV" else 1)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, resolution[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
+
+        actual_format = fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
+        actual = (f"{int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
+                  f"{int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))} {actual_format}")
+
+        # Aquece a câmera (exposição automática, buffers do driver)
+        for _ in range(5):
+            cap.read()
+
+        retrieve_cpu = gray_cpu = decode_cpu = 0.0
+        measured = 0
+        for _ in range(frames):
+            if not cap.grab():
+                continue
+            start = time.process_time()
+            ret, frame = cap.retrieve()
+            retrieved = time.process_time()
+            if not ret or frame is None:
+                continue
+            gray = to_gray(frame)
+            converted = time.process_time()
+            decoder.decode(gray)
+            decoded = time.process_time()
+
+            retrieve_cpu += retrieved - start
+            gray_cpu += converted - retrieved
+            decode_cpu += decoded - converted
+            measured += 1
+
+        if not measured:
+            return None
+
+        return {
+            'format': fmt,
+            'resolution': f"{resolution[0]}x{resolution[1]}",
+            'actual': actual,
+            'retrieve_ms': retrieve_cpu * 1000 / measured,
+            'gray_ms': gray_cpu * 1000 / measured,
+            'decode_ms': decode_cpu * 1000 / measured,
+            'total_ms': (retrieve_cpu + gray_cpu + decode_cpu) * 1000 / measured,
+        }
+    finally:
+        cap.release()
+
+
+def print_table(results):
+    """Mostra os resultados em forma de tabela."""
+    print(f"\n{'Formato':<8} {'Resolução':<10} {'Obtido':<22} {'retrieve':>9} {'cinza':>8} {'decode':>8} {'total':>8}")
+    print("-" * 80)
+    for r in results:
+        print(f"{r['format']:<8} {r['resolution']:<10} {r['actual']:<22} "
+              f"{r['retrieve_ms']:>7.2f}ms {r['gray_ms']:>6.2f}ms {r['decode_ms']:>6.2f}ms {r['total_ms']:>6.2f}ms")
+    print("\nValores em ms de CPU por frame.")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de formatos de captura (MJPEG x YUYV)")
+    parser.add_argument("--camera", type=int, default=0, help="Índice da câmera (padrão: 0)")
+    parser.add_argument("--frames", type=int, default=100, help="Frames medidos por configuração")
+    parser.add_argument("--synthetic", action="store_true", help="Usa frames sintéticos em vez da câmera")
+    parser.add_argument("--json", help="Arquivo para salvar os resultados em JSON")
+    args = parser.parse_args()
+
+    print("POBCHECKER - BENCHMARK DE FORMATOS DE CAPTURA")
+    print("=" * 50)
+
+    decoder = QRDecoder(backend="opencv", multi=True)
+    results = []
+    for fmt in FORMATS:
+        for resolution in RESOLUTIONS:
+            print(f"Medindo {fmt} {resolution[0]}x{resolution[1]}...")
+            if args.synthetic:
+                result = benchmark_synthetic(fmt, resolution, args.frames, decoder)
+            else:
+                result = benchmark_camera(args.camera, fmt, resolution, args.frames, decoder)
+            if result is None:
+                print(f"  ✗ Câmera {args.camera} não entregou frames em {fmt} {resolution[0]}x{resolution[1]}")
+                continue
+            results.append(result)
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados salvos em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
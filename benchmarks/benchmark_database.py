@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo: benchmark_database.py
+Descrição: Micro-benchmark da camada de banco de dados (database.py) com históricos grandes.
+           Para cada tamanho de histórico mede a latência de cada método público do
+           Database, conta commits (e fsyncs estimados) por operação e registra o
+           EXPLAIN QUERY PLAN de cada consulta. Falha (código de saída 1) quando uma
+           consulta volta a varrer a tabela inteira ou a latência passa do limite.
+
+Uso:
+    python benchmarks/benchmark_database.py                                  # 10^3 a 10^6 linhas
+    python benchmarks/benchmark_database.py --sizes 1000 10000000 --workdir /tmp/bench_db
+    python benchmarks/benchmark_database.py --threshold-scale 4 --json resultado.json  # Raspberry Pi
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from qr_payload import encode_payload
+from helper.helper_load_generate import generate_load_database
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+# Meses de histórico gerado (acima dos 6 meses de retenção, para clean_old_records ter trabalho)
+HISTORY_MONTHS = 8
+# Linhas de CHECK_IN_OUT + CHECK_EVENT por pessoa em HISTORY_MONTHS meses (aproximado)
+ROWS_PER_PERSON = 31
+
+# Latência máxima por chamada (ms), antes de --threshold-scale
+DEFAULT_THRESHOLD_MS = 10
+THRESHOLD_MS = {
+    'find_people_by_search': 100,
+    'get_checks_in_event': 100,
+    'transaction (10 leituras)': 50,
+    'get_all_people': 1000,
+    'clean_old_records': 10000,
+}
+
+# Operações pontuais: a latência não deve crescer com o histórico (uso de índice).
+# Nas operações de UNBOUNDED_OPS o próprio resultado cresce com o cadastro/histórico
+GROWTH_LIMIT = 10
+GROWTH_FLOOR_MS = 0.05
+UNBOUNDED_OPS = {'find_people_by_search', 'get_people_by_group', 'get_all_people', 'get_checks_in_event',
+                 'count_people_on_board', 'clean_old_records'}
+
+# Varreduras completas aceitas (LIKE '%termo%' não usa índice; carga do cadastro inteiro)
+ALLOWED_SCANS = {
+    'find_people_by_search': {'POB'},
+    'get_all_people': {'POB'},
+}
+TABLES = ('POB', 'EVENTS', 'CHECK_EVENT', 'CHECK_IN_OUT')
+# Percorrer um índice de cobertura (ex.: índice parcial de quem está a bordo) não lê a tabela
+SCAN_PATTERN = re.compile(r"^SCAN (?:TABLE )?(\w+)\b(?! USING COVERING INDEX)")
+
+
+class StatementTracer:
+    """Registra os comandos SQL executados pela conexão (set_trace_callback)."""
+
+    def __init__(self, conn):
+        self.statements = []
+        conn.set_trace_callback(self.statements.append)
+
+    def reset(self):
+        self.statements.clear()
+
+    def commits(self):
+        return sum(1 for sql in self.statements if sql.strip().upper() == "COMMIT")
+
+
+def fsyncs_per_commit(conn):
+    """Estimativa de fsyncs por commit conforme journal_mode e synchronous."""
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0].lower()
+    synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+    if synchronous == 0:
+        return 0
+    if journal_mode == "wal":
+        return 1 if synchronous >= 2 else 0
+    # Rollback journal: journal, cabeçalho do journal e banco
+    return 3
+
+
+def query_plans(conn, statements):
+    """Executa EXPLAIN QUERY PLAN para os comandos que leem tabelas."""
+    plans = {}
+    for sql in statements:
+        if not re.match(r"\s*(SELECT|UPDATE|DELETE)", sql, re.IGNORECASE) or sql in plans:
+            continue
+        try:
+            rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+            plans[sql] = [row[-1] for row in rows]
+        except Exception as e:
+            plans[sql] = [f"erro: {e}"]
+    return plans
+
+
+def full_scans(plans, allowed):
+    """Tabelas varridas por completo nos planos, exceto as permitidas."""
+    scans = set()
+    for details in plans.values():
+        for detail in details:
+            match = SCAN_PATTERN.match(detail)
+            if match and match.group(1) in TABLES and match.group(1) not in allowed:
+                scans.add(match.group(1))
+    return sorted(scans)
+
+
+def build_database(rows, workdir):
+    """Gera (ou reaproveita) o banco com cerca de rows linhas de histórico."""
+    path = os.path.join(workdir, f"bench_{rows}.sqlite3")
+    if not os.path.exists(path):
+        people = max(30, rows // ROWS_PER_PERSON)
+        print(f"  Gerando banco com {people} pessoas ({HISTORY_MONTHS} meses)...")
+        generate_load_database(path, people_count=people, months=HISTORY_MONTHS)
+    return path
+
+
+def build_operations(db, rng):
+    """
+    Monta a lista de operações medidas: (nome, função sem argumentos, repetições).
+    Cada função usa dados diferentes a cada chamada quando a operação altera o banco.
+    """
+    db.cursor.execute("SELECT CPF, Name FROM POB")
+    people = db.cursor.fetchall()
+    rng.shuffle(people)
+    db.cursor.execute("SELECT MAX(ID) FROM EVENTS")
+    drill_id = db.cursor.fetchone()[0]
+
+    reads = 200
+    writes = 50
+    new_cpfs = iter(f"9{i:010d}" for i in range(10 ** 6))
+    pool = iter(people)
+
+    def take(count):
+        """Pessoas distintas para operações destrutivas (cicla se o cadastro for pequeno)."""
+        return [next(pool, people[i % len(people)]) for i in range(count)]
+
+    def cycle(items):
+        state = {'i': 0}
+
+        def next_item():
+            state['i'] += 1
+            return items[state['i'] % len(items)]
+        return next_item
+
+    person = cycle(people[:reads])
+    open_event = db.create_event()
+    event_people = take(writes)
+    recorded = iter(event_people)
+    removed = iter(event_people)
+    to_remove = iter(take(writes))
+    to_delete = iter(take(writes))
+    created_events = []
+
+    def record_event():
+        cpf, nome = next(recorded)
+        db.record_check_event(cpf, nome, open_event)
+
+    def remove_event():
+        db.remove_check_event(next(removed)[0], open_event)
+
+    def close_event():
+        if created_events:
+            db.close_event(created_events.pop())
+
+    def batch():
+        with db.transaction():
+            for _ in range(10):
+                cpf, nome = person()
+                db.record_check_in_out(cpf, nome, "IN")
+
+    return [
+        ('find_person_by_cpf', lambda: db.find_person_by_cpf(person()[0]), reads),
+        ('get_person_details', lambda: db.get_person_details(person()[0]), reads),
+        ('check_person_exists', lambda: db.check_person_exists(person()[0]), reads),
+        ('is_person_in_pob', lambda: db.is_person_in_pob(person()[0]), reads),
+        ('parse_qr_data', lambda: db.parse_qr_data(encode_payload(person()[0])), reads),
+        ('find_people_by_search', lambda: db.find_people_by_search(person()[1].split()[0][:4]), reads // 4),
+        ('get_people_by_group', lambda: db.get_people_by_group(rng.randint(1, 5)), reads // 4),
+        ('get_all_people', db.get_all_people, 3),
+        ('count_people_on_board', lambda: db.count_people_on_board(rng.choice([None, 1, 2, 3, 4, 5])), reads),
+        ('get_active_event', db.get_active_event, reads),
+        ('get_checks_in_event', lambda: db.get_checks_in_event(drill_id), reads // 4),
+        ('is_person_checked_in_event', lambda: db.is_person_checked_in_event(person()[0], drill_id), reads),
+        ('record_check_in_out', lambda: db.record_check_in_out(*person(), "IN"), writes),
+        ('transaction (10 leituras)', batch, writes // 5),
+        ('record_check_event', record_event, writes),
+        ('remove_check_event', remove_event, writes),
+        ('insert_person', lambda: db.insert_person(
+            {'cpf': next(new_cpfs), 'nome': "Pessoa Benchmark", 'grupo': 1, 'Onshore': 1}), writes),
+        ('add_person_to_pob', lambda: db.add_person_to_pob(next(new_cpfs), "Pessoa Benchmark", 1), writes),
+        ('update_person', lambda: db.update_person(person()[0], {'nome': person()[1], 'grupo': 2}), writes),
+        ('remove_person_from_pob', lambda: db.remove_person_from_pob(next(to_remove)[0]), writes),
+        ('delete_person', lambda: db.delete_person(next(to_delete)[0]), writes),
+        ('create_event', lambda: created_events.append(db.create_event()), writes),
+        ('close_event', close_event, writes),
+        ('clean_old_records', db.clean_old_records, 1),
+    ]
+
+
+def benchmark_size(rows, workdir, threshold_scale, seed):
+    """Executa todas as operações em uma cópia do banco de rows linhas."""
+    source = build_database(rows, workdir)
+    scratch = os.path.join(workdir, f"bench_{rows}_run.sqlite3")
+    shutil.copyfile(source, scratch)
+
+    db = Database(scratch)
+    fsyncs = fsyncs_per_commit(db.conn)
+    tracer = StatementTracer(db.conn)
+    rng = random.Random(seed)
+    operations = build_operations(db, rng)
+
+    results = []
+    for name, func, repeat in operations:
+        timings = []
+        commits = 0
+        statements = []
+        for i in range(repeat):
+            tracer.reset()
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+            commits += tracer.commits()
+            if i == 0:
+                statements = list(tracer.statements)
+
+        tracer.reset()
+        plans = query_plans(db.conn, statements)
+        scans = full_scans(plans, ALLOWED_SCANS.get(name, set()))
+        threshold = THRESHOLD_MS.get(name, DEFAULT_THRESHOLD_MS) * threshold_scale
+        median = statistics.median(timings)
+
+        results.append({
+            'operation': name,
+            'rows': rows,
+            'calls': repeat,
+            'median_ms': median,
+            'p95_ms': sorted(timings)[int(0.95 * (len(timings) - 1))],
+            'commits_per_call': commits / repeat,
+            'fsyncs_per_call': commits / repeat * fsyncs,
+            'full_scans': scans,
+            'threshold_ms': threshold,
+            'plans': plans,
+        })
+
+    db.conn.close()
+    os.remove(scratch)
+    return results
+
+
+def check_regressions(results):
+    """Retorna a lista de falhas: varreduras completas, latência acima do limite e crescimento."""
+    failures = []
+    for r in results:
+        if r['full_scans']:
+            failures.append(f"{r['operation']} ({r['rows']} linhas): varredura completa de {', '.join(r['full_scans'])}")
+        if r['median_ms'] > r['threshold_ms']:
+            failures.append(f"{r['operation']} ({r['rows']} linhas): {r['median_ms']:.2f}ms > {r['threshold_ms']:.0f}ms")
+
+    sizes = sorted({r['rows'] for r in results})
+    if len(sizes) > 1:
+        by_key = {(r['operation'], r['rows']): r['median_ms'] for r in results}
+        for name in sorted({r['operation'] for r in results} - UNBOUNDED_OPS):
+            smallest = max(by_key[(name, sizes[0])], GROWTH_FLOOR_MS)
+            largest = max(by_key[(name, sizes[-1])], GROWTH_FLOOR_MS)
+            if largest / smallest > GROWTH_LIMIT:
+                failures.append(f"{name}: latência cresceu {largest / smallest:.0f}x "
+                                f"de {sizes[0]} para {sizes[-1]} linhas")
+    return failures
+
+
+def print_table(results):
+    """Mostra os resultados em forma de tabela."""
+    print(f"\n{'Operação':<28} {'Linhas':>9} {'mediana':>9} {'p95':>9} {'commits':>8} {'fsyncs*':>8}  Plano")
+    print("-" * 100)
+    for r in results:
+        plan = "VARREDURA: " + ", ".join(r['full_scans']) if r['full_scans'] else "ok"
+        print(f"{r['operation']:<28} {r['rows']:>9} {r['median_ms']:>7.3f}ms {r['p95_ms']:>7.3f}ms "
+              f"{r['commits_per_call']:>8.2f} {r['fsyncs_per_call']:>8.2f}  {plan}")
+    print("\nValores por chamada. *fsyncs estimados pelo journal_mode/synchronous do banco.")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark da camada de banco de dados")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Tamanhos do histórico em linhas (padrão: 10^3 a 10^6)")
+    parser.add_argument("--workdir", help="Pasta dos bancos gerados (reaproveitados entre execuções)")
+    parser.add_argument("--threshold-scale", type=float, default=1.0,
+                        help="Multiplicador dos limites de latência (ex.: 4 no Raspberry Pi)")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument("--json", help="Arquivo para salvar os resultados em JSON")
+    args = parser.parse_args()
+
+    print("POBCHECKER - BENCHMARK DO BANCO DE DADOS")
+    print("=" * 50)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="pobchecker_bench_")
+    os.makedirs(workdir, exist_ok=True)
+
+    results = []
+    for rows in args.sizes:
+        print(f"Medindo histórico de {rows} linhas...")
+        results.extend(benchmark_size(rows, workdir, args.threshold_scale, args.seed))
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Resultados salvos em {args.json}")
+
+    failures = check_regressions(results)
+    if failures:
+        print(f"\n❌ {len(failures)} regressões encontradas:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Nenhuma regressão encontrada")
+
+
+if __name__ == "__main__":
+    main()
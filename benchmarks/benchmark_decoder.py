@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo: benchmark_decoder.py
+Descrição: Mede precisão x velocidade de cada configuração de decodificação de QR
+           sobre o corpus sintético de crachás: taxa de decodificação, leituras falsas
+           e ms por frame, no total e por distorção.
+
+Uso:
+    python benchmarks/benchmark_decoder.py
+    python benchmarks/benchmark_decoder.py --corpus corpus_crachas --json resultado.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import PREPROCESSING_TIERS
+from qr_decoder import QRDecoder, pyzbar
+from benchmarks.badge_corpus import generate_corpus, load_corpus
+
+# Configurações de decodificação usadas pelo CameraManager
+DECODER_CONFIGS = {
+    "opencv": {'backend': "opencv", 'multi': False},
+    "opencv_multi": {'backend': "opencv", 'multi': True},
+    "opencv_multi_tiers": {'backend': "opencv", 'multi': True, 'tiers': PREPROCESSING_TIERS},
+    "pyzbar": {'backend': "pyzbar", 'multi': True},
+    "both": {'backend': "both", 'multi': True},
+    "both_tiers": {'backend': "both", 'multi': True, 'tiers': PREPROCESSING_TIERS},
+}
+
+
+def available_configs():
+    """Retorna as configurações executáveis neste sistema (pyzbar é opcional)."""
+    return {
+        name: config for name, config in DECODER_CONFIGS.items()
+        if pyzbar is not None or config['backend'] == "opencv"
+    }
+
+
+def run_config(name, config, samples):
+    """Executa uma configuração sobre todo o corpus e retorna as métricas."""
+    decoder = QRDecoder(**config)
+    decoded = false_reads = 0
+    elapsed = 0.0
+    by_distortion = {}
+
+    for sample in samples:
+        start = time.perf_counter()
+        results = decoder.decode(sample['image'])
+        elapsed += time.perf_counter() - start
+
+        ok = sample['expected'] in results
+        decoded += ok
+        false_reads += sum(1 for data in results if data != sample['expected'])
+
+        stats = by_distortion.setdefault(sample['distortion'], {'total': 0, 'decoded': 0})
+        stats['total'] += 1
+        stats['decoded'] += ok
+
+    total = len(samples)
+    return {
+        'config': name,
+        'samples': total,
+        'decode_rate': decoded / total if total else 0.0,
+        'false_reads': false_reads,
+        'ms_per_frame': elapsed * 1000 / total if total else 0.0,
+        'by_distortion': {
+            distortion: stats['decoded'] / stats['total']
+            for distortion, stats in by_distortion.items()
+        },
+        'tiers': decoder.get_tier_stats(),
+    }
+
+
+def print_table(results):
+    """Mostra os resultados em forma de tabela."""
+    distortions = list(results[0]['by_distortion']) if results else []
+
+    print(f"\n{'Configuração':<20} {'Taxa':>7} {'Falsas':>7} {'ms/frame':>9}")
+    print("-" * 46)
+    for r in results:
+        print(f"{r['config']:<20} {r['decode_rate']:>6.1%} {r['false_reads']:>7} {r['ms_per_frame']:>9.2f}")
+
+    print(f"\nTaxa de decodificação por distorção:")
+    print(f"{'Configuração':<20} " + " ".join(f"{d[:11]:>11}" for d in distortions))
+    for r in results:
+        print(f"{r['config']:<20} " + " ".join(f"{r['by_distortion'][d]:>11.1%}" for d in distortions))
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de precisão x velocidade da decodificação de QR")
+    parser.add_argument("--corpus", help="Pasta de corpus salvo (padrão: gera em memória)")
+    parser.add_argument("--payloads", type=int, default=20, help="Crachás diferentes no corpus gerado")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do corpus gerado")
+    parser.add_argument("--config", action="append", help="Executa apenas esta configuração (repetível)")
+    parser.add_argument("--json", help="Arquivo para salvar os resultados em JSON")
+    args = parser.parse_args()
+
+    print("POBCHECKER - BENCHMARK DE DECODIFICAÇÃO DE QR")
+    print("=" * 50)
+
+    if args.corpus:
+        samples = load_corpus(args.corpus)
+    else:
+        samples = generate_corpus(args.payloads, args.seed)
+    print(f"Corpus: {len(samples)} imagens")
+
+    configs = available_configs()
+    if args.config:
+        configs = {name: configs[name] for name in args.config if name in configs}
+
+    results = []
+    for name, config in configs.items():
+        print(f"Executando {name}...")
+        results.append(run_config(name, config, samples))
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nResultados salvos em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
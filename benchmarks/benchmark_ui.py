@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo: benchmark_ui.py
+Descrição: Benchmark da interface (AttendanceChecker real, sem câmera) em um servidor X
+           virtual (Xvfb). Preenche o cadastro com tamanhos crescentes e mede
+           update_person_list, change_group e a troca de modo por handle_qr_event,
+           além dos travamentos do loop principal do Tk durante cada operação.
+
+Uso:
+    python benchmarks/benchmark_ui.py                        # inicia o Xvfb se não houver DISPLAY
+    python benchmarks/benchmark_ui.py --sizes 100 1000 5000 --repeat 5 --json resultado.json
+    xvfb-run -a python benchmarks/benchmark_ui.py
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from helper.helper_load_generate import generate_people
+
+DEFAULT_SIZES = [100, 500, 1000, 2000]
+
+# Intervalo do batimento usado para detectar travamentos do loop principal
+HEARTBEAT_MS = 10
+# Atraso acima do batimento considerado travamento
+STALL_MS = 50
+# Pausa entre operações, para o loop principal processar eventos pendentes
+PAUSE_MS = 200
+
+
+def start_virtual_display(display=":99"):
+    """Inicia o Xvfb quando não há DISPLAY. Retorna o processo (ou None se já havia display)."""
+    if os.environ.get("DISPLAY"):
+        return None
+
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        print("❌ Xvfb não encontrado. Instale o pacote xvfb ou execute com xvfb-run.")
+        sys.exit(1)
+
+    process = subprocess.Popen(
+        [xvfb, display, "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.environ["DISPLAY"] = display
+    time.sleep(1.0)  # Aguarda o servidor X aceitar conexões
+    return process
+
+
+def create_roster(db_file, size, seed):
+    """Cria um banco com size pessoas a bordo, divididas entre os grupos 1 e 2."""
+    rng = random.Random(seed)
+    random.seed(seed)  # generate_cpf usa o gerador global
+    people = generate_people(size, rng)
+
+    db = Database(db_file)
+    with db.transaction():
+        db.cursor.executemany(
+            "INSERT INTO POB (CPF, Name, GroupNumber, Onshore) VALUES (?, ?, ?, 0)",
+            ((cpf, nome, 1 + i % 2) for i, (cpf, nome, _) in enumerate(people))
+        )
+    db.conn.close()
+
+
+class StallMonitor:
+    """Batimento periódico no loop do Tk: atrasos acima de STALL_MS indicam travamento."""
+
+    def __init__(self, root):
+        self.root = root
+        self.running = False
+        self.last_tick = 0
+        self.stalls = []
+
+    def start(self):
+        self.running = True
+        self.last_tick = time.perf_counter()
+        self.root.after(HEARTBEAT_MS, self._tick)
+
+    def stop(self):
+        self.running = False
+
+    def _tick(self):
+        now = time.perf_counter()
+        delay = (now - self.last_tick) * 1000 - HEARTBEAT_MS
+        if delay > STALL_MS:
+            self.stalls.append(delay)
+        self.last_tick = now
+        if self.running:
+            self.root.after(HEARTBEAT_MS, self._tick)
+
+    def take(self):
+        """Retorna e limpa os travamentos registrados."""
+        stalls, self.stalls = self.stalls, []
+        return stalls
+
+
+def benchmark_size(size, repeat, workdir, seed):
+    """Mede as operações da interface com um cadastro de size pessoas."""
+    from pobchecker_terminal import AttendanceChecker
+
+    db_file = os.path.join(workdir, f"ui_{size}.sqlite3")
+    # Remove também o diário e o snapshot da execução anterior (o diário seria reaplicado ao banco novo)
+    for path in (db_file, f"{db_file}.scans", f"{db_file}.snapshot"):
+        if os.path.exists(path):
+            os.remove(path)
+    create_roster(db_file, size, seed)
+
+    start = time.perf_counter()
+    app = AttendanceChecker(db_file=db_file, enable_camera=False)
+    app.root.update()
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    sequence = [
+        ("update_person_list (CIO)", app.update_person_list),
+        ("change_group", lambda: app.change_group("Grupo 2")),
+        ("change_group (todos)", lambda: app.change_group("Todos")),
+        ("change_group", lambda: app.change_group("Grupo 1")),
+        ("handle_qr_event CIO→CEV", app.handle_qr_event),
+        ("update_person_list (CEV)", app.update_person_list),
+        ("handle_qr_event CEV→CIO", app.handle_qr_event),
+    ]
+    steps = sequence * repeat
+    timings = {}
+    stalls = {}
+    monitor = StallMonitor(app.root)
+    state = {'index': 0, 'previous': None}
+
+    def next_step():
+        # Travamentos detectados desde a operação anterior são atribuídos a ela
+        if state['previous']:
+            stalls.setdefault(state['previous'], []).extend(monitor.take())
+
+        if state['index'] >= len(steps):
+            monitor.stop()
+            app.root.quit()
+            return
+
+        name, func = steps[state['index']]
+        state['index'] += 1
+        state['previous'] = name
+
+        begin = time.perf_counter()
+        func()
+        app.root.update_idletasks()  # Inclui o cálculo de layout dos widgets criados
+        timings.setdefault(name, []).append((time.perf_counter() - begin) * 1000)
+
+        app.after(PAUSE_MS, next_step)
+
+    monitor.start()
+    app.after(PAUSE_MS, next_step)
+    app.mainloop()
+
+    # on_closing() confirma as leituras pendentes e fecha o banco
+    app.on_closing()
+
+    results = [{'operation': "startup", 'size': size, 'median_ms': startup_ms,
+                'max_ms': startup_ms, 'max_stall_ms': 0.0, 'stalls': 0}]
+    for name, values in timings.items():
+        name_stalls = stalls.get(name, [])
+        results.append({
+            'operation': name,
+            'size': size,
+            'median_ms': statistics.median(values),
+            'max_ms': max(values),
+            'max_stall_ms': max(name_stalls, default=0.0),
+            'stalls': len(name_stalls),
+        })
+    return results
+
+
+def print_table(results):
+    """Mostra os resultados em forma de tabela."""
+    print(f"\n{'Operação':<28} {'Pessoas':>8} {'mediana':>10} {'máximo':>10} {'travamentos':>12} {'maior':>10}")
+    print("-" * 84)
+    for r in results:
+        print(f"{r['operation']:<28} {r['size']:>8} {r['median_ms']:>8.1f}ms {r['max_ms']:>8.1f}ms "
+              f"{r['stalls']:>12} {r['max_stall_ms']:>8.1f}ms")
+    print(f"\nTravamento = atraso do loop do Tk acima de {STALL_MS}ms.")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark da interface do terminal em Xvfb")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Tamanhos do cadastro (padrão: 100 500 1000 2000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições de cada operação")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument("--json", help="Arquivo para salvar os resultados em JSON")
+    args = parser.parse_args()
+
+    print("POBCHECKER - BENCHMARK DA INTERFACE")
+    print("=" * 50)
+
+    xvfb = start_virtual_display()
+    workdir = tempfile.mkdtemp(prefix="pobchecker_ui_")
+    try:
+        results = []
+        for size in args.sizes:
+            print(f"Medindo cadastro de {size} pessoas...")
+            results.extend(benchmark_size(size, args.repeat, workdir, args.seed))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if xvfb:
+            xvfb.terminate()
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Resultados salvos em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
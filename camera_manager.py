@@ -4,46 +4,143 @@ camera_manager.py - Gerenciador de câmera para detecção de QR codes
 """
 
 import cv2
+import logging
+import multiprocessing
+import queue
 import threading
 import time
+import numpy as np
 from PIL import Image
 import customtkinter as ctk
+from qr_decoder import QRDecoder, merge_tier_stats, tier_report
+import frame_ring_buffer
+from frame_ring_buffer import FrameRingBuffer
+from ui_dispatcher import UIDispatcher, PRIORITY_SCAN, PRIORITY_STATUS, PRIORITY_PREVIEW
+
+logger = logging.getLogger(__name__)
 
 
 class CameraManager:
     """Gerenciador de câmera com detecção de QR codes e display de vídeo."""
     
-    def __init__(self, video_canvas, on_qr_detected=None):
+    def __init__(self, video_canvas, on_qr_detected=None, on_qr_batch_detected=None,
+                 camera_index=None, decoder_pool=None, decode_processes=0,
+                 capture_resolution=(320, 240), burst_resolution=None,
+                 decode_fps=15, preview_fps=10, capture_format=None,
+                 preprocessing_tiers=(), tier_budget_ms=30, decoder_backend="opencv",
+                 scan_cooldown=3, dispatcher=None):
         """
         Inicializa o gerenciador de câmera.
         
         Args:
             video_canvas: Widget CTkLabel onde o vídeo será exibido
             on_qr_detected: Callback chamado quando QR code é detectado (função que recebe o conteúdo do QR)
+            on_qr_batch_detected: Callback opcional que recebe a lista de QR codes novos de um mesmo frame.
+                Quando definido, substitui on_qr_detected.
+            camera_index: Índice fixo da câmera. None testa automaticamente os índices 0 e 1.
+            decoder_pool: Executor (concurrent.futures) compartilhado para decodificar os frames.
+                None decodifica na própria thread de captura.
+            decode_processes: Número de processos de decodificação alimentados por um buffer
+                circular em memória compartilhada (0 = decodifica em threads).
+            capture_resolution: Resolução (largura, altura) do fluxo contínuo de captura
+            burst_resolution: Resolução da rajada de decodificação em dois estágios. Quando definida,
+                um QR localizado mas não decodificado na baixa resolução dispara uma rajada curta
+                de frames nesta resolução. None desativa a captura em dois estágios.
+            decode_fps: Taxa máxima de frames enviados para decodificação de QR
+            preview_fps: Taxa máxima de atualização do preview na interface
+            capture_format: FOURCC pedido à câmera ("MJPG" ou "YUYV"). Em YUYV os frames chegam
+                sem conversão e a decodificação usa direto o plano Y. None mantém o padrão do driver.
+            preprocessing_tiers: Níveis de pré-processamento (CLAHE, limiar adaptativo, nitidez,
+                pirâmide) tentados só quando um QR é localizado mas não decodificado no frame bruto
+            tier_budget_ms: Tempo máximo por frame gasto nesses níveis
+            decoder_backend: Biblioteca de decodificação ("opencv", "pyzbar" ou "both")
+            scan_cooldown: Segundos até o mesmo QR code ser aceito novamente
+            dispatcher: UIDispatcher que entrega leituras e previews à thread principal.
+                None cria um próprio (o construtor deve ser chamado na thread principal).
         """
         self.video_canvas = video_canvas
+        if dispatcher is None:
+            dispatcher = UIDispatcher(video_canvas)
+            dispatcher.start()
+        self.dispatcher = dispatcher
         self.on_qr_detected = on_qr_detected
+        self.on_qr_batch_detected = on_qr_batch_detected
         
         # Configurações da câmera
+        self.camera_index = camera_index
+        self.capture_format = capture_format
+        self.active_format = None  # FOURCC efetivamente negociado com a câmera
         self.cap = None
         self.camera_active = False
         self.camera_thread = None
+        self._loop_generation = 0  # Invalida loops antigos após uma reconexão
+        
+        # Última configuração (índice, backend) que funcionou e horário do último frame lido
+        self.last_good_config = None
+        self.last_frame_time = 0
         
-        # Detector de QR Code
-        self.qr_detector = cv2.QRCodeDetector()
+        # Decodificador de QR Code (vários códigos por frame, pré-processamento em níveis)
+        self.preprocessing_tiers = tuple(preprocessing_tiers)
+        self.tier_budget_ms = tier_budget_ms
+        self.qr_decoder = QRDecoder(
+            backend=decoder_backend, multi=True,
+            tiers=self.preprocessing_tiers, tier_budget_ms=tier_budget_ms
+        )
         
         # Controle de detecção de QR (evita múltiplas detecções)
         self.last_scanned_qr = None
         self.last_scan_time = 0
-        self.scan_cooldown = 3  # segundos
+        self.scan_cooldown = scan_cooldown  # segundos
+        self.recent_scans = {}  # conteúdo do QR -> horário da última leitura aceita
+        # A captura (rajada), o pool de decodificação e o coletor dos processos filtram leituras
+        self._scan_lock = threading.Lock()
+        
+        # Pool de decodificação compartilhado (múltiplas câmeras)
+        self.decoder_pool = decoder_pool
+        self._pending_decode = None
+        
+        # Decodificação em processos (contorna o GIL nos núcleos do Raspberry Pi)
+        self.decode_processes = decode_processes
+        self.frame_ring = None
+        self.frame_shape = None
+        self._decode_workers = []
+        self._decode_results = None
+        self._decode_stop = None
+        self._results_thread = None
+        # Contadores por nível recebidos dos processos de decodificação
+        self._worker_tier_stats = {}
+        self._worker_tier_lock = threading.Lock()
+        
+        # Captura em dois estágios (detecção em baixa resolução, rajada em alta resolução)
+        self.capture_resolution = capture_resolution
+        self.burst_resolution = burst_resolution
+        self.burst_frames = 3
+        # Decodificador próprio da rajada (o principal pode estar em uso no pool de decodificação)
+        self.burst_decoder = QRDecoder(
+            backend=decoder_backend, multi=True,
+            tiers=self.preprocessing_tiers, tier_budget_ms=tier_budget_ms
+        ) if burst_resolution else None
+        self.burst_cooldown = 1.0  # segundos entre rajadas
+        self._burst_requested = False
+        self._last_burst_time = 0
+        self.burst_count = 0
+        self.burst_success = 0
+        self.switch_time_total = 0.0
+        self.switch_time_last = 0.0
         
         # Estatísticas
         self.frame_count = 0
+        self.retrieved_count = 0
         self.fps_target = 30
+        self.decode_fps = decode_fps
+        self.preview_fps = preview_fps
+        self.decode_count = 0
+        self.dropped_decode_frames = 0
+        self.qr_count = 0
         
     def init_camera(self):
         """Inicializa a câmera com tratamento robusto de erros."""
-        print("CameraManager: Inicializando câmera...")
+        logger.info("Inicializando câmera...")
         
         try:
             # Libera qualquer câmera que possa estar em uso
@@ -53,20 +150,9 @@ class CameraManager:
             # Aguarda um pouco para garantir que a câmera seja liberada
             time.sleep(0.5)
                 
-            # Configurações de câmera para tentar (índice, backend)
-            camera_configs = [
-                (0, cv2.CAP_DSHOW),  # DirectShow no Windows
-                (0, cv2.CAP_MSMF),   # Media Foundation no Windows  
-                (0, cv2.CAP_ANY),    # Qualquer backend disponível
-                (1, cv2.CAP_DSHOW),  # Segunda câmera com DirectShow
-                (1, cv2.CAP_MSMF),   # Segunda câmera com Media Foundation
-                (0, None),           # Sem backend específico
-                (1, None),           # Segunda câmera sem backend específico
-            ]
-            
-            for config in camera_configs:
+            for config in self._camera_configs():
                 index, backend = config
-                print(f"CameraManager: Tentando câmera {index} com backend {backend}...")
+                logger.info("Tentando câmera %s com backend %s...", index, backend)
                 
                 try:
                     if backend is not None:
@@ -76,155 +162,488 @@ class CameraManager:
                     
                     if self.cap.isOpened():
                         # Configura propriedades otimizadas da câmera
-                        #self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                        #self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-                        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)                        
+                        self._negotiate_format()
+                        self._set_resolution(self.capture_resolution)
                         self.cap.set(cv2.CAP_PROP_FPS, self.fps_target)
                         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduz latência
                         
                         # Testa se consegue ler um frame
                         ret, frame = self.cap.read()
                         if ret and frame is not None and frame.size > 0:
-                            print(f"CameraManager: ✓ Câmera inicializada (índice {index}, backend {backend})")
-                            print(f"CameraManager: Resolução: {frame.shape[1]}x{frame.shape[0]}")
+                            self.frame_shape = frame.shape
+                            self.last_good_config = (index, backend)
+                            logger.info("✓ Câmera inicializada (índice %s, backend %s)", index, backend)
+                            logger.info("Resolução: %sx%s, formato %s", frame.shape[1], frame.shape[0], self.active_format)
                             return True
                         else:
-                            print(f"CameraManager: Câmera {index} abre mas não lê frames válidos")
+                            logger.warning("Câmera %s abre mas não lê frames válidos", index)
                             self.cap.release()
                     else:
-                        print(f"CameraManager: Não foi possível abrir câmera {index}")
+                        logger.warning("Não foi possível abrir câmera %s", index)
                         
                 except Exception as e:
-                    print(f"CameraManager: Erro ao tentar câmera {index}: {e}")
+                    logger.error("Erro ao tentar câmera %s: %s", index, e)
                     if self.cap:
                         self.cap.release()
                     
             # Se chegou aqui, nenhuma câmera funcionou
-            print("CameraManager: ✗ Nenhuma câmera funcional encontrada")
+            logger.error("✗ Nenhuma câmera funcional encontrada")
             self.cap = None
             return False
             
         except Exception as e:
-            print(f"CameraManager: Erro crítico ao inicializar câmera: {e}")
+            logger.error("Erro crítico ao inicializar câmera: %s", e)
             import traceback
             traceback.print_exc()
             self.cap = None
             return False
     
+    def _camera_configs(self):
+        """Retorna as configurações de câmera para tentar (índice, backend), a última que funcionou primeiro."""
+        configs = self._default_camera_configs()
+        if self.last_good_config in configs:
+            configs.remove(self.last_good_config)
+            configs.insert(0, self.last_good_config)
+        return configs
+    
+    def _default_camera_configs(self):
+        """Retorna a lista padrão de configurações de câmera (índice, backend)."""
+        if self.camera_index is not None:
+            index = self.camera_index
+            return [
+                (index, cv2.CAP_DSHOW),  # DirectShow no Windows
+                (index, cv2.CAP_MSMF),   # Media Foundation no Windows
+                (index, cv2.CAP_ANY),    # Qualquer backend disponível
+                (index, None),           # Sem backend específico
+            ]
+        
+        return [
+            (0, cv2.CAP_DSHOW),  # DirectShow no Windows
+            (0, cv2.CAP_MSMF),   # Media Foundation no Windows  
+            (0, cv2.CAP_ANY),    # Qualquer backend disponível
+            (1, cv2.CAP_DSHOW),  # Segunda câmera com DirectShow
+            (1, cv2.CAP_MSMF),   # Segunda câmera com Media Foundation
+            (0, None),           # Sem backend específico
+            (1, None),           # Segunda câmera sem backend específico
+        ]
+    
     def start_camera(self):
         """Inicia a captura de vídeo da câmera."""
         if not self.init_camera():
             self._show_error_message("Câmera não encontrada ou não pôde ser inicializada.")
             return False
             
+        self._start_capture_threads()
+        return True
+    
+    def _start_capture_threads(self):
+        """Inicia (ou reinicia) a thread de captura e, se houver, os processos de decodificação."""
+        if self.decode_processes > 0 and self.frame_ring is None:
+            self._start_decode_processes()
+            
         self.camera_active = True
-        self.camera_thread = threading.Thread(target=self._video_loop, daemon=True)
+        self._loop_generation += 1
+        self.last_frame_time = time.time()
+        if self.frame_ring is not None and not (self._results_thread and self._results_thread.is_alive()):
+            self._results_thread = threading.Thread(target=self._collect_decode_results, daemon=True)
+            self._results_thread.start()
+        self.camera_thread = threading.Thread(
+            target=self._video_loop, args=(self._loop_generation,), daemon=True
+        )
         self.camera_thread.start()
-        print("CameraManager: Thread de vídeo iniciada")
+        logger.info("Thread de vídeo iniciada")
+    
+    def reconnect(self):
+        """
+        Libera e reabre a câmera (usado pelo CameraWatchdog), tentando primeiro a última
+        configuração que funcionou. Os processos de decodificação são mantidos.
+        
+        Returns:
+            bool: True se a câmera voltou a capturar
+        """
+        logger.info("Reconectando câmera...")
+        
+        # Invalida o loop atual; mesmo que esteja bloqueado em read(), ele termina ao voltar
+        self._loop_generation += 1
+        old_thread = self.camera_thread
+        if old_thread and old_thread.is_alive():
+            old_thread.join(timeout=2.0)
+        if old_thread and old_thread.is_alive():
+            # Ainda bloqueada em grab()/read(): liberar a captura em uso por outra thread pode
+            # derrubar o processo. A thread antiga a libera ao sair; aqui abre-se uma nova.
+            logger.warning("Thread de vídeo anterior ainda bloqueada; a captura antiga será liberada por ela")
+            self.cap = None
+        
+        if not self.init_camera():
+            return False
+        
+        self._start_capture_threads()
         return True
     
     def stop_camera(self):
         """Para a captura de vídeo e libera recursos."""
-        print("CameraManager: Parando câmera...")
+        logger.info("Parando câmera...")
         self.camera_active = False
+        self._loop_generation += 1
         
         # Aguarda a thread finalizar
         if self.camera_thread and self.camera_thread.is_alive():
             self.camera_thread.join(timeout=2.0)
+        if self.camera_thread and self.camera_thread.is_alive():
+            # Bloqueada em grab(): a thread libera a captura ao sair (ver reconnect)
+            self.cap = None
+        
+        self._stop_decode_processes()
             
         # Libera a câmera
         if self.cap is not None:
             try:
                 if self.cap.isOpened():
                     self.cap.release()
-                    print("CameraManager: ✓ Câmera liberada")
+                    logger.info("✓ Câmera liberada")
             except Exception as e:
-                print(f"CameraManager: Erro ao liberar câmera: {e}")
+                logger.error("Erro ao liberar câmera: %s", e)
         
         self.cap = None
-        print("CameraManager: Câmera parada")
+        logger.info("Câmera parada")
+    
+    def _negotiate_format(self):
+        """
+        Pede à câmera o formato de captura configurado (FOURCC) e registra o formato aceito.
+        Em YUYV desativa a conversão para BGR, para que a decodificação use o plano Y direto.
+        """
+        if self.capture_format:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.capture_format))
+            if self.capture_format == "YUYV":
+                self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        
+        fourcc = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.active_format = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)) if fourcc else None
+        
+        if self.capture_format and self.active_format != self.capture_format:
+            logger.warning("Formato %s não aceito pela câmera, usando %s", self.capture_format, self.active_format)
+    
+    def _set_resolution(self, resolution, cap=None):
+        """Configura a resolução (largura, altura) de captura da câmera (cap, ou a atual)."""
+        if cap is None:
+            cap = self.cap
+        width, height = resolution
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    
+    def _request_burst(self, undecoded_count):
+        """Pede uma rajada em alta resolução quando há QR localizado mas não decodificado."""
+        if self.burst_resolution is None or not undecoded_count:
+            return
+        if (time.time() - self._last_burst_time) > self.burst_cooldown:
+            self._burst_requested = True
+    
+    def _capture_high_res_burst(self, cap):
+        """
+        Troca a câmera para alta resolução, decodifica uma rajada curta de frames e volta
+        para a resolução de captura. O custo das duas trocas é medido nas estatísticas.
+        """
+        self._burst_requested = False
+        self._last_burst_time = time.time()
+        self.burst_count += 1
+        
+        start = time.perf_counter()
+        self._set_resolution(self.burst_resolution, cap)
+        cap.read()  # Descarta o frame que ainda pode estar na resolução antiga
+        switch_time = time.perf_counter() - start
+        
+        qr_codes = []
+        for _ in range(self.burst_frames):
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                continue
+            qr_codes = self.burst_decoder.decode(frame)
+            if qr_codes:
+                break
+        
+        start = time.perf_counter()
+        self._set_resolution(self.capture_resolution, cap)
+        cap.read()
+        switch_time += time.perf_counter() - start
+        
+        self.switch_time_last = switch_time
+        self.switch_time_total += switch_time
+        
+        if qr_codes:
+            self.burst_success += 1
+            qr_batch = self._filter_new_scans(qr_codes)
+            if qr_batch:
+                self.qr_count += len(qr_batch)
+                logger.info("QR Code(s) detectado(s) na rajada: %s", qr_batch)
+                self._dispatch_qr_batch(qr_batch)
+    
+    def _start_decode_processes(self):
+        """Cria o buffer de frames em memória compartilhada e inicia os processos de decodificação."""
+        if not frame_ring_buffer.is_supported():
+            logger.warning("Memória compartilhada indisponível (Python < 3.8), decodificando em threads")
+            return
+        
+        try:
+            # Um slot por processo, mais um para a captura escrever enquanto todos decodificam
+            slot_count = self.decode_processes + 1
+            self.frame_ring = FrameRingBuffer(slot_count, int(np.prod(self.frame_shape)))
+            self._decode_results = multiprocessing.Queue(maxsize=64)
+            self._decode_stop = multiprocessing.Event()
+            
+            for _ in range(self.decode_processes):
+                worker = multiprocessing.Process(
+                    target=frame_ring_buffer.decode_worker,
+                    args=(self.frame_ring.spec(), self._decode_results, self._decode_stop,
+                          self.qr_decoder.backend, self.preprocessing_tiers, self.tier_budget_ms),
+                    daemon=True
+                )
+                worker.start()
+                self._decode_workers.append(worker)
+            
+            logger.info("%s processos de decodificação iniciados", self.decode_processes)
+        except Exception as e:
+            logger.error("Erro ao iniciar processos de decodificação: %s", e)
+            self._stop_decode_processes()
     
-    def _video_loop(self):
-        """Loop principal de captura e processamento de vídeo."""
-        print("CameraManager: Iniciando loop de vídeo...")
+    def _stop_decode_processes(self):
+        """Finaliza os processos de decodificação e libera a memória compartilhada."""
+        if self._decode_stop is not None:
+            self._decode_stop.set()
+        
+        for worker in self._decode_workers:
+            worker.join(timeout=1.0)
+            if worker.is_alive():
+                worker.terminate()
+        self._decode_workers = []
+        
+        if self._results_thread and self._results_thread.is_alive():
+            self._results_thread.join(timeout=1.0)
+        self._results_thread = None
+        
+        if self.frame_ring is not None:
+            self.frame_ring.close()
+            self.frame_ring = None
+    
+    def _collect_decode_results(self):
+        """Recebe os resultados dos processos de decodificação e entrega as leituras novas."""
+        while self.camera_active:
+            try:
+                _, qr_codes, undecoded_count, tier_stats = self._decode_results.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            
+            with self._worker_tier_lock:
+                merge_tier_stats(self._worker_tier_stats, tier_stats)
+            self._request_burst(undecoded_count)
+            qr_batch = self._filter_new_scans(qr_codes)
+            if qr_batch:
+                self.qr_count += len(qr_batch)
+                logger.info("QR Code(s) detectado(s): %s", qr_batch)
+                self._dispatch_qr_batch(qr_batch)
+    
+    def _retrieve_frame(self, cap, for_decode):
+        """
+        Decodifica (retrieve) o último frame capturado com grab(). Com decodificação em
+        processos, um frame destinado à decodificação é escrito direto em um slot do buffer
+        compartilhado (sem cópia) e o slot é retornado junto.
+        
+        Returns:
+            tuple: (ret, frame, slot)
+        """
+        if self.frame_ring is None or not for_decode:
+            ret, frame = cap.retrieve()
+            return ret, frame, None
+        
+        slot, slot_frame = self.frame_ring.acquire_write_slot(self.frame_shape)
+        if slot is None:
+            ret, frame = cap.retrieve()
+            return ret, frame, None
         
-        if self.cap is None or not self.cap.isOpened():
+        ret, frame = cap.retrieve(slot_frame)
+        if not ret or frame is None:
+            self.frame_ring.abort(slot)
+            return ret, frame, None
+        
+        if not np.shares_memory(frame, slot_frame):
+            # O backend alocou um novo frame: copia para o slot (ainda sem serialização)
+            if frame.shape != slot_frame.shape:
+                self.frame_ring.abort(slot)
+                return ret, frame, None
+            np.copyto(slot_frame, frame)
+        
+        return ret, slot_frame, slot
+    
+    def _decoder_ready(self):
+        """Retorna se há capacidade de decodificação para um novo frame desta câmera."""
+        if self.frame_ring is not None or self.decoder_pool is None:
+            return True
+        return self._pending_decode is None or self._pending_decode.done()
+    
+    def _video_loop(self, generation=None):
+        """
+        Loop principal de captura e processamento de vídeo.
+        
+        Todo frame é capturado com grab() na taxa do sensor, mantendo o buffer do driver
+        sempre atualizado; o retrieve() (conversão MJPEG/YUYV -> BGR) só é feito para os
+        frames que serão de fato decodificados ou exibidos, cada consumidor com sua taxa.
+        """
+        logger.info("Iniciando loop de vídeo...")
+        
+        # Captura própria deste loop: após um reconnect() o self.cap já pode ser outro
+        cap = self.cap
+        if cap is None or not cap.isOpened():
             self._show_error_message("Erro: Câmera não está disponível.")
             return
 
-        print("CameraManager: Loop de vídeo ativo")
+        logger.info("Loop de vídeo ativo")
         consecutive_errors = 0
         max_consecutive_errors = 10
+        next_decode_time = 0
+        next_preview_time = 0
         
-        while self.camera_active:
+        while self.camera_active and (generation is None or generation == self._loop_generation):
             try:
-                ret, frame = self.cap.read()
+                loop_start = time.time()
                 
-                if not ret or frame is None:
+                if self._burst_requested:
+                    self._capture_high_res_burst(cap)
+                
+                grabbed = cap.grab()
+                if generation is not None and generation != self._loop_generation:
+                    break  # Substituído por reconnect() enquanto bloqueado em grab()
+                if not grabbed:
                     consecutive_errors += 1
                     if consecutive_errors >= max_consecutive_errors:
-                        print(f"CameraManager: Muitos erros consecutivos ({consecutive_errors}), parando...")
+                        logger.error("Muitos erros consecutivos (%s), parando...", consecutive_errors)
                         break
                     time.sleep(0.1)
                     continue
                 
-                # Reset contador de erros se frame foi lido com sucesso
+                # Reset contador de erros se frame foi capturado com sucesso
                 consecutive_errors = 0
                 self.frame_count += 1
+                self.last_frame_time = loop_start
                 
                 # Log de status a cada 30 frames (aproximadamente 1 segundo)
                 if self.frame_count % 30 == 0:
-                    print(f"CameraManager: Frame {self.frame_count} processado")
-
-                # Detecta QR Code
-                self._detect_qr_code(frame)
+                    logger.debug("Frame %s capturado (%s decodificados)", self.frame_count, self.retrieved_count)
                 
-                # Atualiza display de vídeo
-                self._update_video_display(frame)
+                # Decide quais consumidores usarão este frame
+                decode_due = loop_start >= next_decode_time
+                if decode_due and not self._decoder_ready():
+                    self.dropped_decode_frames += 1
+                    decode_due = False
+                preview_due = loop_start >= next_preview_time
                 
-                # Controle de FPS
-                time.sleep(1.0 / self.fps_target)
+                if decode_due or preview_due:
+                    ret, frame, slot = self._retrieve_frame(cap, for_decode=decode_due)
+                    if ret and frame is not None:
+                        self.retrieved_count += 1
+                        
+                        # Detecta QR Code
+                        if decode_due:
+                            next_decode_time = loop_start + 1.0 / self.decode_fps
+                            self._submit_qr_detection(frame, slot)
+                        
+                        # Atualiza display de vídeo
+                        if preview_due:
+                            next_preview_time = loop_start + 1.0 / self.preview_fps
+                            self._update_video_display(frame)
+                
+                # Controle de FPS (grab() normalmente já bloqueia até o próximo frame do sensor)
+                elapsed = time.time() - loop_start
+                time.sleep(max(0.0, 1.0 / self.fps_target - elapsed))
                 
             except Exception as e:
-                print(f"CameraManager: Erro no loop de vídeo: {e}")
+                logger.error("Erro no loop de vídeo: %s", e)
                 consecutive_errors += 1
                 if consecutive_errors >= max_consecutive_errors:
                     break
                 time.sleep(0.1)
         
-        print("CameraManager: Loop de vídeo finalizado")
+        if generation is not None and generation != self._loop_generation and cap is not self.cap:
+            # Captura abandonada por reconnect() enquanto este loop estava bloqueado
+            try:
+                cap.release()
+            except Exception as e:
+                logger.error("Erro ao liberar captura antiga: %s", e)
+        logger.info("Loop de vídeo finalizado")
+    
+    def _submit_qr_detection(self, frame, slot=None):
+        """
+        Envia o frame para decodificação: na própria thread, no pool compartilhado ou,
+        se o frame está em um slot da memória compartilhada, para os processos de decodificação.
+        """
+        if slot is not None:
+            self.decode_count += 1
+            self.frame_ring.commit(slot)
+            return
+        
+        if self.decoder_pool is None:
+            self._detect_qr_code(frame)
+            return
+        
+        try:
+            self._pending_decode = self.decoder_pool.submit(self._detect_qr_code, frame)
+        except RuntimeError:
+            # Pool já finalizado (câmeras sendo paradas)
+            self._pending_decode = None
     
     def _detect_qr_code(self, frame):
-        """Detecta QR codes no frame."""
+        """Detecta QR codes no frame (vários por frame, para leitura em grupo)."""
         try:
-            qr_data, points, _ = self.qr_detector.detectAndDecode(frame)
+            self.decode_count += 1
+            qr_batch = self._filter_new_scans(self.qr_decoder.decode(frame))
+            self._request_burst(self.qr_decoder.last_undecoded_count)
             
-            if qr_data:
-                current_time = time.time()
-                
-                # Verifica se é um novo QR ou se passou o tempo de cooldown
-                if (qr_data != self.last_scanned_qr or 
-                    (current_time - self.last_scan_time) > self.scan_cooldown):
-                    
-                    self.last_scanned_qr = qr_data
-                    self.last_scan_time = current_time
-                    
-                    print(f"CameraManager: QR Code detectado: {qr_data}")
-                    
-                    # Chama callback se definido
-                    if self.on_qr_detected:
-                        # Executa callback na thread principal
-                        self.video_canvas.after(0, lambda: self.on_qr_detected(qr_data))
+            if qr_batch:
+                self.qr_count += len(qr_batch)
+                logger.info("QR Code(s) detectado(s): %s", qr_batch)
+                self._dispatch_qr_batch(qr_batch)
                         
         except Exception as e:
-            print(f"CameraManager: Erro ao detectar QR Code: {e}")
+            logger.error("Erro ao detectar QR Code: %s", e)
+    
+    def _filter_new_scans(self, qr_codes):
+        """Retorna apenas os QR codes novos ou cujo cooldown já expirou (seguro entre threads)."""
+        with self._scan_lock:
+            current_time = time.time()
+            
+            # Descarta leituras antigas para o dicionário não crescer indefinidamente
+            if len(self.recent_scans) > 64:
+                self.recent_scans = {
+                    qr: t for qr, t in self.recent_scans.items()
+                    if (current_time - t) <= self.scan_cooldown
+                }
+            
+            qr_batch = []
+            for qr_data in qr_codes:
+                last_time = self.recent_scans.get(qr_data)
+                if last_time is None or (current_time - last_time) > self.scan_cooldown:
+                    self.recent_scans[qr_data] = current_time
+                    qr_batch.append(qr_data)
+            
+            if qr_batch:
+                self.last_scanned_qr = qr_batch[-1]
+                self.last_scan_time = current_time
+            return qr_batch
+    
+    def _dispatch_qr_batch(self, qr_batch):
+        """Entrega as leituras aos callbacks na thread principal."""
+        if self.on_qr_batch_detected:
+            # Um único callback para todo o lote (uma transação e um refresh na interface)
+            self.dispatcher.post(self.on_qr_batch_detected, qr_batch, priority=PRIORITY_SCAN)
+        elif self.on_qr_detected:
+            for qr_data in qr_batch:
+                self.dispatcher.post(self.on_qr_detected, qr_data, priority=PRIORITY_SCAN)
     
     def _update_video_display(self, frame):
         """Atualiza o display de vídeo na interface."""
         try:
             # Converte frame para formato compatível com CustomTkinter
-            img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            img_rgb = self._frame_to_rgb(frame)
             img_pil = Image.fromarray(img_rgb)
             
             # Cria imagem CustomTkinter
@@ -234,11 +653,20 @@ class CameraManager:
                 size=(160, 120)
             )
             
-            # Atualiza na thread principal
-            self.video_canvas.after(0, lambda: self._set_canvas_image(img_ctk))
+            # Atualiza na thread principal; um frame ainda não exibido é substituído pelo novo
+            self.dispatcher.post(self._set_canvas_image, img_ctk,
+                                 key=("preview", id(self)), priority=PRIORITY_PREVIEW)
             
         except Exception as e:
-            print(f"CameraManager: Erro ao atualizar display: {e}")
+            logger.error("Erro ao atualizar display: %s", e)
+    
+    def _frame_to_rgb(self, frame):
+        """Converte o frame capturado (BGR, YUYV bruto ou cinza) para RGB."""
+        if frame.ndim == 2:
+            return cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+        if frame.shape[2] == 2:
+            return cv2.cvtColor(frame, cv2.COLOR_YUV2RGB_YUYV)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     
     def _set_canvas_image(self, img_ctk):
         """Define a imagem no canvas (executado na thread principal)."""
@@ -246,21 +674,47 @@ class CameraManager:
             self.video_canvas.configure(image=img_ctk)
             self.video_canvas.image = img_ctk  # Mantém referência
         except Exception as e:
-            print(f"CameraManager: Erro ao definir imagem no canvas: {e}")
+            logger.error("Erro ao definir imagem no canvas: %s", e)
     
     def _show_error_message(self, message):
         """Mostra mensagem de erro no canvas."""
-        print(f"CameraManager: {message}")
-        self.video_canvas.after(0, lambda: self.video_canvas.configure(text=message))
+        logger.warning("%s", message)
+        self.dispatcher.post(self._set_canvas_text, message,
+                             key=("message", id(self)), priority=PRIORITY_STATUS)
+    
+    def _set_canvas_text(self, message):
+        """Define o texto do canvas (executado na thread principal)."""
+        self.video_canvas.configure(text=message)
     
     def is_active(self):
         """Retorna se a câmera está ativa."""
         return self.camera_active and self.cap is not None and self.cap.isOpened()
     
+    def get_tier_stats(self):
+        """Estatísticas por nível de pré-processamento somando a decodificação local e a dos processos."""
+        tier_stats = merge_tier_stats({}, self.qr_decoder.tier_stats)
+        with self._worker_tier_lock:
+            merge_tier_stats(tier_stats, self._worker_tier_stats)
+        return tier_report(tier_stats)
+    
     def get_stats(self):
         """Retorna estatísticas da câmera."""
         return {
+            'camera_index': self.camera_index,
+            'capture_format': self.active_format,
             'frame_count': self.frame_count,
+            'retrieved_count': self.retrieved_count,
+            'decode_count': self.decode_count,
+            'dropped_decode_frames': self.dropped_decode_frames,
+            'qr_count': self.qr_count,
+            'decode_processes': len(self._decode_workers),
+            'ring_dropped_frames': self.frame_ring.dropped_frames if self.frame_ring else 0,
+            'burst_count': self.burst_count,
+            'burst_success': self.burst_success,
+            'switch_ms_last': self.switch_time_last * 1000,
+            'switch_ms_avg': (self.switch_time_total / self.burst_count * 1000) if self.burst_count else 0.0,
+            'decoder_tiers': self.get_tier_stats(),
+            'ui_queue': self.dispatcher.get_stats(),
             'is_active': self.is_active(),
             'camera_available': self.cap is not None and self.cap.isOpened()
         }
@@ -270,7 +724,9 @@ class CameraManager:
 def test_camera_manager():
     """Testa o gerenciador de câmera independentemente."""
     import customtkinter as ctk
+    from log_manager import setup_logging
     
+    setup_logging("DEBUG")
     print("=== TESTE DO CAMERA MANAGER ===")
     
     # Cria janela de teste
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+camera_profile.py - Perfil de câmera e decodificação ajustado no próprio equipamento
+"""
+
+import json
+import logging
+import os
+import time
+
+from config import PREPROCESSING_TIERS
+from qr_decoder import DECODER_BACKENDS
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros do CameraManager que podem ser ajustados pela calibração
+PROFILE_PARAMS = (
+    "capture_resolution",
+    "decode_fps",
+    "decoder_backend",
+    "preprocessing_tiers",
+    "scan_cooldown",
+)
+
+
+def _validate(params):
+    """Mantém apenas os parâmetros conhecidos e com valores válidos."""
+    valid = {}
+
+    resolution = params.get("capture_resolution")
+    if isinstance(resolution, (list, tuple)) and len(resolution) == 2 and all(int(v) > 0 for v in resolution):
+        valid["capture_resolution"] = (int(resolution[0]), int(resolution[1]))
+
+    if isinstance(params.get("decode_fps"), (int, float)) and params["decode_fps"] > 0:
+        valid["decode_fps"] = params["decode_fps"]
+
+    if params.get("decoder_backend") in DECODER_BACKENDS:
+        valid["decoder_backend"] = params["decoder_backend"]
+
+    tiers = params.get("preprocessing_tiers")
+    if isinstance(tiers, (list, tuple)) and all(tier in PREPROCESSING_TIERS for tier in tiers):
+        valid["preprocessing_tiers"] = tuple(tiers)
+
+    if isinstance(params.get("scan_cooldown"), (int, float)) and params["scan_cooldown"] >= 0:
+        valid["scan_cooldown"] = params["scan_cooldown"]
+
+    return valid
+
+
+def load_camera_profile(profile_file):
+    """
+    Carrega o perfil ajustado pela calibração.
+
+    Returns:
+        dict: Argumentos do CameraManager definidos no perfil (vazio se não houver perfil)
+    """
+    if not profile_file or not os.path.exists(profile_file):
+        return {}
+
+    try:
+        with open(profile_file, encoding="utf-8") as f:
+            profile = json.load(f)
+        params = _validate(profile.get("params", {}))
+        logger.info("Perfil carregado de %s: %s", profile_file, params)
+        return params
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        logger.warning("Perfil inválido em %s, usando config.py: %s", profile_file, e)
+        return {}
+
+
+def save_camera_profile(profile_file, params, metrics=None):
+    """Grava o perfil com os parâmetros escolhidos e as métricas da calibração."""
+    profile = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "params": {key: params[key] for key in PROFILE_PARAMS if key in params},
+        "metrics": metrics or {},
+    }
+    with open(profile_file, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+camera_watchdog.py - Supervisor da câmera com reconexão automática e backoff exponencial
+"""
+
+import logging
+import threading
+import time
+
+from ui_dispatcher import PRIORITY_STATUS
+
+logger = logging.getLogger(__name__)
+
+
+class CameraWatchdog:
+    """
+    Supervisiona um CameraManager: detecta travamentos (nenhum frame dentro do prazo)
+    e a saída do loop de vídeo por erros de leitura, e reabre a câmera com backoff
+    exponencial. Mantém métricas de disponibilidade da câmera.
+    """
+
+    def __init__(self, camera_manager, stall_timeout=3.0, backoff_initial=1.0, backoff_max=30.0,
+                 check_interval=0.5, on_status_change=None):
+        """
+        Inicializa o supervisor.
+
+        Args:
+            camera_manager: CameraManager supervisionado
+            stall_timeout: Segundos sem frame até considerar a câmera travada
+            backoff_initial: Espera (segundos) após a primeira tentativa de reconexão sem sucesso
+            backoff_max: Espera máxima entre tentativas de reconexão
+            check_interval: Intervalo (segundos) entre verificações
+            on_status_change: Callback chamado na thread principal com True (câmera disponível)
+                ou False (câmera indisponível)
+        """
+        self.camera_manager = camera_manager
+        self.stall_timeout = stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.check_interval = check_interval
+        self.on_status_change = on_status_change
+
+        self.running = False
+        self.thread = None
+
+        # Métricas de disponibilidade
+        self.started_at = None
+        self.available = False
+        self.down_since = None
+        self.total_downtime = 0.0
+        self.last_downtime = 0.0
+        self.failure_count = 0
+        self.reconnect_count = 0
+        self.reconnect_attempts = 0
+
+    def start(self):
+        """Inicia a thread de supervisão."""
+        self.running = True
+        self.started_at = time.time()
+        self.available = self._is_healthy()
+        if not self.available:
+            self.down_since = self.started_at
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        logger.info("Supervisão da câmera iniciada")
+
+    def stop(self):
+        """Para a thread de supervisão."""
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+
+    def _is_healthy(self):
+        """Retorna se o loop de vídeo está rodando e recebendo frames dentro do prazo."""
+        camera = self.camera_manager
+        if not (camera.camera_thread and camera.camera_thread.is_alive()):
+            return False
+        return (time.time() - camera.last_frame_time) <= self.stall_timeout
+
+    def _run(self):
+        """Loop de supervisão."""
+        while self.running:
+            time.sleep(self.check_interval)
+            if not self.running:
+                break
+
+            if self._is_healthy():
+                continue
+
+            self._mark_unavailable()
+            self._reconnect_with_backoff()
+
+    def _reconnect_with_backoff(self):
+        """Tenta reabrir a câmera até conseguir, com espera exponencial entre as tentativas."""
+        backoff = self.backoff_initial
+
+        while self.running:
+            self.reconnect_attempts += 1
+            try:
+                if self.camera_manager.reconnect():
+                    self._mark_available()
+                    return
+            except Exception as e:
+                logger.error("Erro ao reconectar câmera: %s", e)
+
+            logger.warning("Reconexão falhou, nova tentativa em %.1fs", backoff)
+            deadline = time.time() + backoff
+            while self.running and time.time() < deadline:
+                time.sleep(min(self.check_interval, backoff))
+            backoff = min(backoff * 2, self.backoff_max)
+
+    def _mark_unavailable(self):
+        """Registra a perda da câmera."""
+        if self.available:
+            self.available = False
+            self.down_since = time.time()
+            self.failure_count += 1
+            logger.warning("Câmera travada ou sem frames, reconectando...")
+            self._notify(False)
+
+    def _mark_available(self):
+        """Registra a recuperação da câmera."""
+        if self.down_since is not None:
+            self.last_downtime = time.time() - self.down_since
+            self.total_downtime += self.last_downtime
+            self.down_since = None
+        if self.failure_count:
+            self.reconnect_count += 1
+        self.available = True
+        logger.info("✓ Câmera disponível (indisponível por %.1fs)", self.last_downtime)
+        self._notify(True)
+
+    def _notify(self, available):
+        """Chama o callback de status na thread principal."""
+        if self.on_status_change:
+            self.camera_manager.dispatcher.post(self.on_status_change, available,
+                                                key=("camera_status", id(self)), priority=PRIORITY_STATUS)
+
+    def get_stats(self):
+        """Retorna as métricas de disponibilidade da câmera."""
+        now = time.time()
+        elapsed = (now - self.started_at) if self.started_at else 0.0
+        downtime = self.total_downtime + ((now - self.down_since) if self.down_since else 0.0)
+
+        return {
+            'available': self.available,
+            'availability': (1.0 - downtime / elapsed) if elapsed > 0 else 0.0,
+            'total_downtime': downtime,
+            'last_downtime': self.last_downtime,
+            'failure_count': self.failure_count,
+            'reconnect_count': self.reconnect_count,
+            'reconnect_attempts': self.reconnect_attempts,
+            'last_good_config': self.camera_manager.last_good_config,
+        }
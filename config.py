@@ -9,3 +9,75 @@ AUTO_CLEANUP_MONTHS = 6
 
 # Configurações de interface
 DEFAULT_MODE = "CIO"  # CIO ou CEV
+# Grupo exibido ao iniciar e atribuído no check in quando todos os grupos estão na tela
+DEFAULT_GROUP = 1
+ALL_GROUPS_LABEL = "Todos"
+# Entrega das threads de câmera à interface: intervalo da rotina do Tk (ms) e tamanho da fila
+UI_DISPATCH_INTERVAL_MS = 15
+UI_QUEUE_SIZE = 64
+# Detector de travamentos da interface: atraso do loop do Tk (ms) que conta como travamento
+# e arquivo com as pilhas agregadas da thread principal (None desativa o detector)
+UI_STALL_THRESHOLD_MS = 100
+UI_STALL_REPORT_FILE = "ui_stalls.json"
+
+# Diário de leituras (scan_journal.py): cada leitura é gravada no arquivo <banco>.scans
+# antes do feedback e confirmada no SQLite em grupo, SCAN_COMMIT_DELAY_MS depois
+SCAN_JOURNAL = True
+SCAN_COMMIT_DELAY_MS = 500
+
+# Snapshot do cadastro (roster_snapshot.py) no arquivo <banco>.snapshot, gravado a cada
+# ROSTER_SNAPSHOT_INTERVAL_S segundos e ao fechar; na inicialização substitui a leitura do
+# banco quando o contador de alterações do banco confere
+ROSTER_SNAPSHOT = True
+ROSTER_SNAPSHOT_INTERVAL_S = 300
+# Limpeza de registros antigos adiada para depois da inicialização (ms)
+CLEANUP_DELAY_MS = 10000
+
+# Migrações de dados do banco em segundo plano (db_migrations.py, ex.: conversão dos horários
+# antigos para época): linhas por lote e intervalo entre lotes (ms)
+MIGRATION_BATCH = 2000
+MIGRATION_INTERVAL_MS = 50
+
+# Configurações de log
+LOG_LEVEL = "INFO"
+# Níveis por módulo, ex.: {"camera_manager": "DEBUG", "audio_manager": "ERROR"}
+LOG_LEVELS = {}
+# Arquivo de log com rotação (None = apenas console/journald)
+LOG_FILE = None
+# Mensagens recentes gravadas neste arquivo ao receber SIGUSR1 (kill -USR1 <pid>)
+LOG_DUMP_FILE = "pobchecker_recent.log"
+
+# Configurações de câmera
+# Índices das câmeras, uma por faixa de acesso (ex.: [0, 1]).
+# None = uma única câmera com detecção automática (índices 0 e 1)
+CAMERA_INDICES = None
+
+# Processos de decodificação de QR alimentados por memória compartilhada
+# (contorna o GIL nos núcleos do Raspberry Pi). 0 = decodifica na thread de captura
+DECODE_PROCESSES = 0
+
+# Resolução (largura, altura) do fluxo contínuo de captura
+CAPTURE_RESOLUTION = (320, 240)
+
+# Captura em dois estágios: um QR localizado mas não decodificado em CAPTURE_RESOLUTION
+# dispara uma rajada curta nesta resolução. None desativa (ex.: (1280, 720))
+BURST_RESOLUTION = None
+
+# Taxas máximas (frames/s) de decodificação de QR e de atualização do preview.
+# Os demais frames são capturados (grab) mas não convertidos
+DECODE_FPS = 15
+PREVIEW_FPS = 10
+
+# Formato de captura pedido à câmera: "MJPG", "YUYV" ou None (padrão do driver).
+# Compare com benchmarks/benchmark_capture_formats.py
+CAPTURE_FORMAT = None
+
+# Pré-processamento em níveis para crachás gastos, plastificados ou com reflexo.
+# Só é usado quando um QR é localizado mas não decodificado no frame bruto.
+# São também os níveis aceitos pelo decodificador e pelo perfil de calibração
+PREPROCESSING_TIERS = ("clahe", "adaptive_threshold", "sharpen", "pyramid")
+TIER_BUDGET_MS = 30
+
+# Perfil ajustado no próprio equipamento por helper/helper_calibrate_camera.py.
+# Quando existe, seus valores substituem os de captura e decodificação acima
+CAMERA_PROFILE_FILE = "camera_profile.json"
@@ -1,7 +1,32 @@
 # Arquivo: database.py
 
+import logging
 import sqlite3
-from datetime import datetime, timedelta
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from db_migrations import MigrationRunner
+from qr_payload import is_compact_payload, decode_payload
+from scan_journal import ScanJournal, COMPACT_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Formato dos horários em texto (colunas Timestamp, Open e Close, no horário local)
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Período de retenção de CHECK_EVENT e CHECK_IN_OUT
+RETENTION_SECONDS = 180 * 24 * 3600
+
+
+def _now():
+    """Horário atual: (segundos desde a época, texto no formato TIMESTAMP_FORMAT)."""
+    epoch = int(time.time())
+    return epoch, datetime.fromtimestamp(epoch).strftime(TIMESTAMP_FORMAT)
+
+
+def _epoch_from_text(timestamp):
+    """Converte um horário em texto (horário local) em segundos desde a época."""
+    return int(datetime.strptime(timestamp, TIMESTAMP_FORMAT).timestamp())
 
 
 class Database:
@@ -9,14 +34,161 @@ class Database:
     Classe para gerenciar todas as operações do banco de dados SQLite.
     Isso centraliza a lógica do banco de dados em um único lugar.
     """
-    def __init__(self, db_file="pobchecker.sqlite3"):
+    def __init__(self, db_file="pobchecker.sqlite3", journal_file=None):
         """
         Inicializa a conexão com o banco de dados e cria as tabelas se não existirem.
+
+        Args:
+            db_file: Arquivo do banco de dados
+            journal_file: Diário de leituras (scan_journal.py). Quando definido, cada leitura é
+                gravada no diário antes do banco e o commit é adiado para flush(); entradas
+                ainda não confirmadas no banco (queda de energia) são aplicadas aqui.
         """
         self.conn = sqlite3.connect(db_file)
         self.cursor = self.conn.cursor()
+        self._transaction_depth = 0
+        self._journal_mark = None
+        self._pending_commit = False
+        self.migrations = MigrationRunner(self.cursor)
         self.create_tables()
 
+        self.journal = None
+        if journal_file:
+            self.journal = ScanJournal(journal_file)
+            self._replay_journal()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa várias operações em uma única transação, com um único commit no final.
+        Usado, por exemplo, para registrar várias leituras de QR de um mesmo frame.
+        Com diário, as leituras do bloco são sincronizadas com um único fdatasync no final.
+        """
+        if self._transaction_depth == 0 and self.journal:
+            # Um rollback do bloco não pode desfazer leituras anteriores ainda sem commit
+            self.flush()
+            self._journal_mark = self.journal.mark()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+                if self.journal:
+                    self.journal.rollback(self._journal_mark)
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            if self.journal:
+                self.journal.sync()
+            self.conn.commit()
+            self._pending_commit = False
+
+    def _commit(self):
+        """
+        Confirma a operação atual, exceto dentro de transaction() (o commit fica para o final do bloco).
+        """
+        if self._transaction_depth == 0:
+            self.conn.commit()
+            self._pending_commit = False
+
+    def flush(self):
+        """
+        Confirma no banco as leituras já gravadas no diário (commit adiado) e, quando o diário
+        passa de COMPACT_SIZE, o esvazia (todas as entradas já estão no banco).
+        """
+        if self._transaction_depth or not self._pending_commit:
+            return
+        self.conn.commit()
+        self._pending_commit = False
+        if self.journal and self.journal.size() > COMPACT_SIZE:
+            self.journal.truncate()
+
+    def _record_scan(self, entry):
+        """
+        Grava uma leitura (check in/out, presença ou estorno). Com diário, a entrada é
+        anexada e sincronizada no diário e aplicada ao banco sem commit (ver flush()).
+        """
+        if self.journal is None:
+            self._apply_scan(entry)
+            self._commit()
+            return
+
+        mark = self.journal.mark()
+        # Dentro de transaction() a sincronização é feita uma vez, no final do bloco
+        entry['seq'] = self.journal.append(entry, sync=self._transaction_depth == 0)
+        try:
+            self._apply_scan(entry)
+        except Exception:
+            # Também dentro de transaction(): quem chama pode tratar o erro e seguir com o bloco
+            self.journal.rollback(mark)
+            raise
+        self._pending_commit = True
+
+    def _apply_scan(self, entry):
+        """Aplica uma leitura ao banco, sem commit, e registra a sequência do diário aplicada."""
+        op = entry['op']
+        # Entradas gravadas antes das colunas de época só têm o horário em texto
+        epoch = entry.get('epoch') or (_epoch_from_text(entry['ts']) if 'ts' in entry else None)
+        if op == 'check_in':
+            # Quem já está no cadastro só tem a situação alterada; nome e grupo são mantidos
+            self.cursor.execute('''
+                INSERT INTO POB (CPF, Name, GroupNumber, Onshore)
+                VALUES (?, ?, ?, 0)
+                ON CONFLICT (CPF) DO UPDATE SET Onshore = 0
+            ''', (entry['cpf'], entry['nome'], entry['grupo']))
+            self.cursor.execute('''
+                INSERT INTO CHECK_IN_OUT (CPF, Name, Type, Timestamp, Epoch)
+                VALUES (?, ?, 'IN', ?, ?)
+            ''', (entry['cpf'], entry['nome'], entry['ts'], epoch))
+        elif op == 'check_out':
+            self.cursor.execute("UPDATE POB SET Onshore = 1 WHERE CPF = ?", (entry['cpf'],))
+            self.cursor.execute('''
+                INSERT INTO CHECK_IN_OUT (CPF, Name, Type, Timestamp, Epoch)
+                VALUES (?, ?, 'OUT', ?, ?)
+            ''', (entry['cpf'], entry['nome'], entry['ts'], epoch))
+        elif op == 'check_event':
+            self.cursor.execute('''
+                INSERT INTO CHECK_EVENT (CPF, Name, Timestamp, Event, Epoch)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (entry['cpf'], entry['nome'], entry['ts'], entry['event'], epoch))
+        elif op == 'uncheck_event':
+            self.cursor.execute("DELETE FROM CHECK_EVENT WHERE CPF = ? AND Event = ?", (entry['cpf'], entry['event']))
+        else:
+            raise ValueError(f"Operação desconhecida no diário: {op}")
+
+        if 'seq' in entry:
+            self.cursor.execute("UPDATE SCAN_JOURNAL SET LastSeq = ? WHERE ID = 1", (entry['seq'],))
+
+    def _replay_journal(self):
+        """Aplica as entradas do diário que não chegaram a ser confirmadas no banco."""
+        self.cursor.execute("SELECT LastSeq FROM SCAN_JOURNAL WHERE ID = 1")
+        last_seq = self.cursor.fetchone()[0]
+
+        pending = [entry for entry in self.journal.entries if entry['seq'] > last_seq]
+        if pending and not self.conn.in_transaction:
+            # Transação externa: sem ela, o RELEASE de cada entrada faria um commit
+            self.cursor.execute("BEGIN")
+        for entry in pending:
+            # Cada entrada tem vários comandos: uma que falhe no meio não pode deixar parte aplicada
+            self.cursor.execute("SAVEPOINT replay_entry")
+            try:
+                self._apply_scan(entry)
+            except Exception as e:
+                logger.error("Entrada %s do diário não aplicada: %s", entry['seq'], e)
+                self.cursor.execute("ROLLBACK TO replay_entry")
+                self.cursor.execute("UPDATE SCAN_JOURNAL SET LastSeq = ? WHERE ID = 1", (entry['seq'],))
+            self.cursor.execute("RELEASE replay_entry")
+            last_seq = entry['seq']
+        self.conn.commit()
+
+        if pending:
+            logger.info("Diário: %s leituras recuperadas e aplicadas ao banco", len(pending))
+        # A sequência continua após a última aplicada, mesmo com o diário vazio
+        self.journal.next_seq = max(self.journal.next_seq, last_seq + 1)
+        self.journal.truncate()
+
     def create_tables(self):
         """
         Cria as tabelas 'POB','EVENTS','CHECK_EVENT','CHECK_IN_OUT' se elas ainda não existirem no banco.
@@ -30,9 +202,6 @@ class Database:
                 Onshore INTEGER DEFAULT 1
             )
         ''')
-        
-        # Migra a coluna Group para GroupNumber se necessário
-        self._migrate_group_column()
 
         # Tabela de registro de eventos (sem campo nome, com Open e Close)
         self.cursor.execute('''
@@ -40,7 +209,9 @@ class Database:
                 ID INTEGER PRIMARY KEY AUTOINCREMENT,
                 Open TEXT NOT NULL,
                 Close TEXT NULL,
-                Closed INTEGER DEFAULT 0   
+                Closed INTEGER DEFAULT 0,
+                OpenEpoch INTEGER,
+                CloseEpoch INTEGER
             )
         ''')
 
@@ -52,6 +223,7 @@ class Database:
                 Name TEXT,
                 Timestamp TEXT NOT NULL,
                 Event INTEGER,
+                Epoch INTEGER,
                 FOREIGN KEY (CPF) REFERENCES POB (CPF),
                 FOREIGN KEY (Event) REFERENCES EVENTS (ID)       
             )
@@ -65,12 +237,96 @@ class Database:
                 Name TEXT,
                 Type TEXT NOT NULL,
                 Timestamp TEXT NOT NULL,
-                FOREIGN KEY (CPF) REFERENCES POB (CPF)     
+                Epoch INTEGER,
+                FOREIGN KEY (CPF) REFERENCES POB (CPF)
             )
         ''')
-        
+
+        # Última entrada do diário de leituras já aplicada ao banco (ver scan_journal.py)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS SCAN_JOURNAL (
+                ID INTEGER PRIMARY KEY CHECK (ID = 1),
+                LastSeq INTEGER NOT NULL
+            )
+        ''')
+        self.cursor.execute("INSERT OR IGNORE INTO SCAN_JOURNAL (ID, LastSeq) VALUES (1, 0)")
+
+        # Contador de alterações do cadastro, presenças e eventos (valida o snapshot do cadastro).
+        # DatabaseId distingue bancos diferentes com o mesmo contador.
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS CHANGE_COUNTER (
+                ID INTEGER PRIMARY KEY CHECK (ID = 1),
+                DatabaseId TEXT NOT NULL,
+                Changes INTEGER NOT NULL
+            )
+        ''')
+        self.cursor.execute(
+            "INSERT OR IGNORE INTO CHANGE_COUNTER (ID, DatabaseId, Changes) VALUES (1, lower(hex(randomblob(8))), 0)")
+
+        # Tabelas de bancos antigos chegam à versão atual (db_migrations.py); reescritas de
+        # dados grandes ficam para migrate_step(), em segundo plano
+        self.migrations.migrate_schema()
+
+        self._create_change_triggers()
+        self._create_indexes()
         self.conn.commit()
 
+    def _create_change_triggers(self):
+        """
+        Cria os gatilhos que incrementam CHANGE_COUNTER a cada alteração em POB e EVENTS
+        e nas presenças de eventos abertos (a limpeza de eventos antigos não conta).
+        """
+        for table in ("POB", "EVENTS", "CHECK_EVENT"):
+            for action, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                condition = ""
+                if table == "CHECK_EVENT":
+                    condition = f"WHEN {row}.Event IN (SELECT ID FROM EVENTS WHERE Closed = 0)"
+                self.cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_changes_{table.lower()}_{action.lower()}
+                    AFTER {action} ON {table} {condition}
+                    BEGIN
+                        UPDATE CHANGE_COUNTER SET Changes = Changes + 1 WHERE ID = 1;
+                    END
+                ''')
+
+    def get_change_counter(self):
+        """
+        Retorna (DatabaseId, Changes): identifica o banco e quantas alterações ele já recebeu.
+        """
+        self.cursor.execute("SELECT DatabaseId, Changes FROM CHANGE_COUNTER WHERE ID = 1")
+        return self.cursor.fetchone()
+
+    def _create_indexes(self):
+        """
+        Cria os índices usados pelas consultas do sistema (verificados por benchmarks/benchmark_database.py).
+        Sem eles as consultas por evento, por CPF e por data varrem o histórico inteiro.
+        """
+        # get_people_by_group: filtro por grupo já ordenado por nome
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_pob_group_name ON POB (GroupNumber, Name)")
+        # Pessoas a bordo: índice parcial pequeno (só quem está a bordo); com Onshore na chave
+        # as contagens são feitas só pelo índice
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_pob_on_board ON POB (GroupNumber, Onshore) WHERE Onshore = 0")
+        # get_active_event: evento aberto mais recente
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_closed ON EVENTS (Closed, ID)")
+        # Presenças de um evento e verificação de presença de uma pessoa no evento
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_check_event_event_cpf ON CHECK_EVENT (Event, CPF)")
+        # delete_person e limpeza de registros antigos
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_check_event_cpf ON CHECK_EVENT (CPF)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_check_event_timestamp ON CHECK_EVENT (Timestamp)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_check_in_out_cpf ON CHECK_IN_OUT (CPF)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_check_in_out_timestamp ON CHECK_IN_OUT (Timestamp)")
+
+    def migrate_step(self, batch_size=2000):
+        """
+        Executa um lote da migração de dados em andamento (db_migrations.py) em uma transação curta.
+
+        Returns:
+            bool: True enquanto houver lotes pendentes
+        """
+        pending = self.migrations.run_batch(batch_size)
+        self._commit()
+        return pending
+
     def insert_person(self, person_data):
         """
         Insere uma nova pessoa na tabela POB.
@@ -85,10 +341,10 @@ class Database:
                 person_data['grupo'],
                 person_data['Onshore']
             ))
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
-            print(f"Erro ao inserir pessoa: {e}")
+            logger.error("Erro ao inserir pessoa: %s", e)
             return False
 
     def get_event(self, event_type="DEFAULT"):
@@ -113,6 +369,26 @@ class Database:
         self.cursor.execute("SELECT CPF, Name, GroupNumber FROM POB WHERE GroupNumber = ? ORDER BY Name", (group_number,))
         return self.cursor.fetchall()
 
+    def get_all_people(self):
+        """
+        Retorna todo o cadastro em uma única consulta, com a situação de cada pessoa.
+
+        Returns:
+            list: Tuplas (CPF, nome, grupo, Onshore) ordenadas por nome
+        """
+        self.cursor.execute("SELECT CPF, Name, GroupNumber, Onshore FROM POB ORDER BY Name")
+        return self.cursor.fetchall()
+
+    def count_people_on_board(self, group_number=None):
+        """
+        Retorna quantas pessoas estão a bordo (todas ou de um grupo), apenas pelo índice parcial.
+        """
+        if group_number is None:
+            self.cursor.execute("SELECT COUNT(*) FROM POB WHERE Onshore = 0")
+        else:
+            self.cursor.execute("SELECT COUNT(*) FROM POB WHERE Onshore = 0 AND GroupNumber = ?", (group_number,))
+        return self.cursor.fetchone()[0]
+
     def clean_cpf(self, cpf):
         """Remove qualquer formatação do CPF e retorna apenas os números."""
         return cpf.replace(".", "").replace("-", "").replace(" ", "").strip()
@@ -150,54 +426,60 @@ class Database:
 
     def add_person_to_pob(self, cpf, nome, grupo=1):
         """
-        Adiciona uma pessoa à tabela POB (People On Board) e registra check-in.
+        Marca uma pessoa como a bordo e registra check-in. Quem ainda não está no cadastro
+        é incluído com o nome e o grupo informados; quem já está mantém os seus.
         """
         try:
-            self.cursor.execute('''
-                INSERT OR REPLACE INTO POB (CPF, Name, GroupNumber, Onshore)
-                VALUES (?, ?, ?, 0)
-            ''', (cpf, nome, grupo))
-            
-            # Registra o check-in
-            self.record_check_in_out(cpf, nome, "IN")
-            
-            self.conn.commit()
+            # Cadastro a bordo e registro do check-in
+            epoch, timestamp = _now()
+            self._record_scan({
+                'op': 'check_in', 'cpf': cpf, 'nome': nome, 'grupo': grupo,
+                'ts': timestamp, 'epoch': epoch,
+            })
             return True
         except Exception as e:
-            print(f"Erro ao adicionar pessoa ao POB: {e}")
+            logger.error("Erro ao adicionar pessoa ao POB: %s", e)
             return False
 
     def remove_person_from_pob(self, cpf):
         """
-        Remove uma pessoa da tabela POB e registra check-out.
+        Marca uma pessoa como fora da plataforma (Onshore = 1) e registra check-out.
+        A pessoa continua no cadastro.
         """
         try:
-            # Busca o nome da pessoa antes de remover
+            # Busca o nome da pessoa para o registro do check-out
             person = self.find_person_by_cpf(cpf)
             if not person:
                 return False
                 
             nome = person[1]
             
-            self.cursor.execute("DELETE FROM POB WHERE CPF = ?", (cpf,))
-            
-            if self.cursor.rowcount > 0:
-                # Registra o check-out
-                self.record_check_in_out(cpf, nome, "OUT")
-                self.conn.commit()
-                return True
-            return False
+            # Atualiza a situação e registra o check-out
+            epoch, timestamp = _now()
+            self._record_scan({
+                'op': 'check_out', 'cpf': person[0], 'nome': nome,
+                'ts': timestamp, 'epoch': epoch,
+            })
+            return True
         except Exception as e:
-            print(f"Erro ao remover pessoa do POB: {e}")
+            logger.error("Erro ao remover pessoa do POB: %s", e)
             return False
 
     def parse_qr_data(self, qr_data):
         """
         Extrai CPF e nome dos dados do QR Code.
-        Formato esperado: CPF|NOME
+        Formatos aceitos: compacto P1 (qr_payload.py), CPF|NOME e apenas CPF
         """
         try:
-            if '|' in qr_data:
+            if is_compact_payload(qr_data):
+                cpf, nome = decode_payload(qr_data)
+                if nome is None:
+                    # Nome omitido no crachá: obtido pelo cadastro
+                    person_data = self.find_person_by_cpf(cpf)
+                    if person_data:
+                        nome = person_data[1]
+                return cpf, nome
+            elif '|' in qr_data:
                 parts = qr_data.split('|', 1)  # Split apenas no primeiro |
                 cpf = self.clean_cpf(parts[0])
                 nome = parts[1].strip()
@@ -211,50 +493,54 @@ class Database:
                         return cpf, person_data[1]  # CPF, Name
                 return cpf, None
         except Exception as e:
-            print(f"Erro ao processar dados do QR Code: {e}")
+            logger.error("Erro ao processar dados do QR Code: %s", e)
             return None, None
 
     def clean_old_records(self):
         """
-        Remove registros com mais de 6 meses das tabelas CHECK_EVENT e CHECK_IN_OUT.
+        Remove registros com mais de 6 meses (RETENTION_SECONDS) das tabelas CHECK_EVENT e CHECK_IN_OUT.
         """
-        six_months_ago = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d %H:%M:%S')
+        cutoff = int(time.time()) - RETENTION_SECONDS
+        cutoff_text = datetime.fromtimestamp(cutoff).strftime(TIMESTAMP_FORMAT)
         
         try:
-            # Limpa CHECK_EVENT
-            self.cursor.execute("DELETE FROM CHECK_EVENT WHERE Timestamp < ?", (six_months_ago,))
-            removed_events = self.cursor.rowcount
-            
-            # Limpa CHECK_IN_OUT
-            self.cursor.execute("DELETE FROM CHECK_IN_OUT WHERE Timestamp < ?", (six_months_ago,))
-            removed_checkinout = self.cursor.rowcount
+            removed = {}
+            for table in ("CHECK_EVENT", "CHECK_IN_OUT"):
+                # Busca por faixa no índice de época
+                self.cursor.execute(f"DELETE FROM {table} WHERE Epoch < ?", (cutoff,))
+                removed[table] = self.cursor.rowcount
+                # Linhas ainda não convertidas pela migração (NULL, no início do mesmo índice)
+                self.cursor.execute(f"DELETE FROM {table} WHERE Epoch IS NULL AND Timestamp < ?", (cutoff_text,))
+                removed[table] += self.cursor.rowcount
+            removed_events, removed_checkinout = removed["CHECK_EVENT"], removed["CHECK_IN_OUT"]
             
-            self.conn.commit()
-            print(f"Limpeza automática: {removed_events} registros de CHECK_EVENT e {removed_checkinout} registros de CHECK_IN_OUT removidos")
+            self._commit()
+            logger.info("Limpeza automática: %s registros de CHECK_EVENT e %s registros de CHECK_IN_OUT removidos",
+                        removed_events, removed_checkinout)
             
         except Exception as e:
-            print(f"Erro na limpeza automática: {e}")
+            logger.error("Erro na limpeza automática: %s", e)
 
     def create_event(self):
         """
         Cria um novo evento e retorna seu ID.
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        self.cursor.execute("INSERT INTO EVENTS (Open) VALUES (?)", (timestamp,))
-        self.conn.commit()
+        epoch, timestamp = _now()
+        self.cursor.execute("INSERT INTO EVENTS (Open, OpenEpoch) VALUES (?, ?)", (timestamp, epoch))
+        self._commit()
         return self.cursor.lastrowid
 
     def close_event(self, event_id):
         """
         Fecha um evento específico.
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        epoch, timestamp = _now()
         self.cursor.execute('''
             UPDATE EVENTS 
-            SET Close = ?, Closed = 1 
+            SET Close = ?, CloseEpoch = ?, Closed = 1 
             WHERE ID = ?
-        ''', (timestamp, event_id))
-        self.conn.commit()
+        ''', (timestamp, epoch, event_id))
+        self._commit()
 
     def get_active_event(self):
         """
@@ -273,12 +559,12 @@ class Database:
         """
         Registra uma operação de check in/out.
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        epoch, timestamp = _now()
         self.cursor.execute('''
-            INSERT INTO CHECK_IN_OUT (CPF, Name, Type, Timestamp)
-            VALUES (?, ?, ?, ?)
-        ''', (cpf, nome, tipo, timestamp))
-        self.conn.commit()
+            INSERT INTO CHECK_IN_OUT (CPF, Name, Type, Timestamp, Epoch)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (cpf, nome, tipo, timestamp, epoch))
+        self._commit()
 
     def record_check_event(self, cpf, nome, event_id):
         """
@@ -293,12 +579,11 @@ class Database:
         if self.cursor.fetchone():
             return False  # Já foi registrado no evento
 
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        self.cursor.execute('''
-            INSERT INTO CHECK_EVENT (CPF, Name, Timestamp, Event) 
-            VALUES (?, ?, ?, ?)
-        ''', (cpf, nome, timestamp, event_id))
-        self.conn.commit()
+        epoch, timestamp = _now()
+        self._record_scan({
+            'op': 'check_event', 'cpf': cpf, 'nome': nome, 'event': event_id,
+            'ts': timestamp, 'epoch': epoch,
+        })
         return True
 
     def get_checks_in_event(self, event_id):
@@ -333,13 +618,12 @@ class Database:
             return False
             
         # Remove o registro
-        self.cursor.execute("DELETE FROM CHECK_EVENT WHERE CPF = ? AND Event = ?", (cpf, event_id))
-        self.conn.commit()
+        self._record_scan({'op': 'uncheck_event', 'cpf': cpf, 'event': event_id})
         return True
 
     def is_person_in_pob(self, cpf):
         """
-        Verifica se uma pessoa está atualmente na tabela POB.
+        Verifica se uma pessoa está atualmente a bordo (Onshore = 0).
         """
         cpf_clean = self.clean_cpf(cpf)
         self.cursor.execute("SELECT 1 FROM POB WHERE CPF = ? AND Onshore = 0", (cpf_clean,))
@@ -359,10 +643,10 @@ class Database:
                 person_data['grupo'],
                 cpf
             ))
-            self.conn.commit()
+            self._commit()
             return self.cursor.rowcount > 0
         except Exception as e:
-            print(f"Erro ao atualizar pessoa: {e}")
+            logger.error("Erro ao atualizar pessoa: %s", e)
             return False
 
     def delete_person(self, cpf):
@@ -376,10 +660,10 @@ class Database:
             self.cursor.execute("DELETE FROM CHECK_IN_OUT WHERE CPF = ?", (cpf,))
             # Depois remove a pessoa da tabela POB
             self.cursor.execute("DELETE FROM POB WHERE CPF = ?", (cpf,))
-            self.conn.commit()
+            self._commit()
             return self.cursor.rowcount > 0
         except Exception as e:
-            print(f"Erro ao excluir pessoa: {e}")
+            logger.error("Erro ao excluir pessoa: %s", e)
             return False
 
     def check_person_exists(self, cpf):
@@ -398,52 +682,14 @@ class Database:
         self.cursor.execute("SELECT CPF, Name, GroupNumber FROM POB WHERE CPF = ?", (cpf_clean,))
         return self.cursor.fetchone()
 
-    def _migrate_group_column(self):
+    def close(self):
         """
-        Migra a coluna 'Group' para 'GroupNumber' se a tabela já existir com a estrutura antiga.
+        Confirma as leituras pendentes do diário e fecha o diário e a conexão.
         """
-        try:
-            # Verifica se a coluna 'Group' existe
-            self.cursor.execute("PRAGMA table_info(POB)")
-            columns = [column[1] for column in self.cursor.fetchall()]
-            
-            if 'Group' in columns and 'GroupNumber' not in columns:
-                # Precisa migrar: renomear Group para GroupNumber
-                # SQLite não suporta ALTER COLUMN, então precisamos recriar a tabela
-                
-                # 1. Criar tabela temporária com nova estrutura
-                self.cursor.execute('''
-                    CREATE TABLE POB_temp (
-                        CPF TEXT PRIMARY KEY,
-                        Name TEXT NOT NULL,
-                        GroupNumber INTEGER NOT NULL,
-                        Onshore INTEGER DEFAULT 1
-                    )
-                ''')
-                
-                # 2. Copiar dados da tabela original
-                self.cursor.execute('''
-                    INSERT INTO POB_temp (CPF, Name, GroupNumber, Onshore)
-                    SELECT CPF, Name, [Group], Onshore FROM POB
-                ''')
-                
-                # 3. Remover tabela original
-                self.cursor.execute('DROP TABLE POB')
-                
-                # 4. Renomear tabela temporária
-                self.cursor.execute('ALTER TABLE POB_temp RENAME TO POB')
-                
-                self.conn.commit()
-                print("Migração concluída: coluna 'Group' renomeada para 'GroupNumber'")
-                
-        except Exception as e:
-            print(f"Erro durante migração da coluna Group: {e}")
-            # Em caso de erro, tenta reverter se possível
-            try:
-                self.cursor.execute('DROP TABLE IF EXISTS POB_temp')
-                self.conn.commit()
-            except:
-                pass
+        self.flush()
+        if self.journal:
+            self.journal.close()
+        self.conn.close()
 
     def __del__(self):
         """
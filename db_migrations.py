@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+db_migrations.py - Migrações versionadas do esquema do banco (PRAGMA user_version)
+"""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Colunas de horário em segundos desde a época (UTC) e a coluna de texto de origem
+EPOCH_COLUMNS = {
+    'CHECK_IN_OUT': [('Epoch', 'Timestamp')],
+    'CHECK_EVENT': [('Epoch', 'Timestamp')],
+    'EVENTS': [('OpenEpoch', 'Open'), ('CloseEpoch', 'Close')],
+}
+
+# Intervalo mínimo entre mensagens de progresso de uma migração em lotes (segundos)
+PROGRESS_LOG_INTERVAL = 5.0
+
+
+class Migration:
+    """
+    Passo de migração. schema(cursor) altera o esquema e é rápido; deve ser idempotente, pois
+    bancos anteriores ao controle de versão (user_version 0) podem já estar parcialmente migrados.
+    Quando há dados a reescrever, batch(cursor, batch_size) converte um lote e retorna quantas
+    linhas converteu (0 quando terminou) e remaining(cursor) estima as linhas pendentes.
+    """
+
+    def __init__(self, version, description, schema, batch=None, remaining=None):
+        self.version = version
+        self.description = description
+        self.schema = schema
+        self.batch = batch
+        self.remaining = remaining
+
+
+def _columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {column[1] for column in cursor.fetchall()}
+
+
+def _rename_group_column(cursor):
+    """Renomeia POB.Group para GroupNumber (só altera o esquema, sem copiar a tabela)."""
+    columns = _columns(cursor, "POB")
+    if 'Group' in columns and 'GroupNumber' not in columns:
+        cursor.execute('ALTER TABLE POB RENAME COLUMN "Group" TO GroupNumber')
+
+
+def _add_epoch_columns(cursor):
+    """
+    Acrescenta as colunas de época (EPOCH_COLUMNS) e seus índices. As linhas existentes
+    ficam com NULL até serem convertidas em lotes; os mesmos índices encontram as pendentes.
+    """
+    for table, columns in EPOCH_COLUMNS.items():
+        existing = _columns(cursor, table)
+        for epoch_column, _ in columns:
+            if epoch_column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {epoch_column} INTEGER")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_check_event_epoch ON CHECK_EVENT (Epoch)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_check_in_out_epoch ON CHECK_IN_OUT (Epoch)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_open_epoch ON EVENTS (OpenEpoch)")
+
+
+def _backfill_epochs(cursor, batch_size):
+    """Converte um lote de horários em texto para as colunas de época."""
+    converted = 0
+    for table, columns in EPOCH_COLUMNS.items():
+        epoch_column, _ = columns[0]
+        # Horário em texto inválido vira 0, para a linha não ficar pendente para sempre
+        assignments = ", ".join(
+            f"{epoch} = CASE WHEN {text} IS NULL THEN NULL "
+            f"ELSE COALESCE(CAST(strftime('%s', {text}, 'utc') AS INTEGER), 0) END"
+            for epoch, text in columns
+        )
+        cursor.execute(f'''
+            UPDATE {table} SET {assignments}
+            WHERE ID IN (SELECT ID FROM {table} WHERE {epoch_column} IS NULL LIMIT ?)
+        ''', (batch_size - converted,))
+        converted += cursor.rowcount
+        if converted >= batch_size:
+            break
+    return converted
+
+
+def _pending_epochs(cursor):
+    """Linhas ainda sem horário de época."""
+    pending = 0
+    for table, columns in EPOCH_COLUMNS.items():
+        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {columns[0][0]} IS NULL")
+        pending += cursor.fetchone()[0]
+    return pending
+
+
+# Migrações em ordem de versão; novas migrações são acrescentadas ao final
+MIGRATIONS = [
+    Migration(1, "coluna Group renomeada para GroupNumber", _rename_group_column),
+    Migration(2, "horários em segundos desde a época", _add_epoch_columns,
+              batch=_backfill_epochs, remaining=_pending_epochs),
+]
+
+
+class MigrationRunner:
+    """
+    Aplica as migrações pendentes em ordem. O esquema de cada migração é alterado na abertura
+    do banco; uma migração com dados a reescrever segue em lotes (run_batch), chamados em
+    segundo plano pelo terminal, e só então a versão avança e as migrações seguintes são
+    aplicadas. Como a versão só avança no final, uma migração interrompida é retomada na
+    próxima abertura. Nenhum método faz commit: cada lote é confirmado por quem o chama.
+    """
+
+    def __init__(self, cursor, migrations=MIGRATIONS):
+        """
+        Args:
+            cursor: Cursor da conexão do banco
+            migrations: Migrações em ordem crescente de versão
+        """
+        self.cursor = cursor
+        self.migrations = migrations
+        self.current = None  # Migração com lotes pendentes
+        self.converted = 0
+        self.total = 0
+        self._last_log = 0.0
+
+    def version(self):
+        """Versão do esquema gravada no banco."""
+        self.cursor.execute("PRAGMA user_version")
+        return self.cursor.fetchone()[0]
+
+    def latest_version(self):
+        """Versão do esquema após todas as migrações."""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def _set_version(self, version):
+        self.cursor.execute(f"PRAGMA user_version = {int(version)}")
+
+    def migrate_schema(self):
+        """
+        Aplica em ordem as migrações pendentes até a primeira que tiver lotes de dados.
+
+        Returns:
+            bool: True se restou uma migração de dados para run_batch()
+        """
+        version = self.version()
+        if version > self.latest_version():
+            logger.warning("Banco na versão %s, mais nova que a deste programa (%s)",
+                           version, self.latest_version())
+            return False
+
+        for migration in self.migrations:
+            if migration.version <= version:
+                continue
+            migration.schema(self.cursor)
+            if migration.batch is not None:
+                self.current = migration
+                self.converted = 0
+                self.total = migration.remaining(self.cursor) if migration.remaining else 0
+                if self.total:
+                    logger.info("Migração %s (%s): %s linhas a converter em segundo plano",
+                                migration.version, migration.description, self.total)
+                    return True
+                # Nada a converter: a migração termina aqui
+                self.current = None
+            self._set_version(migration.version)
+            logger.info("Banco migrado para a versão %s (%s)", migration.version, migration.description)
+        return False
+
+    def pending(self):
+        """Se há uma migração de dados em andamento."""
+        return self.current is not None
+
+    def run_batch(self, batch_size):
+        """
+        Converte um lote da migração em andamento. Ao terminar, avança a versão e aplica
+        as migrações seguintes.
+
+        Returns:
+            bool: True enquanto houver lotes pendentes
+        """
+        if self.current is None:
+            return False
+
+        converted = self.current.batch(self.cursor, batch_size)
+        self.converted += converted
+        if converted:
+            now = time.monotonic()
+            if now - self._last_log >= PROGRESS_LOG_INTERVAL:
+                self._last_log = now
+                progress = self.get_progress()
+                logger.info("Migração %s: %s de %s linhas (%.0f%%)", progress['version'],
+                            progress['converted'], progress['total'], progress['percent'])
+            return True
+
+        migration, self.current = self.current, None
+        self._set_version(migration.version)
+        logger.info("Banco migrado para a versão %s (%s): %s linhas convertidas",
+                    migration.version, migration.description, self.converted)
+        return self.migrate_schema()
+
+    def get_progress(self):
+        """Progresso da migração de dados em andamento (None se não houver)."""
+        if self.current is None:
+            return None
+        total = max(self.total, self.converted)
+        return {
+            'version': self.current.version,
+            'description': self.current.description,
+            'converted': self.converted,
+            'total': total,
+            'percent': 100.0 * self.converted / total if total else 100.0,
+        }
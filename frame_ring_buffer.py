@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+frame_ring_buffer.py - Buffer circular de frames em memória compartilhada para decodificação em processos
+"""
+
+import logging
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+
+# Estados de um slot do buffer
+SLOT_FREE = 0      # Livre para a captura escrever
+SLOT_WRITING = 1   # Captura escrevendo o frame
+SLOT_READY = 2     # Frame pronto para decodificação
+SLOT_READING = 3   # Frame em uso por um processo de decodificação
+
+# Cabeçalho por slot: número de sequência, estado, altura, largura, canais
+HEADER_FIELDS = 5
+
+# Intervalo máximo (segundos) para um processo de decodificação enviar as estatísticas por nível
+# quando não há leituras a enviar
+TIER_STATS_INTERVAL = 1.0
+
+
+def is_supported():
+    """Retorna se a plataforma suporta memória compartilhada (Python 3.8+)."""
+    return shared_memory is not None
+
+
+class FrameRingBuffer:
+    """
+    Buffer circular de slots de frame pré-alocados em memória compartilhada.
+
+    A thread de captura (único produtor) lê o frame da câmera direto em um slot livre e o
+    marca como pronto; os processos de decodificação (consumidores) pegam o slot pronto mais
+    antigo, decodificam sem copiar o frame e liberam o slot. Se não houver slot livre, o frame
+    pronto mais antigo é descartado em favor do novo.
+    """
+
+    def __init__(self, slot_count, slot_bytes, name=None, condition=None):
+        """
+        Cria (name=None) ou abre (name informado) o buffer em memória compartilhada.
+
+        Args:
+            slot_count: Número de slots de frame
+            slot_bytes: Tamanho máximo de um frame em bytes
+            name: Nome do bloco de memória compartilhada existente
+            condition: multiprocessing.Condition que protege os cabeçalhos dos slots
+        """
+        if shared_memory is None:
+            raise RuntimeError("multiprocessing.shared_memory requer Python 3.8 ou superior")
+
+        self.slot_count = slot_count
+        self.slot_bytes = slot_bytes
+        self.header_bytes = slot_count * HEADER_FIELDS * 8
+        self.owner = name is None
+
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(
+                create=True,
+                size=self.header_bytes + slot_count * slot_bytes
+            )
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.header = np.ndarray((slot_count, HEADER_FIELDS), dtype=np.int64, buffer=self.shm.buf)
+        if self.owner:
+            self.header[:] = 0
+
+        self.condition = condition if condition is not None else multiprocessing.Condition()
+
+        # Estado do produtor
+        self.next_seq = 1
+        self.dropped_frames = 0
+
+    @classmethod
+    def attach(cls, spec):
+        """Abre em outro processo um buffer criado pelo produtor (ver spec())."""
+        name, slot_count, slot_bytes, condition = spec
+        return cls(slot_count, slot_bytes, name=name, condition=condition)
+
+    def spec(self):
+        """Retorna os dados necessários para abrir o buffer em outro processo."""
+        return (self.shm.name, self.slot_count, self.slot_bytes, self.condition)
+
+    def _slot_view(self, slot, shape):
+        """Retorna uma view numpy (sem cópia) do frame armazenado no slot."""
+        return np.ndarray(
+            shape,
+            dtype=np.uint8,
+            buffer=self.shm.buf,
+            offset=self.header_bytes + slot * self.slot_bytes
+        )
+
+    def acquire_write_slot(self, shape):
+        """
+        Reserva um slot para escrita de um frame com o formato informado (produtor).
+
+        Returns:
+            tuple: (slot, view) ou (None, None) se o frame não couber ou todos os slots estiverem em uso
+        """
+        if int(np.prod(shape)) > self.slot_bytes:
+            return None, None
+
+        with self.condition:
+            states = self.header[:, 1]
+            free = np.flatnonzero(states == SLOT_FREE)
+            if free.size:
+                slot = int(free[0])
+            else:
+                # Descarta o frame pronto mais antigo que ainda não foi decodificado
+                ready = np.flatnonzero(states == SLOT_READY)
+                if not ready.size:
+                    return None, None
+                slot = int(ready[np.argmin(self.header[ready, 0])])
+                self.dropped_frames += 1
+
+            self.header[slot, 1] = SLOT_WRITING
+            self.header[slot, 2:2 + len(shape)] = shape
+            if len(shape) == 2:
+                self.header[slot, 4] = 1
+
+        return slot, self._slot_view(slot, shape)
+
+    def commit(self, slot):
+        """Publica o frame escrito no slot para os processos de decodificação (produtor)."""
+        with self.condition:
+            self.header[slot, 0] = self.next_seq
+            self.header[slot, 1] = SLOT_READY
+            self.next_seq += 1
+            self.condition.notify()
+
+    def abort(self, slot):
+        """Devolve um slot reservado sem publicar o frame (produtor)."""
+        with self.condition:
+            self.header[slot, 1] = SLOT_FREE
+
+    def acquire_read_slot(self, timeout=0.2):
+        """
+        Aguarda e reserva o frame pronto mais antigo (consumidor).
+
+        Returns:
+            tuple: (slot, seq, view) ou None se nenhum frame ficou pronto dentro do timeout
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: (self.header[:, 1] == SLOT_READY).any(), timeout):
+                return None
+            ready = np.flatnonzero(self.header[:, 1] == SLOT_READY)
+            slot = int(ready[np.argmin(self.header[ready, 0])])
+            self.header[slot, 1] = SLOT_READING
+            seq = int(self.header[slot, 0])
+            height, width, channels = (int(v) for v in self.header[slot, 2:5])
+
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        return slot, seq, self._slot_view(slot, shape)
+
+    def release(self, slot):
+        """Libera o slot após a decodificação (consumidor)."""
+        with self.condition:
+            self.header[slot, 1] = SLOT_FREE
+
+    def close(self):
+        """Fecha o acesso ao bloco de memória compartilhada; o criador também o remove."""
+        self.header = None
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            logger.error("Erro ao liberar memória compartilhada: %s", e)
+
+
+def decode_worker(ring_spec, result_queue, stop_event, backend="opencv", tiers=(), tier_budget_ms=30):
+    """
+    Processo de decodificação: consome frames do buffer compartilhado e devolve
+    apenas os conteúdos decodificados pela result_queue, como (seq, [qr_data, ...], n, tier_stats),
+    onde n é o número de QR codes localizados mas não decodificados e tier_stats são os contadores
+    por nível (QRDecoder.pop_tier_stats) desde o último envio. Sem leituras, o processo envia só
+    as estatísticas a cada TIER_STATS_INTERVAL.
+    """
+    from qr_decoder import QRDecoder
+
+    ring = FrameRingBuffer.attach(ring_spec)
+    decoder = QRDecoder(backend=backend, multi=True, tiers=tiers, tier_budget_ms=tier_budget_ms)
+    last_sent = time.monotonic()
+
+    while not stop_event.is_set():
+        acquired = ring.acquire_read_slot(timeout=0.2)
+        if acquired is None:
+            continue
+
+        slot, seq, frame = acquired
+        try:
+            qr_codes = decoder.decode(frame)
+        except Exception as e:
+            logger.error("Erro ao decodificar frame %s: %s", seq, e)
+            qr_codes = []
+        finally:
+            del frame
+            ring.release(slot)
+
+        now = time.monotonic()
+        if qr_codes or decoder.last_undecoded_count or now - last_sent >= TIER_STATS_INTERVAL:
+            last_sent = now
+            try:
+                result_queue.put((seq, qr_codes, decoder.last_undecoded_count, decoder.pop_tier_stats()),
+                                 timeout=0.5)
+            except queue.Full:
+                pass
+
+    ring.close()
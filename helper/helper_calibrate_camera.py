@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo: helper_calibrate_camera.py
+Descrição: Calibração da câmera e do decodificador no próprio equipamento.
+           Mede cada combinação de resolução, backend e pré-processamento sobre uma
+           amostra ao vivo (ou gravada) e sobre o corpus sintético de crachás, escolhe a
+           de maior vazão dentro do orçamento de CPU e grava o perfil lido pelo terminal.
+
+Uso:
+    python helper/helper_calibrate_camera.py                      # câmera 0, 10 s de amostra
+    python helper/helper_calibrate_camera.py --video amostra.mp4  # amostra gravada
+    python helper/helper_calibrate_camera.py --cpu-budget 0.3     # 30% de um núcleo
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CAMERA_PROFILE_FILE, PREPROCESSING_TIERS
+from qr_decoder import QRDecoder, to_gray, pyzbar
+from camera_profile import save_camera_profile
+from benchmarks.badge_corpus import generate_corpus
+
+# Obtem o diretório raiz do projeto (diretório pai do helper)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Espaço de busca
+RESOLUTIONS = [(320, 240), (640, 480)]
+BACKENDS = ["opencv", "pyzbar", "both"]
+TIER_OPTIONS = [(), PREPROCESSING_TIERS]
+FPS_OPTIONS = [5, 10, 15, 20, 30]
+
+# Limites do cooldown derivado do tempo em que um crachá fica na frente da câmera
+MIN_COOLDOWN = 1.0
+MAX_COOLDOWN = 10.0
+
+# Máximo de frames guardados na amostra
+MAX_SAMPLE_FRAMES = 150
+
+
+def collect_sample(source, resolution, seconds):
+    """
+    Coleta uma amostra de frames em cinza da câmera ou de um vídeo gravado.
+
+    Returns:
+        list: Tuplas (segundos desde o início, frame em cinza)
+    """
+    is_video = isinstance(source, str)
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        return []
+
+    frames = []
+    try:
+        if not is_video:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, resolution[0])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
+            # Aquece a câmera (exposição automática, buffers do driver)
+            for _ in range(5):
+                cap.read()
+
+        start = time.time()
+        while len(frames) < MAX_SAMPLE_FRAMES:
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                break
+            if is_video:
+                timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                frame = cv2.resize(frame, resolution, interpolation=cv2.INTER_AREA)
+            else:
+                timestamp = time.time() - start
+            if timestamp > seconds:
+                break
+            frames.append((timestamp, to_gray(frame)))
+    finally:
+        cap.release()
+
+    return frames
+
+
+def corpus_at_resolution(corpus, resolution):
+    """Converte o corpus sintético para cinza na resolução pedida."""
+    return [
+        (cv2.resize(to_gray(sample['image']), resolution, interpolation=cv2.INTER_LINEAR), sample['expected'])
+        for sample in corpus
+    ]
+
+
+def evaluate(backend, tiers, corpus, sample):
+    """
+    Mede uma combinação de backend e pré-processamento.
+
+    Returns:
+        dict: Taxa de decodificação no corpus, taxa de leitura na amostra e ms de CPU por frame
+    """
+    decoder = QRDecoder(backend=backend, multi=True, tiers=tiers)
+
+    decoded = 0
+    start = time.process_time()
+    for gray, expected in corpus:
+        decoded += expected in decoder.decode(gray)
+    corpus_ms = (time.process_time() - start) * 1000 / max(len(corpus), 1)
+
+    read_frames = 0
+    start = time.process_time()
+    for _, gray in sample:
+        read_frames += bool(decoder.decode(gray))
+    sample_ms = (time.process_time() - start) * 1000 / len(sample) if sample else 0.0
+
+    return {
+        'decode_rate': decoded / max(len(corpus), 1),
+        'sample_read_rate': read_frames / len(sample) if sample else None,
+        'cpu_ms': max(corpus_ms, sample_ms),
+    }
+
+
+def estimate_cooldown(sample):
+    """
+    Estima o cooldown pelo tempo em que um mesmo crachá continua sendo lido na amostra.
+
+    Returns:
+        float: Cooldown em segundos ou None se nenhum crachá foi lido
+    """
+    decoder = QRDecoder(backend="opencv", multi=True)
+    seen = {}
+    for timestamp, gray in sample:
+        for qr_data in decoder.decode(gray):
+            first, _ = seen.get(qr_data, (timestamp, timestamp))
+            seen[qr_data] = (first, timestamp)
+
+    if not seen:
+        return None
+    dwell = max(last - first for first, last in seen.values())
+    return round(min(max(dwell + 1.0, MIN_COOLDOWN), MAX_COOLDOWN), 1)
+
+
+def calibrate(source, seconds, cpu_budget, payloads):
+    """
+    Executa a busca e retorna (parâmetros escolhidos, métricas, resultados de todas as combinações).
+    """
+    print(f"Gerando corpus sintético ({payloads} crachás)...")
+    corpus = generate_corpus(payloads)
+
+    backends = [b for b in BACKENDS if pyzbar is not None or b == "opencv"]
+    results = []
+    cooldown = None
+
+    for resolution in RESOLUTIONS:
+        label = f"{resolution[0]}x{resolution[1]}"
+        sample = collect_sample(source, resolution, seconds) if source is not None else []
+        print(f"Resolução {label}: {len(sample)} frames de amostra")
+        if cooldown is None and sample:
+            cooldown = estimate_cooldown(sample)
+
+        corpus_frames = corpus_at_resolution(corpus, resolution)
+        for backend in backends:
+            for tiers in TIER_OPTIONS:
+                metrics = evaluate(backend, tiers, corpus_frames, sample)
+
+                # Maior taxa de decodificação que cabe no orçamento de CPU
+                max_fps = cpu_budget * 1000 / metrics['cpu_ms'] if metrics['cpu_ms'] > 0 else FPS_OPTIONS[-1]
+                fitting = [fps for fps in FPS_OPTIONS if fps <= max_fps]
+                decode_fps = fitting[-1] if fitting else None
+
+                results.append(dict(
+                    metrics,
+                    capture_resolution=resolution,
+                    decoder_backend=backend,
+                    preprocessing_tiers=tuple(tiers),
+                    decode_fps=decode_fps,
+                    throughput=metrics['decode_rate'] * decode_fps if decode_fps else 0.0,
+                ))
+
+    candidates = [r for r in results if r['decode_fps']]
+    if not candidates:
+        return None, {}, results
+
+    best = max(candidates, key=lambda r: (r['throughput'], -r['cpu_ms']))
+    params = {
+        'capture_resolution': best['capture_resolution'],
+        'decode_fps': best['decode_fps'],
+        'decoder_backend': best['decoder_backend'],
+        'preprocessing_tiers': best['preprocessing_tiers'],
+    }
+    if cooldown is not None:
+        params['scan_cooldown'] = cooldown
+
+    metrics = {
+        'cpu_budget': cpu_budget,
+        'decode_rate': best['decode_rate'],
+        'sample_read_rate': best['sample_read_rate'],
+        'cpu_ms': best['cpu_ms'],
+        'throughput': best['throughput'],
+    }
+    return params, metrics, results
+
+
+def print_table(results):
+    """Mostra o resultado de todas as combinações."""
+    print(f"\n{'Resolução':<10} {'Backend':<8} {'Níveis':<7} {'Taxa':>7} {'ms/frame':>9} {'FPS':>5} {'Vazão':>7}")
+    print("-" * 60)
+    for r in results:
+        resolution = f"{r['capture_resolution'][0]}x{r['capture_resolution'][1]}"
+        tiers = "sim" if r['preprocessing_tiers'] else "não"
+        fps = r['decode_fps'] if r['decode_fps'] else "-"
+        print(f"{resolution:<10} {r['decoder_backend']:<8} {tiers:<7} {r['decode_rate']:>6.1%} "
+              f"{r['cpu_ms']:>9.2f} {fps:>5} {r['throughput']:>7.2f}")
+    print("\nVazão = crachás decodificados por segundo (taxa x FPS dentro do orçamento de CPU).")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Calibração da câmera e do decodificador de QR")
+    parser.add_argument("--camera", type=int, default=0, help="Índice da câmera (padrão: 0)")
+    parser.add_argument("--video", help="Vídeo gravado usado como amostra em vez da câmera")
+    parser.add_argument("--no-sample", action="store_true", help="Usa apenas o corpus sintético")
+    parser.add_argument("--seconds", type=float, default=10, help="Duração da amostra (segundos)")
+    parser.add_argument("--cpu-budget", type=float, default=0.5,
+                        help="Fração de um núcleo disponível para decodificação (padrão: 0.5)")
+    parser.add_argument("--payloads", type=int, default=10, help="Crachás diferentes no corpus sintético")
+    parser.add_argument("--output", default=os.path.join(ROOT_DIR, CAMERA_PROFILE_FILE),
+                        help="Arquivo do perfil gerado")
+    args = parser.parse_args()
+
+    print("POBCHECKER - CALIBRAÇÃO DE CÂMERA")
+    print("=" * 50)
+
+    if args.no_sample:
+        source = None
+    else:
+        source = args.video if args.video else args.camera
+        print("Mostre alguns crachás para a câmera durante a amostra." if args.video is None else
+              f"Amostra gravada: {args.video}")
+
+    params, metrics, results = calibrate(source, args.seconds, args.cpu_budget, args.payloads)
+    print_table(results)
+
+    if params is None:
+        print("\n❌ Nenhuma combinação cabe no orçamento de CPU. Aumente --cpu-budget.")
+        return
+
+    save_camera_profile(args.output, params, metrics)
+    print(f"\n✅ Perfil salvo em {args.output}")
+    for key, value in params.items():
+        print(f"   {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
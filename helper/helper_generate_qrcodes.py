@@ -1,20 +1,39 @@
 # Arquivo: helper_generate_qrcodes.py - Helper para geração de QR Codes
 
+import argparse
+import hashlib
+import json
 import sqlite3
 import qrcode
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageDraw, ImageFont
 
 # Adiciona o diretório pai ao path para importar config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import QR_EVENT_CODE
+from qr_payload import encode_payload
 
 # --- Configurações ---
 # Obtem o diretório raiz do projeto (diretório pai do helper)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATABASE_FILE = os.path.join(ROOT_DIR, "pobchecker.sqlite3")
 OUTPUT_FOLDER = os.path.join(ROOT_DIR, "qrcodes_cpf")
+# Inclui o nome no QR Code. Sem ele o conteúdo compacto cabe na menor versão de QR (módulos
+# maiores, leitura mais rápida), mas o check in só funciona para quem já está no cadastro
+# do terminal: crachás sem nome de pessoas novas são recusados
+INCLUDE_NAME = True
+# Manifesto com o hash de cada crachá gerado (geração incremental)
+MANIFEST_FILE = os.path.join(OUTPUT_FOLDER, "manifest.json")
+# Configuração de renderização; alterá-la gera novamente todos os crachás
+RENDER_SETTINGS = "v1|box=10|border=4|ecc=L"
+# Folhas A4 para impressão (150 DPI)
+SHEET_DPI = 150
+SHEET_SIZE = (1240, 1754)
+SHEET_COLUMNS = 3
+SHEET_ROWS = 4
 
 def sanitize_filename(name):
     """
@@ -27,10 +46,64 @@ def sanitize_filename(name):
     name = re.sub(r'[^a-zA-Z0-9_-]', '', name)
     return name
 
-def create_qrcodes():
+def build_qr_image(qr_data, box_size=10, border=4, fill_color="black"):
+    """
+    Cria a imagem (PIL) do QR Code de um crachá com a configuração padrão do sistema.
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+    return qr.make_image(fill_color=fill_color, back_color="white")
+
+def _render_badge(job):
+    """
+    Gera e salva o PNG de um crachá (executado nos processos do pool).
+
+    Args:
+        job: Tupla (caminho do arquivo, conteúdo do QR Code)
+    """
+    filepath, qr_data = job
+    build_qr_image(qr_data).save(filepath)
+    return filepath
+
+def _badge_hash(qr_data):
+    """Hash do conteúdo e da configuração de renderização de um crachá."""
+    return hashlib.sha256(f"{RENDER_SETTINGS}|{qr_data}".encode("utf-8")).hexdigest()
+
+def _load_manifest():
+    """Carrega o manifesto {arquivo: hash} da última geração."""
+    try:
+        with open(MANIFEST_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_manifest(manifest):
+    """Grava o manifesto de forma atômica."""
+    temp_file = MANIFEST_FILE + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(temp_file, MANIFEST_FILE)
+
+def create_qrcodes(workers=None, force=False):
     """
     Função principal para ler o banco de dados e gerar os QR Codes.
-    QR Codes agora contêm CPF|Nome para melhor identificação.
+    QR Codes usam o formato compacto P1 (qr_payload.py), com nome opcional.
+
+    A geração é incremental: um manifesto guarda o hash do conteúdo de cada crachá e só
+    os novos ou alterados são gerados, em paralelo por um pool de processos.
+
+    Args:
+        workers: Número de processos (padrão: número de núcleos)
+        force: Gera novamente todos os crachás
+
+    Returns:
+        list: Tuplas (arquivo, nome, CPF) de todos os crachás atuais, na ordem do cadastro
     """
     print("Iniciando a geração de QR Codes...")
 
@@ -38,7 +111,7 @@ def create_qrcodes():
     if not os.path.exists(DATABASE_FILE):
         print(f"Erro: O arquivo de banco de dados '{DATABASE_FILE}' não foi encontrado.")
         print("Por favor, execute o script 'pob_test_data.py' primeiro para criar e popular o banco.")
-        return
+        return []
 
     # 2. Cria a pasta de saída para os QR Codes, se ela não existir
     os.makedirs(OUTPUT_FOLDER, exist_ok=True)
@@ -49,52 +122,110 @@ def create_qrcodes():
     cursor = conn.cursor()
     
     try:
-        cursor.execute("SELECT Name, CPF FROM POB")
+        cursor.execute("SELECT Name, CPF FROM POB ORDER BY Name")
         people = cursor.fetchall()
     except sqlite3.Error as e:
         print(f"Ocorreu um erro ao ler o banco de dados: {e}")
         conn.close()
-        return
+        return []
         
     conn.close()
     
     if not people:
         print("Nenhuma pessoa encontrada no banco de dados.")
-        return
+        return []
 
-    # 4. Itera sobre cada pessoa e cria o QR Code
-    count = 0
-    for person in people:
-        nome, cpf = person
-        
+    # 4. Compara com o manifesto e separa os crachás novos ou alterados
+    previous_manifest = _load_manifest()
+    old_manifest = {} if force else previous_manifest
+    manifest = {}
+    badges = []
+    jobs = []
+    for nome, cpf in people:
         # Cria um nome de arquivo limpo e seguro
         filename = f"{sanitize_filename(nome)}_{cpf}.png"
         filepath = os.path.join(OUTPUT_FOLDER, filename)
         
-        # Configuração do QR Code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        
-        # Adiciona o dado no formato CPF|NOME ao QR Code
-        qr_data = f"{cpf}|{nome}"
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        
-        # Cria a imagem do QR Code
-        img = qr.make_image(fill_color="black", back_color="white")
+        # Conteúdo do QR Code no formato compacto
+        qr_data = encode_payload(cpf, nome if INCLUDE_NAME else None)
+        manifest[filename] = _badge_hash(qr_data)
+        badges.append((filepath, nome, cpf))
         
-        # Salva a imagem no arquivo
-        img.save(filepath)
-        
-        print(f"  -> Gerado QR Code para: {nome} (CPF: {cpf})")
-        count += 1
+        if old_manifest.get(filename) != manifest[filename] or not os.path.exists(filepath):
+            jobs.append((filepath, qr_data))
+
+    # 5. Remove crachás de pessoas que saíram do cadastro (apenas os gerados por este script)
+    removed = 0
+    for filename in set(previous_manifest) - set(manifest):
+        filepath = os.path.join(OUTPUT_FOLDER, filename)
+        if os.path.exists(filepath):
+            os.remove(filepath)
+            removed += 1
+
+    # 6. Gera os crachás pendentes em paralelo
+    if jobs:
+        workers = workers or os.cpu_count() or 1
+        print(f"Gerando {len(jobs)} QR Codes com {workers} processos...")
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for done, _ in enumerate(pool.map(_render_badge, jobs, chunksize=chunksize), 1):
+                if done % 500 == 0:
+                    print(f"  -> {done}/{len(jobs)}")
+
+    _save_manifest(manifest)
 
-    print(f"\nProcesso concluído! {count} QR Codes foram gerados com sucesso.")
-    print("Formato dos QR Codes: CPF|NOME")
+    print(f"\nProcesso concluído! {len(jobs)} QR Codes gerados, "
+          f"{len(people) - len(jobs)} sem alteração, {removed} removidos.")
+    print("Formato dos QR Codes: P1 compacto" + (" com nome" if INCLUDE_NAME else ""))
+    return badges
+
+def _sheet_pages(badges):
+    """Gera as folhas A4 uma de cada vez, com o QR Code e o nome de cada crachá."""
+    cell_w = SHEET_SIZE[0] // SHEET_COLUMNS
+    cell_h = SHEET_SIZE[1] // SHEET_ROWS
+    qr_side = min(cell_w, cell_h) - 60
+    per_page = SHEET_COLUMNS * SHEET_ROWS
+    font = ImageFont.load_default()
+
+    for first in range(0, len(badges), per_page):
+        page = Image.new("RGB", SHEET_SIZE, "white")
+        draw = ImageDraw.Draw(page)
+        for i, (filepath, nome, cpf) in enumerate(badges[first:first + per_page]):
+            left = (i % SHEET_COLUMNS) * cell_w
+            top = (i // SHEET_COLUMNS) * cell_h
+            with Image.open(filepath) as badge:
+                qr = badge.convert("RGB").resize((qr_side, qr_side), Image.NEAREST)
+            page.paste(qr, (left + (cell_w - qr_side) // 2, top + 10))
+            draw.text((left + 20, top + qr_side + 20), f"{nome} - {cpf}", fill="black", font=font)
+        yield page
+
+def create_badge_sheets(badges, sheet_format="pdf"):
+    """
+    Monta folhas A4 com vários crachás para impressão.
+    As páginas são geradas e gravadas uma a uma, sem manter todas as imagens na memória.
+
+    Args:
+        badges: Tuplas (arquivo, nome, CPF) retornadas por create_qrcodes
+        sheet_format: "pdf" (um arquivo com todas as páginas) ou "png" (um arquivo por folha)
+    """
+    if not badges:
+        return
+
+    pages = 0
+    if sheet_format == "pdf":
+        filepath = os.path.join(OUTPUT_FOLDER, "crachas.pdf")
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        for page in _sheet_pages(badges):
+            # append=True acrescenta a página ao PDF já gravado
+            page.save(filepath, "PDF", resolution=SHEET_DPI, append=pages > 0)
+            pages += 1
+        print(f"  -> {pages} folhas A4 salvas em {filepath}")
+    else:
+        for page in _sheet_pages(badges):
+            pages += 1
+            page.save(os.path.join(OUTPUT_FOLDER, f"folha_{pages:03d}.png"), dpi=(SHEET_DPI, SHEET_DPI))
+        print(f"  -> {pages} folhas A4 salvas em {OUTPUT_FOLDER}/folha_*.png")
 
 def create_qr_event():
     """
@@ -134,5 +265,13 @@ def create_qr_event():
     return filepath
 
 if __name__ == "__main__":
-    create_qrcodes()
+    parser = argparse.ArgumentParser(description="Geração dos QR Codes dos crachás")
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: número de núcleos)")
+    parser.add_argument("--force", action="store_true", help="Gera novamente todos os crachás")
+    parser.add_argument("--sheets", choices=["pdf", "png"], help="Gera também folhas A4 para impressão")
+    args = parser.parse_args()
+
+    badges = create_qrcodes(workers=args.workers, force=args.force)
+    if args.sheets:
+        create_badge_sheets(badges, args.sheets)
     create_qr_event()
\ No newline at end of file
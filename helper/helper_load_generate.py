@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo: helper_load_generate.py
+Descrição: Gerador rápido e não interativo de dados sintéticos para testes de carga.
+           Cria o cadastro (POB), meses de histórico de embarque/desembarque (CHECK_IN_OUT)
+           em regime de escala e simulados de abandono (EVENTS/CHECK_EVENT) com
+           distribuições de horário realistas, gravando tudo com executemany em
+           grandes transações.
+
+Uso:
+    python helper/helper_load_generate.py --people 100000 --months 6
+    python helper/helper_load_generate.py --db pobchecker_load.sqlite3 --people 5000 --months 12
+"""
+
+import argparse
+import bisect
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from faker import Faker
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from helper.helper_pob_generate import generate_cpf
+
+# Escalas de trabalho embarcado (dias embarcado = dias de folga) e seus pesos
+ROTATIONS = [(14, 0.6), (21, 0.3), (28, 0.1)]
+
+# Horário dos voos de troca de turma: média e desvio padrão (horas)
+FLIGHT_HOUR_MEAN = 9.5
+FLIGHT_HOUR_STD = 1.5
+
+# Simulados de abandono: horário médio, duração e presença
+DRILL_HOUR_MEAN = 14.0
+DRILL_HOUR_STD = 2.0
+DRILL_DURATION_MINUTES = 30
+DRILL_ATTENDANCE = 0.98
+# Chegada ao ponto de reunião (log-normal): mediana de ~3 minutos
+DRILL_ARRIVAL_MU = math.log(180)
+DRILL_ARRIVAL_SIGMA = 0.6
+
+# Linhas por executemany
+CHUNK_SIZE = 50000
+
+
+def _timestamp(epoch):
+    """Formata um horário (segundos) no padrão do banco: YYYY-MM-DD HH:MM:SS."""
+    return datetime.fromtimestamp(epoch).isoformat(sep=" ", timespec="seconds")
+
+
+def _chunks(rows, size=CHUNK_SIZE):
+    """Divide um iterável de linhas em listas de até size linhas."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_people(count, rng):
+    """
+    Gera pessoas com CPF válido e único e nome realista.
+
+    Returns:
+        list: Tuplas (CPF, nome, grupo)
+    """
+    # Um conjunto de nomes do Faker é combinado localmente (Faker por pessoa é lento)
+    fake = Faker('pt_BR')
+    first_names = list({fake.first_name() for _ in range(400)})
+    last_names = list({fake.last_name() for _ in range(400)})
+
+    cpfs = set()
+    people = []
+    while len(people) < count:
+        cpf = generate_cpf()
+        if cpf in cpfs:
+            continue
+        cpfs.add(cpf)
+        nome = " ".join([rng.choice(first_names)] + rng.sample(last_names, rng.randint(1, 3)))
+        people.append((cpf, nome, rng.randint(1, 5)))
+    return people
+
+
+def _flight_time(day_start, rng):
+    """Horário de um voo no dia (segundos desde a época)."""
+    hour = min(max(rng.gauss(FLIGHT_HOUR_MEAN, FLIGHT_HOUR_STD), 6.0), 17.0)
+    return day_start + int(hour * 3600)
+
+
+def generate_rotations(people_count, start, end, rng):
+    """
+    Gera os períodos embarcados de cada pessoa entre start e end (segundos desde a época).
+
+    Returns:
+        list: Para cada pessoa, lista de (embarque, desembarque ou None se ainda a bordo)
+    """
+    day = 86400
+    first_day = start - start % day
+    weights = [weight for _, weight in ROTATIONS]
+    rotations = []
+
+    for _ in range(people_count):
+        length = rng.choices([days for days, _ in ROTATIONS], weights)[0]
+        # Fase aleatória no ciclo embarque + folga
+        cycle_start = first_day - rng.randrange(2 * length) * day
+        periods = []
+        while cycle_start < end:
+            check_in = _flight_time(cycle_start, rng)
+            check_out = _flight_time(cycle_start + length * day, rng)
+            if check_out > start and check_in < end:
+                periods.append((check_in if check_in >= start else None,
+                                check_out if check_out < end else None))
+            cycle_start += 2 * length * day
+        rotations.append(periods)
+    return rotations
+
+
+def _movement_rows(people, rotations):
+    """Linhas de CHECK_IN_OUT em ordem cronológica (como seriam gravadas pelo terminal)."""
+    # Ordena movimentos codificados em inteiros: (horário, pessoa, tipo)
+    count = len(people)
+    encoded = []
+    for index, periods in enumerate(rotations):
+        for check_in, check_out in periods:
+            if check_in is not None:
+                encoded.append((check_in * count + index) * 2)
+            if check_out is not None:
+                encoded.append((check_out * count + index) * 2 + 1)
+    encoded.sort()
+
+    for code in encoded:
+        moment, is_out = divmod(code, 2)
+        epoch, index = divmod(moment, count)
+        cpf, nome, _ = people[index]
+        yield (cpf, nome, "OUT" if is_out else "IN", _timestamp(epoch), epoch)
+
+
+def generate_drills(start, end, interval_days, rng):
+    """
+    Gera os simulados de abandono (um a cada interval_days dias).
+
+    Returns:
+        list: Horários (segundos desde a época) de abertura dos simulados
+    """
+    day = 86400
+    drills = []
+    current = start - start % day + day
+    while current < end - day:
+        hour = min(max(rng.gauss(DRILL_HOUR_MEAN, DRILL_HOUR_STD), 8.0), 20.0)
+        drills.append(current + int(hour * 3600))
+        current += interval_days * day
+    return drills
+
+
+def _drill_rows(people, rotations, drills, rng):
+    """Linhas de CHECK_EVENT: pessoas a bordo no horário de cada simulado, em ordem de chegada."""
+    max_delay = DRILL_DURATION_MINUTES * 60
+    arrivals = [[] for _ in drills]
+
+    for index, periods in enumerate(rotations):
+        for check_in, check_out in periods:
+            # Simulados dentro do período embarcado [embarque, desembarque)
+            first = bisect.bisect_left(drills, check_in) if check_in is not None else 0
+            last = bisect.bisect_left(drills, check_out) if check_out is not None else len(drills)
+            for drill in range(first, last):
+                if rng.random() < DRILL_ATTENDANCE:
+                    delay = min(int(rng.lognormvariate(DRILL_ARRIVAL_MU, DRILL_ARRIVAL_SIGMA)), max_delay)
+                    arrivals[drill].append((drills[drill] + delay, index))
+
+    for event_id, drill_arrivals in enumerate(arrivals, 1):
+        drill_arrivals.sort()
+        for arrival, index in drill_arrivals:
+            cpf, nome, _ = people[index]
+            yield (cpf, nome, _timestamp(arrival), event_id, arrival)
+
+
+def generate_load_database(db_file, people_count=100000, months=6, drill_interval_days=7, seed=42):
+    """
+    Cria (ou completa) um banco com cadastro, histórico de escalas e simulados.
+
+    Returns:
+        dict: Quantidade de linhas geradas por tabela e tempo total
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    random.seed(seed)  # generate_cpf usa o gerador global
+
+    end = int(time.time())
+    start = int((datetime.fromtimestamp(end) - timedelta(days=30 * months)).timestamp())
+
+    db = Database(db_file)
+    # Geração de dados descartáveis: sem fsync a cada transação
+    db.cursor.execute("PRAGMA synchronous = OFF")
+
+    people = generate_people(people_count, rng)
+    rotations = generate_rotations(people_count, start, end, rng)
+    drills = generate_drills(start, end, drill_interval_days, rng)
+
+    stats = {'POB': len(people), 'CHECK_IN_OUT': 0, 'EVENTS': len(drills), 'CHECK_EVENT': 0}
+
+    with db.transaction():
+        # Onshore = 0 para quem está a bordo agora (último período sem desembarque)
+        db.cursor.executemany(
+            "INSERT OR REPLACE INTO POB (CPF, Name, GroupNumber, Onshore) VALUES (?, ?, ?, ?)",
+            ((cpf, nome, grupo, 0 if periods and periods[-1][1] is None else 1)
+             for (cpf, nome, grupo), periods in zip(people, rotations))
+        )
+
+        for chunk in _chunks(_movement_rows(people, rotations)):
+            db.cursor.executemany(
+                "INSERT INTO CHECK_IN_OUT (CPF, Name, Type, Timestamp, Epoch) VALUES (?, ?, ?, ?, ?)", chunk
+            )
+            stats['CHECK_IN_OUT'] += len(chunk)
+
+        # IDs dos simulados continuam a partir dos eventos já existentes
+        db.cursor.execute("SELECT COALESCE(MAX(ID), 0) FROM EVENTS")
+        first_id = db.cursor.fetchone()[0]
+        duration = DRILL_DURATION_MINUTES * 60
+        db.cursor.executemany(
+            "INSERT INTO EVENTS (ID, Open, Close, Closed, OpenEpoch, CloseEpoch) VALUES (?, ?, ?, 1, ?, ?)",
+            ((first_id + i, _timestamp(opened), _timestamp(opened + duration), opened, opened + duration)
+             for i, opened in enumerate(drills, 1))
+        )
+
+        for chunk in _chunks(_drill_rows(people, rotations, drills, rng)):
+            db.cursor.executemany(
+                "INSERT INTO CHECK_EVENT (CPF, Name, Timestamp, Event, Epoch) VALUES (?, ?, ?, ?, ?)",
+                [(cpf, nome, timestamp, first_id + event_id, epoch)
+                 for cpf, nome, timestamp, event_id, epoch in chunk]
+            )
+            stats['CHECK_EVENT'] += len(chunk)
+
+    db.conn.close()
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Gerador de dados sintéticos para testes de carga")
+    parser.add_argument("--db", default="pobchecker_load.sqlite3", help="Arquivo do banco (padrão: pobchecker_load.sqlite3)")
+    parser.add_argument("--people", type=int, default=100000, help="Número de pessoas no cadastro")
+    parser.add_argument("--months", type=int, default=6, help="Meses de histórico")
+    parser.add_argument("--drill-interval", type=int, default=7, help="Dias entre simulados de abandono")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório")
+    args = parser.parse_args()
+
+    print("POBCHECKER - GERADOR DE DADOS PARA TESTES DE CARGA")
+    print("=" * 50)
+    print(f"Gerando {args.people} pessoas e {args.months} meses de histórico em {args.db}...")
+
+    stats = generate_load_database(args.db, args.people, args.months, args.drill_interval, args.seed)
+
+    print(f"\n✅ Concluído em {stats['seconds']:.1f}s")
+    for table in ("POB", "CHECK_IN_OUT", "EVENTS", "CHECK_EVENT"):
+        print(f"📊 {table}: {stats[table]} linhas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+log_manager.py - Logging assíncrono com limite de mensagens repetidas e histórico recente em memória
+"""
+
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import signal
+import sys
+import threading
+import time
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Estado do logging configurado por setup_logging
+_listener = None
+_queue_handler = None
+_ring_handler = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita mensagens repetidas: cada ponto de log (logger e linha) passa no máximo
+    burst vezes por janela de period segundos. A primeira mensagem da janela seguinte
+    informa quantas foram suprimidas. Roda na thread que gera a mensagem, antes da fila.
+    """
+
+    def __init__(self, period=10.0, burst=5):
+        super().__init__()
+        self.period = period
+        self.burst = burst
+        self.suppressed_total = 0
+        self._windows = {}  # (logger, linha) -> [início da janela, mensagens, suprimidas]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = (record.name, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if len(self._windows) > 1024:
+                    self._windows = {k: w for k, w in self._windows.items() if now - w[0] < self.period}
+                if suppressed:
+                    record.msg = f"{record.getMessage()} (+{suppressed} mensagens iguais suprimidas)"
+                    record.args = None
+                return True
+
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+
+            window[2] += 1
+            self.suppressed_total += 1
+            return False
+
+
+class RingBufferHandler(logging.Handler):
+    """Mantém em memória as últimas mensagens formatadas, para consulta ou gravação sob demanda."""
+
+    def __init__(self, capacity=1000):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que descarta (e conta) mensagens quando a fila está cheia, sem bloquear."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level="INFO", module_levels=None, log_file=None, ring_size=1000,
+                  rate_limit_period=10.0, rate_limit_burst=5, queue_size=10000, dump_file=None):
+    """
+    Configura o logging da aplicação. As mensagens são formatadas e filtradas na thread
+    que as gera e escritas por uma thread de fundo (QueueListener), sem que o console ou
+    o arquivo atrasem o loop de captura.
+
+    Args:
+        level: Nível padrão ("DEBUG", "INFO", "WARNING", ...)
+        module_levels: Níveis por módulo, ex.: {"camera_manager": "DEBUG"}
+        log_file: Arquivo de log com rotação (None = apenas console)
+        ring_size: Mensagens recentes mantidas em memória
+        rate_limit_period: Janela (segundos) do limite de mensagens repetidas
+        rate_limit_burst: Mensagens por ponto de log aceitas em cada janela
+        queue_size: Tamanho máximo da fila até a thread de escrita
+        dump_file: Arquivo para gravar as mensagens recentes ao receber SIGUSR1 (Linux)
+    """
+    global _listener, _queue_handler, _ring_handler
+    if _listener is not None:
+        return
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    _ring_handler = RingBufferHandler(ring_size)
+    _ring_handler.setFormatter(formatter)
+    handlers = [console_handler, _ring_handler]
+
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=1024 * 1024, backupCount=3, encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = _BoundedQueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter(rate_limit_period, rate_limit_burst))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    if dump_file and hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGUSR1, lambda signum, frame: dump_recent(dump_file))
+
+
+def shutdown_logging():
+    """Escreve as mensagens ainda na fila e para a thread de escrita."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
+
+
+def get_recent_logs():
+    """Retorna as mensagens recentes mantidas em memória (mais antigas primeiro)."""
+    return list(_ring_handler.records) if _ring_handler else []
+
+
+def dump_recent(path):
+    """Grava as mensagens recentes em um arquivo. Retorna o número de linhas gravadas."""
+    lines = get_recent_logs()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return len(lines)
+
+
+def get_logging_stats():
+    """Retorna as métricas do logging (mensagens suprimidas e descartadas por fila cheia)."""
+    if _queue_handler is None:
+        return {'suppressed': 0, 'dropped': 0, 'queued': 0}
+    rate_limit = _queue_handler.filters[0]
+    return {
+        'suppressed': rate_limit.suppressed_total,
+        'dropped': _queue_handler.dropped,
+        'queued': _queue_handler.queue.qsize(),
+    }
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+multi_camera_manager.py - Captura de várias câmeras com pool compartilhado de decodificação
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from camera_manager import CameraManager
+from ui_dispatcher import UIDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+class MultiCameraManager:
+    """
+    Gerencia várias câmeras (uma por faixa de acesso do portaló).
+    Cada câmera tem sua própria thread de captura e preview; a decodificação dos frames
+    é feita por um pool de workers do tamanho do número de núcleos (o OpenCV libera o GIL
+    durante a detecção). As leituras de todas as câmeras são unidas em um único fluxo,
+    sem duplicados.
+    """
+
+    def __init__(self, video_canvases, camera_indices, on_qr_batch_detected=None, decode_workers=None,
+                 dispatcher=None, camera_settings=None):
+        """
+        Inicializa o gerenciador de múltiplas câmeras.
+
+        Args:
+            video_canvases: Lista de widgets CTkLabel, um preview por câmera
+            camera_indices: Lista de índices das câmeras, na mesma ordem de video_canvases
+            on_qr_batch_detected: Callback que recebe a lista de QR codes novos (thread principal)
+            decode_workers: Número de workers de decodificação (padrão: número de núcleos)
+            dispatcher: UIDispatcher compartilhado pelas câmeras (None cria um)
+            camera_settings: Parâmetros de captura e decodificação repassados a cada CameraManager
+                (capture_resolution, burst_resolution, decode_fps, preview_fps, capture_format,
+                preprocessing_tiers, tier_budget_ms, decode_processes...). Com decode_processes > 0
+                cada câmera decodifica nos seus próprios processos, no lugar do pool compartilhado
+        """
+        if len(video_canvases) != len(camera_indices):
+            raise ValueError("É necessário um preview (video_canvas) para cada câmera")
+
+        self.on_qr_batch_detected = on_qr_batch_detected
+        self.decode_workers = decode_workers or os.cpu_count() or 1
+        self.decoder_pool = None
+        if dispatcher is None:
+            dispatcher = UIDispatcher(video_canvases[0])
+            dispatcher.start()
+        self.dispatcher = dispatcher
+
+        self.merged_scans = 0
+        self.duplicate_scans = 0
+
+        self.cameras = [
+            CameraManager(
+                video_canvas=canvas,
+                on_qr_batch_detected=lambda qr_batch, index=index: self._merge_scans(index, qr_batch),
+                camera_index=index,
+                dispatcher=dispatcher,
+                **(camera_settings or {})
+            )
+            for canvas, index in zip(video_canvases, camera_indices)
+        ]
+
+        # Deduplicação entre câmeras (o mesmo crachá pode aparecer nas duas faixas), na mesma
+        # janela de cada câmera (camera_settings, perfil calibrado ou padrão do CameraManager)
+        self.recent_scans = {}
+        self.scan_cooldown = self.cameras[0].scan_cooldown  # segundos
+
+    def start_camera(self):
+        """Inicia todas as câmeras. Retorna True se ao menos uma foi iniciada."""
+        self.decoder_pool = ThreadPoolExecutor(
+            max_workers=self.decode_workers,
+            thread_name_prefix="qr-decode"
+        )
+        logger.info("Pool de decodificação com %s workers", self.decode_workers)
+
+        started = 0
+        for camera in self.cameras:
+            camera.decoder_pool = self.decoder_pool
+            if camera.start_camera():
+                started += 1
+            else:
+                logger.warning("Câmera %s não iniciada", camera.camera_index)
+
+        logger.info("%s/%s câmeras ativas", started, len(self.cameras))
+        return started > 0
+
+    def stop_camera(self):
+        """Para todas as câmeras e finaliza o pool de decodificação."""
+        for camera in self.cameras:
+            camera.stop_camera()
+
+        if self.decoder_pool is not None:
+            self.decoder_pool.shutdown(wait=False)
+            self.decoder_pool = None
+
+    def _merge_scans(self, camera_index, qr_batch):
+        """Une as leituras das câmeras, descartando o que outra câmera já entregou (thread principal)."""
+        current_time = time.time()
+        merged_batch = []
+
+        for qr_data in qr_batch:
+            last_time = self.recent_scans.get(qr_data)
+            if last_time is not None and (current_time - last_time) <= self.scan_cooldown:
+                self.duplicate_scans += 1
+                continue
+            self.recent_scans[qr_data] = current_time
+            merged_batch.append(qr_data)
+
+        if len(self.recent_scans) > 256:
+            self.recent_scans = {
+                qr: t for qr, t in self.recent_scans.items()
+                if (current_time - t) <= self.scan_cooldown
+            }
+
+        if merged_batch:
+            self.merged_scans += len(merged_batch)
+            logger.info("Câmera %s entregou %s leitura(s)", camera_index, len(merged_batch))
+            if self.on_qr_batch_detected:
+                self.on_qr_batch_detected(merged_batch)
+
+    def is_active(self):
+        """Retorna se ao menos uma câmera está ativa."""
+        return any(camera.is_active() for camera in self.cameras)
+
+    def get_stats(self):
+        """Retorna estatísticas gerais e de cada câmera."""
+        return {
+            'is_active': self.is_active(),
+            'decode_workers': self.decode_workers,
+            'merged_scans': self.merged_scans,
+            'duplicate_scans': self.duplicate_scans,
+            'ui_queue': self.dispatcher.get_stats(),
+            'cameras': [camera.get_stats() for camera in self.cameras],
+        }
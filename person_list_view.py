@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+person_list_view.py - Lista de pessoas rolável com atualização incremental das linhas
+"""
+
+import bisect
+
+import customtkinter as ctk
+
+
+class PersonListView:
+    """
+    Lista de pessoas ordenada por nome em um CTkScrollableFrame.
+    Mantém uma linha por CPF e, ao receber uma nova lista, cria ou destrói apenas as
+    linhas que mudaram. A atualização pode ser feita aos poucos pelo loop do Tk
+    (set_people_in_background), sem travar a interface com listas grandes.
+    """
+
+    def __init__(self, parent, row_color="transparent", cpf_width=150, chunk_size=50):
+        """
+        Inicializa a lista.
+
+        Args:
+            parent: Widget pai
+            row_color: Cor de fundo das linhas
+            cpf_width: Largura da coluna do CPF
+            chunk_size: Linhas criadas/removidas por passo na atualização em segundo plano
+        """
+        self.frame = ctk.CTkScrollableFrame(parent, label_text="")
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.row_color = row_color
+        self.cpf_width = cpf_width
+        self.chunk_size = chunk_size
+
+        self.rows = {}    # CPF -> (widget da linha, nome)
+        self._order = []  # (nome, CPF) ordenados, na mesma ordem das linhas
+        self._pending_job = None
+        self._pending = {}  # CPF -> ("add", nome) ou ("remove", None) ainda não aplicados
+
+    def grid(self, **kwargs):
+        """Exibe a lista no grid do widget pai."""
+        self.frame.grid(**kwargs)
+
+    def grid_remove(self):
+        """Esconde a lista mantendo as linhas."""
+        self.frame.grid_remove()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, cpf):
+        return cpf in self.rows
+
+    def add(self, cpf, nome):
+        """Insere uma pessoa na posição ordenada por nome (prevalece sobre a atualização em segundo plano)."""
+        self._pending.pop(cpf, None)
+        self._add(cpf, nome)
+
+    def remove(self, cpf):
+        """Remove a linha de uma pessoa, se existir (prevalece sobre a atualização em segundo plano)."""
+        self._pending.pop(cpf, None)
+        self._remove(cpf)
+
+    def _add(self, cpf, nome):
+        if cpf in self.rows:
+            if self.rows[cpf][1] == nome:
+                return
+            self._remove(cpf)
+
+        key = (nome, cpf)
+        position = bisect.bisect_left(self._order, key)
+        self._order.insert(position, key)
+
+        row_frame = ctk.CTkFrame(self.frame, fg_color=self.row_color)
+        if position + 1 < len(self._order):
+            next_row = self.rows[self._order[position + 1][1]][0]
+            row_frame.pack(fill="x", pady=2, padx=2, before=next_row)
+        else:
+            row_frame.pack(fill="x", pady=2, padx=2)
+
+        label_nome = ctk.CTkLabel(row_frame, text=nome, anchor="w", fg_color="transparent")
+        label_nome.pack(side="left", padx=10, pady=5, expand=True, fill="x")
+
+        label_cpf = ctk.CTkLabel(row_frame, text=cpf, anchor="e", width=self.cpf_width, fg_color="transparent")
+        label_cpf.pack(side="right", padx=10, pady=5)
+
+        self.rows[cpf] = (row_frame, nome)
+
+    def _remove(self, cpf):
+        row = self.rows.pop(cpf, None)
+        if row is None:
+            return
+        row_frame, nome = row
+        position = bisect.bisect_left(self._order, (nome, cpf))
+        del self._order[position]
+        row_frame.destroy()
+
+    def _diff(self, people):
+        """Operações por CPF (adicionar/remover) para a lista passar a conter exatamente people."""
+        wanted = {cpf: nome for cpf, nome, *_ in people}
+        operations = {cpf: ("remove", None) for cpf, (_, nome) in self.rows.items()
+                      if wanted.get(cpf) != nome}
+        operations.update((cpf, ("add", nome)) for cpf, nome in wanted.items()
+                          if cpf not in self.rows or self.rows[cpf][1] != nome)
+        return operations
+
+    def _apply(self, operations):
+        for cpf, (action, nome) in operations:
+            if action == "add":
+                self._add(cpf, nome)
+            else:
+                self._remove(cpf)
+
+    def set_people(self, people):
+        """
+        Atualiza a lista para conter exatamente as pessoas informadas.
+
+        Args:
+            people: Tuplas (CPF, nome, ...) como retornadas pelo Database
+        """
+        self.cancel_pending()
+        self._apply(self._diff(people).items())
+
+    def set_people_in_background(self, people, on_done=None):
+        """
+        Como set_people, mas aplica as mudanças em partes pelo loop do Tk. Um add()/remove()
+        feito no meio (ex.: uma leitura) descarta a operação pendente da mesma pessoa.
+        """
+        self.cancel_pending()
+        self._pending = self._diff(people)
+
+        def step():
+            chunk = []
+            while self._pending and len(chunk) < self.chunk_size:
+                cpf = next(iter(self._pending))
+                chunk.append((cpf, self._pending.pop(cpf)))
+            self._apply(chunk)
+            if self._pending:
+                self._pending_job = self.frame.after(1, step)
+            else:
+                self._pending_job = None
+                if on_done:
+                    on_done()
+
+        self._pending_job = self.frame.after_idle(step)
+
+    def cancel_pending(self):
+        """Cancela uma atualização em segundo plano ainda não concluída."""
+        self._pending = {}
+        if self._pending_job is not None:
+            self.frame.after_cancel(self._pending_job)
+            self._pending_job = None
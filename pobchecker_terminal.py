@@ -3,18 +3,45 @@
 # Sistema de Controle de Presença - Terminal Operacional
 
 import customtkinter as ctk
+import logging
 import time
 from database import Database
 from audio_manager import play_beep_sound, play_success_sound, play_error_sound
 from camera_manager import CameraManager
-from config import QR_EVENT_CODE, DEFAULT_MODE
+from multi_camera_manager import MultiCameraManager
+from camera_watchdog import CameraWatchdog
+from camera_profile import load_camera_profile
+from person_list_view import PersonListView
+from ui_dispatcher import UIDispatcher
+from ui_watchdog import UIWatchdog
+from log_manager import setup_logging
+from roster_snapshot import load_snapshot, save_snapshot
+from config import (
+    QR_EVENT_CODE, DEFAULT_MODE, DEFAULT_GROUP, ALL_GROUPS_LABEL, CAMERA_INDICES, DECODE_PROCESSES,
+    CAPTURE_RESOLUTION, BURST_RESOLUTION, DECODE_FPS, PREVIEW_FPS, CAPTURE_FORMAT,
+    PREPROCESSING_TIERS, TIER_BUDGET_MS, CAMERA_PROFILE_FILE, UI_DISPATCH_INTERVAL_MS, UI_QUEUE_SIZE,
+    UI_STALL_THRESHOLD_MS, UI_STALL_REPORT_FILE, LOG_LEVEL, LOG_LEVELS, LOG_FILE, LOG_DUMP_FILE,
+    SCAN_JOURNAL, SCAN_COMMIT_DELAY_MS, ROSTER_SNAPSHOT, ROSTER_SNAPSHOT_INTERVAL_S, CLEANUP_DELAY_MS,
+    MIGRATION_BATCH, MIGRATION_INTERVAL_MS
+)
+
+logger = logging.getLogger(__name__)
 
 # Define um tema de cores para a aplicação
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
 
 class AttendanceChecker:
-    def __init__(self, master=None):
+    def __init__(self, master=None, db_file="pobchecker.sqlite3", enable_camera=True):
+        """
+        Args:
+            master: Janela pai (None cria a janela principal)
+            db_file: Arquivo do banco de dados
+            enable_camera: Inicia a câmera (False em benchmarks e testes sem câmera)
+        """
+        # Log assíncrono: câmera, banco e áudio não esperam pela escrita no console
+        setup_logging(LOG_LEVEL, LOG_LEVELS, LOG_FILE, dump_file=LOG_DUMP_FILE)
+
         # Se não há master, cria como CTk (janela principal)
         if master is None:
             self.root = ctk.CTk()
@@ -41,23 +68,46 @@ class AttendanceChecker:
         self.geometry("1000x700")
 
         # --- INICIALIZAÇÃO DE VARIÁVEIS E BANCO DE DADOS ---
-        self.db = Database()
-        self.current_group = 1
-        self.person_widgets = {} 
+        # Com o diário, a leitura é confirmada ao operador assim que está no diário
+        self.db = Database(db_file, journal_file=f"{db_file}.scans" if SCAN_JOURNAL else None)
+        self._flush_job = None
+        self.snapshot_file = f"{db_file}.snapshot" if ROSTER_SNAPSHOT else None
+        self._snapshot_job = None
+        self._snapshot_counter = None  # Contador de alterações do banco no último snapshot gravado
+        self._migration_job = None
+        self.current_group = DEFAULT_GROUP  # None exibe todos os grupos
+        self.groups = [DEFAULT_GROUP]
+        self.roster = {}           # CPF -> (nome, grupo, Onshore), carregado uma vez e mantido a cada leitura
+        self.checked_cpfs = set()  # CPFs com presença no evento ativo
+        self.group_views = {}      # grupo (None = todos) -> listas dos modos CIO e CEV
+        self._scan_batch = None  # Estado do lote de leituras em processamento (leitura em grupo)
         
         # Modos de operação
         self.current_mode = DEFAULT_MODE  # "CIO" ou "CEV"
         self.active_event_id = None
         
-        # Executa limpeza automática
-        self.db.clean_old_records()
+        # Estado gravado no último encerramento; None se o banco mudou desde então
+        snapshot = load_snapshot(self.db, self.snapshot_file) if self.snapshot_file else None
+        if snapshot:
+            self._snapshot_counter = self.db.get_change_counter()
         
         if self.current_mode == "CEV":
-            self.active_event_id = self.db.get_active_event()
+            self.active_event_id = snapshot['active_event'] if snapshot else self.db.get_active_event()
         
         # --- GERENCIADOR DE CÂMERA ---
+        # Leituras, previews e avisos das threads de câmera chegam à interface por esta fila
+        self.ui_dispatcher = UIDispatcher(self.root, interval_ms=UI_DISPATCH_INTERVAL_MS, max_size=UI_QUEUE_SIZE)
+        self.ui_dispatcher.start()
         self.camera_manager = None
 
+        # Registra onde a thread principal estava quando a interface travou
+        self.ui_watchdog = None
+        if UI_STALL_REPORT_FILE:
+            self.ui_watchdog = UIWatchdog(self.root, threshold_ms=UI_STALL_THRESHOLD_MS,
+                                          report_file=UI_STALL_REPORT_FILE)
+            self.ui_watchdog.start()
+        self.camera_watchdogs = []
+
         # --- LAYOUT DA INTERFACE ---
         self.root.grid_columnconfigure(1, weight=1)
         self.root.grid_rowconfigure(1, weight=1)
@@ -136,10 +186,10 @@ class AttendanceChecker:
         
         self.group_selector = ctk.CTkSegmentedButton(
             self.group_selector_frame, 
-            values=["Grupo 1", "Grupo 2"], 
+            values=[self._group_label(DEFAULT_GROUP), ALL_GROUPS_LABEL], 
             command=self.change_group
         )
-        self.group_selector.set("Grupo 1")
+        self.group_selector.set(self._group_label(DEFAULT_GROUP))
         self.group_selector.pack(side="top", padx=5, pady=(5, 0), fill="x")
 
         # Frame Direito - Lista e Estatísticas
@@ -148,31 +198,195 @@ class AttendanceChecker:
         self.right_frame.grid_columnconfigure(0, weight=1)
         self.right_frame.grid_rowconfigure(2, weight=1)
         
-        # Configuração da interface baseada no modo
+        # Cabeçalhos dos dois modos são criados uma única vez e alternados na troca de modo
+        self._build_list_layouts()
         self._setup_mode_interface()
 
         # Barra de Status
         self.status_bar = ctk.CTkLabel(self.root, text=self._get_initial_status_message(), anchor="w")
         self.status_bar.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
 
-        # Inicialização
-        self.update_person_list()
+        # Inicialização: listas do grupo exibido agora, as dos demais grupos em segundo plano
+        self.update_person_list(snapshot)
+        self._prebuild_group_views()
+
+        # Limpeza automática, migração de dados do banco e snapshot periódico depois que o
+        # terminal já está pronto para ler
+        self.after(CLEANUP_DELAY_MS, self.db.clean_old_records)
+        if self.db.migrations.pending():
+            self._migration_job = self.after(CLEANUP_DELAY_MS, self._migration_step)
+        if self.snapshot_file:
+            self._snapshot_job = self.after(ROSTER_SNAPSHOT_INTERVAL_S * 1000, self._periodic_snapshot)
         
         # Inicia o gerenciador de câmera após um pequeno delay
-        self.after(500, self.init_camera_manager)
+        if enable_camera:
+            self.after(500, self.init_camera_manager)
         
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def init_camera_manager(self):
         """Initializa o gerenciador de câmera."""
         print("Inicializando gerenciador de câmera...")
-        self.camera_manager = CameraManager(
-            video_canvas=self.video_canvas,
-            on_qr_detected=self.process_qr_code
-        )
+        # Os mesmos parâmetros valem para uma câmera ou para cada câmera do portaló
+        camera_settings = {
+            'capture_resolution': CAPTURE_RESOLUTION,
+            'burst_resolution': BURST_RESOLUTION,
+            'decode_fps': DECODE_FPS,
+            'preview_fps': PREVIEW_FPS,
+            'capture_format': CAPTURE_FORMAT,
+            'preprocessing_tiers': PREPROCESSING_TIERS,
+            'tier_budget_ms': TIER_BUDGET_MS,
+            'decode_processes': DECODE_PROCESSES,
+        }
+        # Perfil calibrado no equipamento substitui os valores do config.py
+        camera_settings.update(load_camera_profile(CAMERA_PROFILE_FILE))
+        
+        if CAMERA_INDICES and len(CAMERA_INDICES) > 1:
+            # Uma câmera por faixa de acesso, com um preview para cada
+            video_canvases = [self.video_canvas]
+            for _ in CAMERA_INDICES[1:]:
+                canvas = ctk.CTkLabel(self.left_frame, text="", width=160, height=120)
+                canvas.pack(side="top", padx=5, pady=(0, 5), fill="x", after=video_canvases[-1])
+                video_canvases.append(canvas)
+            
+            self.camera_manager = MultiCameraManager(
+                video_canvases=video_canvases,
+                camera_indices=CAMERA_INDICES,
+                on_qr_batch_detected=self.process_qr_batch,
+                dispatcher=self.ui_dispatcher,
+                camera_settings=camera_settings
+            )
+        else:
+            self.camera_manager = CameraManager(
+                video_canvas=self.video_canvas,
+                on_qr_detected=self.process_qr_code,
+                on_qr_batch_detected=self.process_qr_batch,
+                camera_index=CAMERA_INDICES[0] if CAMERA_INDICES else None,
+                dispatcher=self.ui_dispatcher,
+                **camera_settings
+            )
         
         if not self.camera_manager.start_camera():
             self.update_status_bar("Erro: Câmera não encontrada ou não pôde ser inicializada.", "red")
+        
+        # Supervisores reabrem a câmera automaticamente em caso de travamento ou desconexão
+        cameras = getattr(self.camera_manager, 'cameras', [self.camera_manager])
+        self.camera_watchdogs = [
+            CameraWatchdog(camera, on_status_change=self._on_camera_status_change)
+            for camera in cameras
+        ]
+        for watchdog in self.camera_watchdogs:
+            watchdog.start()
+
+    def _on_camera_status_change(self, available):
+        """Informa na barra de status a perda ou recuperação da câmera."""
+        if available:
+            self.update_status_bar("Câmera reconectada.", "green")
+        else:
+            self.update_status_bar("Câmera indisponível. Reconectando automaticamente...", "red")
+
+    def process_qr_batch(self, qr_batch):
+        """
+        Processa todos os QR codes novos de um mesmo frame (leitura em grupo nos pontos de reunião).
+        As leituras são gravadas em uma única transação, com um único refresh da lista e um único som.
+        """
+        # O QR_EVENT é tratado antes e fora da transação: um erro em outro crachá do mesmo frame
+        # desfaria o evento criado no banco, deixando o modo CEV apontando para um evento inexistente
+        badges = [qr_data for qr_data in qr_batch if qr_data.strip() != QR_EVENT_CODE]
+        if len(badges) < len(qr_batch):
+            self.process_qr_code(QR_EVENT_CODE)
+        
+        if len(badges) <= 1:
+            if badges:
+                self.process_qr_code(badges[0])
+            return
+        
+        print(f"Processando lote de {len(badges)} QR Codes")
+        self._scan_batch = {'sounds': [], 'refresh': False}
+        failed = False
+        try:
+            with self.db.transaction():
+                for qr_data in badges:
+                    self.process_qr_code(qr_data)
+        except Exception as e:
+            print(f"Erro ao processar lote de QR Codes: {e}")
+            self._scan_batch['sounds'].append(play_error_sound)
+            failed = True
+        finally:
+            batch = self._scan_batch
+            self._scan_batch = None
+        
+        if failed:
+            # O lote foi desfeito no banco: recarrega as listas já atualizadas em memória
+            self.update_person_list()
+        elif batch['refresh']:
+            self._update_stats()
+        
+        errors = batch['sounds'].count(play_error_sound)
+        if errors:
+            self.update_status_bar(f"Leitura em grupo: {len(badges)} crachás, {errors} com erro.", "orange")
+            play_error_sound()
+        else:
+            self.update_status_bar(f"Leitura em grupo: {len(badges)} crachás processados.", "green")
+            if batch['sounds']:
+                batch['sounds'][-1]()
+
+    def _play_feedback(self, sound_func):
+        """Reproduz o som de feedback, ou o acumula enquanto um lote de leituras é processado."""
+        if self._scan_batch is not None:
+            self._scan_batch['sounds'].append(sound_func)
+        else:
+            sound_func()
+
+    def _refresh_after_scan(self):
+        """Atualiza as estatísticas após uma leitura, ou adia para o final do lote (as listas já foram atualizadas)."""
+        if self._scan_batch is not None:
+            self._scan_batch['refresh'] = True
+        else:
+            self._update_stats()
+            self._schedule_db_flush()
+
+    def _schedule_db_flush(self):
+        """Agenda o commit das leituras já gravadas no diário (um commit para várias leituras)."""
+        if self._flush_job is None:
+            self._flush_job = self.after(SCAN_COMMIT_DELAY_MS, self._flush_db)
+
+    def _flush_db(self):
+        """Confirma no banco as leituras pendentes do diário."""
+        self._flush_job = None
+        try:
+            self.db.flush()
+        except Exception as e:
+            # As leituras continuam no diário e são aplicadas na próxima inicialização
+            logger.error("Erro ao confirmar leituras no banco: %s", e)
+
+    def _migration_step(self):
+        """Executa um lote da migração de dados do banco e reagenda enquanto houver lotes pendentes."""
+        self._migration_job = None
+        try:
+            if self.db.migrate_step(MIGRATION_BATCH):
+                self._migration_job = self.after(MIGRATION_INTERVAL_MS, self._migration_step)
+        except Exception as e:
+            # A versão do banco só avança no final: a migração é retomada na próxima inicialização
+            logger.error("Erro na migração do banco: %s", e)
+
+    def _save_snapshot(self):
+        """Grava o snapshot do cadastro, se o banco mudou desde o último."""
+        if not self.snapshot_file:
+            return
+        try:
+            counter = self.db.get_change_counter()
+            if counter != self._snapshot_counter:
+                save_snapshot(self.db, self.snapshot_file)
+                self._snapshot_counter = self.db.get_change_counter()
+        except Exception as e:
+            # Sem snapshot válido a próxima inicialização apenas carrega do banco
+            logger.error("Erro ao gravar snapshot do cadastro: %s", e)
+
+    def _periodic_snapshot(self):
+        """Grava o snapshot periodicamente, para que uma queda de energia não o deixe muito desatualizado."""
+        self._save_snapshot()
+        self._snapshot_job = self.after(ROSTER_SNAPSHOT_INTERVAL_S * 1000, self._periodic_snapshot)
 
     def process_qr_code(self, qr_data):
         """Processa os dados lidos do QR Code."""
@@ -188,7 +402,7 @@ class AttendanceChecker:
         
         if not cpf:
             self.update_status_bar("QR Code inválido: formato não reconhecido.", "red")
-            play_error_sound()
+            self._play_feedback(play_error_sound)
             return
         
         if self.current_mode == "CIO":
@@ -210,6 +424,7 @@ class AttendanceChecker:
             self.update_status_bar(f"Modo CEV desativado. Evento #{self.active_event_id} fechado.", "orange")
             self.current_mode = "CIO"
             self.active_event_id = None
+            self._reset_event_views()
             play_beep_sound()
         else:
             # CEV sem evento ativo - cria novo evento
@@ -224,7 +439,7 @@ class AttendanceChecker:
         )
         self.search_button.configure(text=self._get_search_button_text())
         self._setup_mode_interface()
-        self.update_person_list()
+        self._update_stats()
 
     def handle_cio_mode(self, cpf, nome_qr):
         """Trata QR Code no modo CIO (Check In/Out)."""
@@ -236,33 +451,42 @@ class AttendanceChecker:
             # Pessoa está no POB, remove (Check Out)
             if self.db.remove_person_from_pob(cpf):
                 self.update_status_bar(f"CHECK OUT: {nome_display} saiu da plataforma.", "orange")
-                play_beep_sound()
-                self.update_person_list()
+                self._play_feedback(play_beep_sound)
+                self._on_check_out(cpf)
+                self._refresh_after_scan()
             else:
                 self.update_status_bar("Erro ao fazer check out.", "red")
-                play_error_sound()
+                self._play_feedback(play_error_sound)
         else:
             # Pessoa não está no POB, adiciona (Check In)
-            if nome_qr and self.db.add_person_to_pob(cpf, nome_qr, self.current_group):
+            grupo = self._check_in_group()
+            if not nome_qr:
+                # Crachá sem nome (P1 compacto) de quem ainda não está no cadastro
+                self.update_status_bar(
+                    f"CHECK IN recusado: CPF {cpf} fora do cadastro e crachá sem nome. "
+                    "Use um crachá com nome ou cadastre a pessoa.", "red")
+                self._play_feedback(play_error_sound)
+            elif self.db.add_person_to_pob(cpf, nome_qr, grupo):
                 self.update_status_bar(f"CHECK IN: {nome_display} entrou na plataforma.", "green")
-                play_success_sound()
-                self.update_person_list()
+                self._play_feedback(play_success_sound)
+                self._on_check_in(cpf, nome_qr, grupo)
+                self._refresh_after_scan()
             else:
-                self.update_status_bar("Erro ao fazer check in ou dados incompletos.", "red")
-                play_error_sound()
+                self.update_status_bar("Erro ao fazer check in.", "red")
+                self._play_feedback(play_error_sound)
 
     def handle_cev_mode(self, cpf, nome_qr):
         """Trata QR Code no modo CEV (Check Event)."""
         if not self.active_event_id:
             self.update_status_bar("Nenhum evento ativo. Use QR_EVENT para criar um evento.", "red")
-            play_error_sound()
+            self._play_feedback(play_error_sound)
             return
         
         # Verifica se a pessoa está cadastrada
         person_data = self.db.find_person_by_cpf(cpf)
         if not person_data:
             self.update_status_bar("Pessoa não encontrada no cadastro.", "red")
-            play_error_sound()
+            self._play_feedback(play_error_sound)
             return
         
         cpf_db, nome_db, grupo = person_data
@@ -273,20 +497,22 @@ class AttendanceChecker:
             # Pessoa já checada - fazer estorno
             if self.db.remove_check_event(cpf, self.active_event_id):
                 self.update_status_bar(f"Estorno realizado: {nome_display} removido da lista de presença", "orange")
-                play_beep_sound()
-                self.update_person_list()
+                self._play_feedback(play_beep_sound)
+                self._on_event_check(cpf, nome_db, grupo, checked=False)
+                self._refresh_after_scan()
             else:
                 self.update_status_bar("Erro ao realizar estorno de presença.", "red")
-                play_error_sound()
+                self._play_feedback(play_error_sound)
         else:
             # Pessoa não checada - registrar presença
             if self.db.record_check_event(cpf, nome_display, self.active_event_id):
                 self.update_status_bar(f"Presença registrada: {nome_display}", "green")
-                play_success_sound()
-                self.update_person_list()
+                self._play_feedback(play_success_sound)
+                self._on_event_check(cpf, nome_db, grupo, checked=True)
+                self._refresh_after_scan()
             else:
                 self.update_status_bar("Erro ao registrar presença.", "red")
-                play_error_sound()
+                self._play_feedback(play_error_sound)
 
     def manual_action(self):
         """Executa ação manual baseada no modo atual."""
@@ -337,126 +563,177 @@ class AttendanceChecker:
             self.update_status_bar("Nenhuma pessoa encontrada com este nome ou CPF.", "red")
 
     def change_group(self, value):
-        """Chamado quando o seletor de grupo é alterado."""
-        group_number_str = value.replace("Grupo ", "")
-        self.current_group = int(group_number_str)
-        self.update_person_list()
-        self.update_status_bar(f"Exibindo Grupo {self.current_group}", "white")
-
-    def update_person_list(self):
-        """Atualiza a lista de pessoas baseada no modo atual."""
-        if self.current_mode == "CIO":
-            self._update_cio_list()
-        elif self.current_mode == "CEV":
-            self._update_cev_list()
-
-    def _update_cio_list(self):
-        """Atualiza lista para modo CIO - apenas pessoas no POB."""
-        # Limpa lista atual
-        if hasattr(self, 'scrollable_frame') and self.scrollable_frame.winfo_exists():
-            for widget in self.scrollable_frame.winfo_children():
-                widget.destroy()
-        
-        # Limpa frames do modo CEV se existirem
-        if hasattr(self, 'unchecked_frame') and self.unchecked_frame.winfo_exists():
-            for widget in self.unchecked_frame.winfo_children():
-                widget.destroy()
-        if hasattr(self, 'checked_frame') and self.checked_frame.winfo_exists():
-            for widget in self.checked_frame.winfo_children():
-                widget.destroy()
-        
-        self.person_widgets.clear()
-
-        # Busca pessoas no POB do grupo atual
-        people = self.db.get_people_by_group(self.current_group)
-        # Filtra apenas pessoas que estão realmente no POB (Onshore = 0)
-        people_in_pob = [p for p in people if self.db.is_person_in_pob(p[0])]
-
-        if hasattr(self, 'scrollable_frame') and self.scrollable_frame.winfo_exists():
-            for person in people_in_pob:
-                cpf, nome, _ = person
-                
-                row_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
-                row_frame.pack(fill="x", pady=2, padx=2)
-
-                label_nome = ctk.CTkLabel(row_frame, text=nome, anchor="w")
-                label_nome.pack(side="left", padx=10, pady=5, expand=True, fill="x")
-                
-                label_cpf = ctk.CTkLabel(row_frame, text=cpf, anchor="e", width=150)
-                label_cpf.pack(side="right", padx=10, pady=5)
-                
-                self.person_widgets[cpf] = row_frame
-
-        self._update_cio_stats(len(people_in_pob))
-
-    def _update_cev_list(self):
-        """Atualiza listas para modo CEV - separadas por checados/não checados."""
-        # Limpa lista do modo CIO se existir
-        if hasattr(self, 'scrollable_frame') and self.scrollable_frame.winfo_exists():
-            for widget in self.scrollable_frame.winfo_children():
-                widget.destroy()
-        
-        # Limpa listas atuais do modo CEV
-        if hasattr(self, 'unchecked_frame') and self.unchecked_frame.winfo_exists():
-            for widget in self.unchecked_frame.winfo_children():
-                widget.destroy()
-        if hasattr(self, 'checked_frame') and self.checked_frame.winfo_exists():
-            for widget in self.checked_frame.winfo_children():
-                widget.destroy()
-        
-        self.person_widgets.clear()
+        """Chamado quando o seletor de grupo é alterado: apenas troca as listas exibidas."""
+        self.current_group = None if value == ALL_GROUPS_LABEL else int(value.replace("Grupo ", ""))
+        self._show_current_views()
+        self._update_stats()
+        if self.current_group is None:
+            self.update_status_bar("Exibindo todos os grupos", "white")
+        else:
+            self.update_status_bar(f"Exibindo Grupo {self.current_group}", "white")
+
+    def update_person_list(self, snapshot=None):
+        """
+        Recarrega o cadastro do banco e sincroniza as listas: as do grupo exibido na hora,
+        as dos demais grupos em segundo plano.
+
+        Args:
+            snapshot: Snapshot válido (roster_snapshot.py) usado no lugar do banco na inicialização
+        """
+        self._load_roster(snapshot)
+        self._refresh_group_selector()
+        for group in self.group_views:
+            if group != self.current_group:
+                self._sync_group_views(group, background=True)
+        if self.current_group in self.group_views:
+            self._sync_group_views(self.current_group)
+        else:
+            self._get_group_views(self.current_group)
+        self._show_current_views()
+        self._update_stats()
+
+    def _load_roster(self, snapshot=None):
+        """Carrega o cadastro e as presenças do evento ativo (duas consultas, para todos os grupos, ou do snapshot)."""
+        people = snapshot['people'] if snapshot else self.db.get_all_people()
+        self.roster = {cpf: (nome, grupo, onshore) for cpf, nome, grupo, onshore in people}
+        if snapshot and snapshot['active_event'] == self.active_event_id:
+            self.checked_cpfs = set(snapshot['checked'])
+        else:
+            self.checked_cpfs = self.db.get_checks_in_event(self.active_event_id)
+
+    def _refresh_group_selector(self):
+        """Monta as opções do seletor a partir dos grupos presentes no cadastro."""
+        groups = {grupo for _, grupo, _ in self.roster.values()}
+        groups.add(DEFAULT_GROUP)
+        if self.current_group is not None:
+            groups.add(self.current_group)
+        self.groups = sorted(groups)
+
+        self.group_selector.configure(values=[f"Grupo {g}" for g in self.groups] + [ALL_GROUPS_LABEL])
+        self.group_selector.set(self._group_label(self.current_group))
+
+    def _group_label(self, group):
+        """Texto do seletor para um grupo (None = todos os grupos)."""
+        return ALL_GROUPS_LABEL if group is None else f"Grupo {group}"
+
+    def _check_in_group(self):
+        """Grupo atribuído no check in: o exibido, ou o padrão quando todos os grupos estão na tela."""
+        return DEFAULT_GROUP if self.current_group is None else self.current_group
+
+    def _group_contents(self, group):
+        """
+        Conteúdo das listas de um grupo (None = todos): (a bordo, não checados, checados).
+        Quem está fora da plataforma fica no cadastro, mas não entra em nenhuma das listas.
+        """
+        on_board = sorted(
+            ((cpf, nome, grupo, onshore) for cpf, (nome, grupo, onshore) in self.roster.items()
+             if onshore == 0 and (group is None or grupo == group)),
+            key=lambda person: (person[1], person[0])
+        )
+        unchecked = [p for p in on_board if p[0] not in self.checked_cpfs]
+        checked = [p for p in on_board if p[0] in self.checked_cpfs]
+        return on_board, unchecked, checked
+
+    def _create_group_views(self, group):
+        """Cria as listas (vazias) dos dois modos para um grupo (None = todos)."""
+        views = {
+            'cio': PersonListView(self.right_frame, cpf_width=150),
+            'unchecked': PersonListView(self.right_frame, row_color="#FFF2F2", cpf_width=120),  # Fundo vermelho claro
+            'checked': PersonListView(self.right_frame, row_color="#F0F8F0", cpf_width=120),  # Fundo verde claro
+        }
+        self.group_views[group] = views
+        return views
+
+    def _get_group_views(self, group):
+        """Listas de um grupo, preenchidas na hora se ainda não existirem; depois são mantidas."""
+        views = self.group_views.get(group)
+        if views is None:
+            views = self._create_group_views(group)
+            self._sync_group_views(group)
+        return views
+
+    def _sync_group_views(self, group, background=False):
+        """Sincroniza as listas de um grupo com o cadastro carregado."""
+        views = self.group_views[group]
+        for name, people in zip(('cio', 'unchecked', 'checked'), self._group_contents(group)):
+            if background:
+                views[name].set_people_in_background(people)
+            else:
+                views[name].set_people(people)
+
+    def _prebuild_group_views(self):
+        """Cria em segundo plano as listas dos grupos ainda não exibidos (e a de todos os grupos)."""
+        for group in self.groups + [None]:
+            if group not in self.group_views:
+                self._create_group_views(group)
+                self._sync_group_views(group, background=True)
+
+    def _views_with_group(self, grupo):
+        """Listas já criadas que contêm as pessoas de um grupo: as do próprio grupo e as de todos."""
+        return [views for group, views in self.group_views.items() if group is None or group == grupo]
+
+    def _on_check_in(self, cpf, nome, grupo):
+        """Atualiza cadastro em memória e listas após um check in."""
+        previous = self.roster.get(cpf)
+        if previous:
+            # Já cadastrado: volta às listas com o nome e o grupo do cadastro
+            nome, grupo, _ = previous
+        self.roster[cpf] = (nome, grupo, 0)
+        for views in self._views_with_group(grupo):
+            views['cio'].add(cpf, nome)
+            if cpf in self.checked_cpfs:
+                views['checked'].add(cpf, nome)
+            else:
+                views['unchecked'].add(cpf, nome)
 
-        if not self.active_event_id:
-            self._update_cev_stats(0, 0)
+    def _on_check_out(self, cpf):
+        """Atualiza cadastro em memória e listas após um check out (a pessoa continua no cadastro, fora das listas)."""
+        person = self.roster.get(cpf)
+        if person is None:
             return
+        nome, grupo, _ = person
+        self.roster[cpf] = (nome, grupo, 1)
+        for views in self._views_with_group(grupo):
+            for view in views.values():
+                view.remove(cpf)
+
+    def _on_event_check(self, cpf, nome, grupo, checked):
+        """Move a pessoa entre não checados e checados após marcar ou estornar a presença."""
+        if checked:
+            self.checked_cpfs.add(cpf)
+        else:
+            self.checked_cpfs.discard(cpf)
+
+        person = self.roster.get(cpf)
+        if person is None or person[2] != 0:
+            return  # Fora da plataforma: a presença fica registrada, mas não aparece nas listas
+
+        for views in self._views_with_group(grupo):
+            source, target = ('unchecked', 'checked') if checked else ('checked', 'unchecked')
+            views[source].remove(cpf)
+            views[target].add(cpf, nome)
+
+    def _reset_event_views(self):
+        """Após fechar um evento, volta todos para não checados (em segundo plano)."""
+        self.checked_cpfs = set()
+        for group, views in self.group_views.items():
+            _, unchecked, _ = self._group_contents(group)
+            views['unchecked'].set_people_in_background(unchecked)
+            views['checked'].set_people_in_background([])
+
+    def _update_stats(self):
+        """Atualiza as estatísticas do grupo exibido a partir do cadastro em memória."""
+        # Só quem está a bordo conta (inclusive como não checado em um evento)
+        people = [cpf for cpf, (_, grupo, onshore) in self.roster.items()
+                  if onshore == 0 and (self.current_group is None or grupo == self.current_group)]
 
-        # Busca pessoas do grupo atual
-        people = self.db.get_people_by_group(self.current_group)
-        checked_cpfs = self.db.get_checks_in_event(self.active_event_id)
-
-        checked_people = []
-        unchecked_people = []
-
-        for person in people:
-            cpf, nome, _ = person
-            if cpf in checked_cpfs:
-                checked_people.append(person)
-            else:
-                unchecked_people.append(person)
-
-        # Preenche lista de não checados
-        if hasattr(self, 'unchecked_frame') and self.unchecked_frame.winfo_exists():
-            for person in unchecked_people:
-                cpf, nome, _ = person
-                
-                row_frame = ctk.CTkFrame(self.unchecked_frame, fg_color="#FFF2F2")  # Fundo vermelho claro
-                row_frame.pack(fill="x", pady=2, padx=2)
-
-                label_nome = ctk.CTkLabel(row_frame, text=nome, anchor="w", fg_color="transparent")
-                label_nome.pack(side="left", padx=10, pady=5, expand=True, fill="x")
-                
-                label_cpf = ctk.CTkLabel(row_frame, text=cpf, anchor="e", width=120, fg_color="transparent")
-                label_cpf.pack(side="right", padx=10, pady=5)
-                
-                self.person_widgets[f"unchecked_{cpf}"] = row_frame
-
-        # Preenche lista de checados
-        if hasattr(self, 'checked_frame') and self.checked_frame.winfo_exists():
-            for person in checked_people:
-                cpf, nome, _ = person
-                
-                row_frame = ctk.CTkFrame(self.checked_frame, fg_color="#F0F8F0")  # Fundo verde claro
-                row_frame.pack(fill="x", pady=2, padx=2)
-
-                label_nome = ctk.CTkLabel(row_frame, text=nome, anchor="w", fg_color="transparent")
-                label_nome.pack(side="left", padx=10, pady=5, expand=True, fill="x")
-                
-                label_cpf = ctk.CTkLabel(row_frame, text=cpf, anchor="e", width=120, fg_color="transparent")
-                label_cpf.pack(side="right", padx=10, pady=5)
-                
-                self.person_widgets[f"checked_{cpf}"] = row_frame
-
-        self._update_cev_stats(len(checked_people), len(unchecked_people))
+        if self.current_mode == "CIO":
+            self._update_cio_stats(len(people))
+        elif not self.active_event_id:
+            self._update_cev_stats(0, 0)
+        else:
+            checked_count = sum(1 for cpf in people if cpf in self.checked_cpfs)
+            self._update_cev_stats(checked_count, len(people) - checked_count)
 
     def _update_cio_stats(self, total_in_pob):
         """Atualiza estatísticas para modo CIO."""
@@ -486,9 +763,31 @@ class AttendanceChecker:
         """Função chamada ao fechar a janela para liberar recursos."""
         print("Fechando aplicação...")
         
+        # Confirma as leituras pendentes do diário antes de sair
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+        self._flush_db()
+        for job in (self._snapshot_job, self._migration_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._save_snapshot()
+        
+        # Para os supervisores antes da câmera, para não reabri-la durante o encerramento
+        for watchdog in self.camera_watchdogs:
+            watchdog.stop()
+        
         # Para o gerenciador de câmera
         if self.camera_manager:
             self.camera_manager.stop_camera()
+        self.ui_dispatcher.stop()
+        if self.ui_watchdog:
+            self.ui_watchdog.stop()
+        
+        # Fecha o banco por último, quando nada mais grava leituras
+        try:
+            self.db.close()
+        except Exception as e:
+            logger.error("Erro ao fechar o banco: %s", e)
         
         # Destrói a janela
         self.root.destroy()
@@ -529,99 +828,74 @@ class AttendanceChecker:
         else:
             self.event_status_label.configure(text="")
 
-        # Configura interface baseada no modo
+        # Alterna entre os layouts já criados
         if self.current_mode == "CEV":
             # Modo CEV - duas listas separadas
-            self._setup_cev_interface()
+            self._show_cev_interface()
         else:
             # Modo CIO - lista única
-            self._setup_cio_interface()
-
-    def _setup_cio_interface(self):
-        """Configura interface para modo CIO."""
-        # Remove frames antigos se existirem e limpa todas as referências
-        for widget in self.right_frame.winfo_children():
-            if hasattr(widget, '_is_list_container') or hasattr(widget, '_is_cev_header'):
-                widget.destroy()
-
-        # Limpa referências de frames do modo CEV
-        if hasattr(self, 'unchecked_frame'):
-            delattr(self, 'unchecked_frame')
-        if hasattr(self, 'checked_frame'):
-            delattr(self, 'checked_frame')
-        if hasattr(self, 'unchecked_header'):
-            delattr(self, 'unchecked_header')
-        if hasattr(self, 'checked_header'):
-            delattr(self, 'checked_header')
-
-        # Reseta o grid para uma coluna
-        self.right_frame.grid_columnconfigure(0, weight=1)
-        # Remove a coluna 1 do grid para garantir que só uma coluna fique visível
-        self.right_frame.grid_columnconfigure(1, weight=0, minsize=0)
-        # Esconde widgets da coluna 1 se existirem
-        for widget in self.right_frame.grid_slaves(column=1):
-            widget.grid_remove()
-        
-        # Lista de Pessoas no POB
+            self._show_cio_interface()
+
+    def _build_list_layouts(self):
+        """Cria uma única vez os cabeçalhos dos modos CIO e CEV (as listas ficam em group_views)."""
+        # Modo CIO - lista única de pessoas no POB
         self.list_header = ctk.CTkLabel(
             self.right_frame, 
             text="Pessoas no POB (Plataforma)", 
             font=ctk.CTkFont(size=16, weight="bold")
         )
-        self.list_header.grid(row=1, column=0, pady=(0, 5), sticky="w", padx=10)
-        self.list_header._is_list_container = True
-        
-        self.scrollable_frame = ctk.CTkScrollableFrame(self.right_frame, label_text="")
-        self.scrollable_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
-        self.scrollable_frame.grid_columnconfigure(0, weight=1)
-        self.scrollable_frame._is_list_container = True
-
-    def _setup_cev_interface(self):
-        """Configura interface para modo CEV com duas listas."""
-        # Remove frames antigos se existirem e limpa todas as referências
-        for widget in self.right_frame.winfo_children():
-            if hasattr(widget, '_is_list_container') or hasattr(widget, '_is_cev_header'):
-                widget.destroy()
-
-        # Limpa referências de frames do modo CIO
-        if hasattr(self, 'scrollable_frame'):
-            delattr(self, 'scrollable_frame')
-        if hasattr(self, 'list_header'):
-            delattr(self, 'list_header')
-
-        # Configura grid para duas colunas iguais
-        self.right_frame.grid_columnconfigure(0, weight=1)
-        self.right_frame.grid_columnconfigure(1, weight=1)
-        
-        # Lista de Não Checados (esquerda)
+
+        # Modo CEV - não checados (esquerda) e checados (direita)
         self.unchecked_header = ctk.CTkLabel(
             self.right_frame, 
             text="Não Checados", 
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color="#EA4335"
         )
-        self.unchecked_header.grid(row=1, column=0, pady=(0, 5), sticky="w", padx=10)
-        self.unchecked_header._is_cev_header = True
-        
-        self.unchecked_frame = ctk.CTkScrollableFrame(self.right_frame, label_text="")
-        self.unchecked_frame.grid(row=2, column=0, sticky="nsew", padx=(10, 5), pady=5)
-        self.unchecked_frame.grid_columnconfigure(0, weight=1)
-        self.unchecked_frame._is_list_container = True
 
-        # Lista de Checados (direita)
         self.checked_header = ctk.CTkLabel(
             self.right_frame, 
             text="Checados", 
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color="#34A853"
         )
+
+    def _show_current_views(self):
+        """Exibe as listas do grupo e do modo atuais e esconde as demais (troca sem recriar linhas)."""
+        for views in self.group_views.values():
+            for view in views.values():
+                view.grid_remove()
+
+        views = self._get_group_views(self.current_group)
+        if self.current_mode == "CIO":
+            views['cio'].grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
+        elif self.active_event_id:
+            views['unchecked'].grid(row=2, column=0, sticky="nsew", padx=(10, 5), pady=5)
+            views['checked'].grid(row=2, column=1, sticky="nsew", padx=(5, 10), pady=5)
+
+    def _show_cio_interface(self):
+        """Exibe o layout do modo CIO e esconde o do CEV (as listas são mantidas)."""
+        self.unchecked_header.grid_remove()
+        self.checked_header.grid_remove()
+
+        # Uma coluna visível
+        self.right_frame.grid_columnconfigure(0, weight=1)
+        self.right_frame.grid_columnconfigure(1, weight=0, minsize=0)
+
+        self.list_header.grid(row=1, column=0, pady=(0, 5), sticky="w", padx=10)
+        self._show_current_views()
+
+    def _show_cev_interface(self):
+        """Exibe o layout do modo CEV e esconde o do CIO (as listas são mantidas)."""
+        self.list_header.grid_remove()
+
+        # Duas colunas iguais
+        self.right_frame.grid_columnconfigure(0, weight=1)
+        self.right_frame.grid_columnconfigure(1, weight=1)
+
+        self.unchecked_header.grid(row=1, column=0, pady=(0, 5), sticky="w", padx=10)
         self.checked_header.grid(row=1, column=1, pady=(0, 5), sticky="w", padx=10)
-        self.checked_header._is_cev_header = True
-        
-        self.checked_frame = ctk.CTkScrollableFrame(self.right_frame, label_text="")
-        self.checked_frame.grid(row=2, column=1, sticky="nsew", padx=(5, 10), pady=5)
-        self.checked_frame.grid_columnconfigure(0, weight=1)
-        self.checked_frame._is_list_container = True
+        self._show_current_views()
 
 if __name__ == "__main__":
     import sys
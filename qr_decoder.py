@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+qr_decoder.py - Decodificação de QR codes (OpenCV e pyzbar)
+"""
+
+import logging
+import time
+
+import cv2
+
+from config import PREPROCESSING_TIERS
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyzbar import pyzbar
+except ImportError:  # pyzbar depende da libzbar instalada no sistema
+    pyzbar = None
+
+
+# Backends de decodificação suportados
+DECODER_BACKENDS = ("opencv", "pyzbar", "both")
+
+
+def merge_tier_stats(total, tier_stats):
+    """Soma em total os contadores brutos por nível (tentativas, sucessos e tempo) de tier_stats."""
+    for tier, stats in tier_stats.items():
+        target = total.setdefault(tier, {'attempts': 0, 'successes': 0, 'time_ms': 0.0})
+        for key, value in stats.items():
+            target[key] += value
+    return total
+
+
+def tier_report(tier_stats):
+    """Retorna, por nível, tentativas, sucessos, taxa de sucesso e tempo médio."""
+    report = {}
+    for tier, stats in tier_stats.items():
+        attempts = stats['attempts']
+        report[tier] = {
+            'attempts': attempts,
+            'successes': stats['successes'],
+            'success_rate': stats['successes'] / attempts if attempts else 0.0,
+            'avg_ms': stats['time_ms'] / attempts if attempts else 0.0,
+        }
+    return report
+
+
+def to_gray(frame):
+    """
+    Retorna apenas a luminância do frame, que é tudo que a decodificação de QR precisa.
+    Aceita frames BGR, YUYV brutos (2 canais, o plano Y é extraído sem conversão) ou já em cinza.
+    """
+    if frame.ndim == 2:
+        return frame
+    if frame.shape[2] == 2:
+        return cv2.extractChannel(frame, 0)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+class QRDecoder:
+    """Decodificador de QR codes com suporte a vários códigos por frame."""
+
+    def __init__(self, backend="opencv", multi=True, tiers=(), tier_budget_ms=30):
+        """
+        Inicializa o decodificador.
+
+        Args:
+            backend: "opencv", "pyzbar" ou "both" (união dos dois resultados)
+            multi: Se True, decodifica todos os QR codes presentes no frame
+            tiers: Níveis de pré-processamento (ver PREPROCESSING_TIERS em config.py) tentados, em ordem, apenas
+                quando um QR é localizado no frame bruto mas não decodificado
+            tier_budget_ms: Tempo máximo por frame gasto nos níveis de pré-processamento
+        """
+        if backend not in DECODER_BACKENDS:
+            raise ValueError(f"Backend de decodificação inválido: {backend}")
+        for tier in tiers:
+            if tier not in PREPROCESSING_TIERS:
+                raise ValueError(f"Nível de pré-processamento inválido: {tier}")
+
+        if backend in ("pyzbar", "both") and pyzbar is None:
+            logger.warning("pyzbar não disponível, usando apenas OpenCV")
+            backend = "opencv"
+
+        self.backend = backend
+        self.multi = multi
+        self.detector = cv2.QRCodeDetector()
+
+        # detectAndDecodeMulti só existe a partir do OpenCV 4.3
+        self._has_multi = hasattr(self.detector, "detectAndDecodeMulti")
+        
+        # QR codes localizados (padrões de posição encontrados) mas não decodificados na última chamada
+        self.last_undecoded_count = 0
+        
+        # Decodificação em níveis: frame bruto primeiro, pré-processamento só quando necessário
+        self.tiers = tuple(tiers)
+        self.tier_budget = tier_budget_ms / 1000.0
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)) if "clahe" in self.tiers else None
+        self.tier_stats = self._new_tier_stats()
+
+    def decode(self, frame):
+        """
+        Decodifica os QR codes do frame. A conversão para cinza é feita uma única vez
+        e compartilhada entre os backends.
+
+        Returns:
+            list: Conteúdos decodificados, sem repetição, na ordem em que foram encontrados
+        """
+        gray = to_gray(frame)
+        
+        start = time.perf_counter()
+        results = self._decode_gray(gray)
+        self._record_tier("raw", start, bool(results))
+        
+        if self.last_undecoded_count and self.tiers:
+            results = list(dict.fromkeys(results + self._decode_with_tiers(gray)))
+        return results
+
+    def _decode_gray(self, gray):
+        """Decodifica a imagem em cinza com os backends configurados."""
+        self.last_undecoded_count = 0
+        results = []
+        if self.backend in ("opencv", "both"):
+            results.extend(self._decode_opencv(gray))
+        if self.backend in ("pyzbar", "both"):
+            results.extend(self._decode_pyzbar(gray))
+
+        # Remove duplicados preservando a ordem
+        return list(dict.fromkeys(data for data in results if data))
+
+    def _decode_with_tiers(self, gray):
+        """
+        Tenta os níveis de pré-processamento em ordem até decodificar algo ou esgotar o
+        tempo por frame. Mantém last_undecoded_count do frame bruto se nada for decodificado.
+        """
+        raw_undecoded = self.last_undecoded_count
+        deadline = time.perf_counter() + self.tier_budget
+
+        for tier in self.tiers:
+            if time.perf_counter() >= deadline:
+                break
+
+            start = time.perf_counter()
+            results = []
+            for image in self._preprocess(tier, gray):
+                results = self._decode_gray(image)
+                if results or time.perf_counter() >= deadline:
+                    break
+            self._record_tier(tier, start, bool(results))
+
+            if results:
+                self.last_undecoded_count = max(0, raw_undecoded - len(results))
+                return results
+
+        self.last_undecoded_count = raw_undecoded
+        return []
+
+    def _preprocess(self, tier, gray):
+        """Gera as imagens pré-processadas de um nível."""
+        if tier == "clahe":
+            yield self._clahe.apply(gray)
+        elif tier == "adaptive_threshold":
+            yield cv2.adaptiveThreshold(
+                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 5
+            )
+        elif tier == "sharpen":
+            blurred = cv2.GaussianBlur(gray, (0, 0), 3)
+            yield cv2.addWeighted(gray, 1.5, blurred, -0.5, 0)
+        elif tier == "pyramid":
+            # Ampliação para crachás pequenos/distantes, redução para imagens ruidosas
+            yield cv2.resize(gray, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
+            yield cv2.pyrDown(gray)
+
+    def _record_tier(self, tier, start, success):
+        """Atualiza as estatísticas de um nível de decodificação."""
+        stats = self.tier_stats[tier]
+        stats['attempts'] += 1
+        stats['time_ms'] += (time.perf_counter() - start) * 1000
+        if success:
+            stats['successes'] += 1
+
+    def _new_tier_stats(self):
+        return {
+            tier: {'attempts': 0, 'successes': 0, 'time_ms': 0.0}
+            for tier in ("raw",) + self.tiers
+        }
+
+    def get_tier_stats(self):
+        """Retorna, por nível, tentativas, sucessos, taxa de sucesso e tempo médio."""
+        return tier_report(self.tier_stats)
+
+    def pop_tier_stats(self):
+        """Retorna os contadores brutos por nível acumulados até aqui e os zera."""
+        tier_stats, self.tier_stats = self.tier_stats, self._new_tier_stats()
+        return tier_stats
+
+    def _decode_opencv(self, frame):
+        """Decodifica usando o QRCodeDetector do OpenCV."""
+        if self.multi and self._has_multi:
+            ok, decoded, _, _ = self.detector.detectAndDecodeMulti(frame)
+            if not ok:
+                return []
+            self.last_undecoded_count = sum(1 for data in decoded if not data)
+            return list(decoded)
+
+        qr_data, points, _ = self.detector.detectAndDecode(frame)
+        if not qr_data and points is not None:
+            self.last_undecoded_count = 1
+        return [qr_data] if qr_data else []
+
+    def _decode_pyzbar(self, frame):
+        """Decodifica usando pyzbar (zbar), que retorna todos os símbolos do frame."""
+        symbols = pyzbar.decode(frame, symbols=[pyzbar.ZBarSymbol.QRCODE])
+        if not self.multi:
+            symbols = symbols[:1]
+
+        results = []
+        for symbol in symbols:
+            try:
+                results.append(symbol.data.decode("utf-8"))
+            except UnicodeDecodeError:
+                results.append(symbol.data.decode("latin-1"))
+        return results
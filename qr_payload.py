@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+qr_payload.py - Formato compacto e versionado do conteúdo do QR Code dos crachás
+
+Formato P1: "P1" + CPF em base 36 (8 caracteres) + 1 caractere de verificação,
+opcionalmente seguido de "|NOME". Sem o nome são 11 caracteres do modo alfanumérico
+do QR, que cabem na versão 1 (21x21 módulos) mesmo com correção de erro Q.
+"""
+
+PAYLOAD_PREFIX = "P1"
+
+_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_CPF_LENGTH = 8  # 36^8 > 10^11, cobre qualquer CPF
+_CODE_LENGTH = len(PAYLOAD_PREFIX) + _CPF_LENGTH + 1
+
+
+def _checksum(text):
+    """Caractere de verificação (soma ponderada módulo 36) contra erros de leitura."""
+    total = sum((i + 1) * _ALPHABET.index(char) for i, char in enumerate(text))
+    return _ALPHABET[total % 36]
+
+
+def encode_payload(cpf, nome=None):
+    """
+    Gera o conteúdo compacto do QR Code.
+
+    Args:
+        cpf: CPF (com ou sem formatação)
+        nome: Nome opcional; o terminal obtém o nome pelo cadastro quando omitido
+
+    Returns:
+        str: Conteúdo no formato P1
+    """
+    value = int("".join(filter(str.isdigit, str(cpf))))
+    digits = ""
+    while value:
+        value, remainder = divmod(value, 36)
+        digits = _ALPHABET[remainder] + digits
+    body = PAYLOAD_PREFIX + digits.rjust(_CPF_LENGTH, "0")
+    code = body + _checksum(body)
+    return f"{code}|{nome}" if nome else code
+
+
+def is_compact_payload(qr_data):
+    """Retorna se o conteúdo está no formato compacto."""
+    return qr_data.startswith(PAYLOAD_PREFIX) and len(qr_data.split('|', 1)[0]) == _CODE_LENGTH
+
+
+def decode_payload(qr_data):
+    """
+    Lê um conteúdo no formato compacto.
+
+    Returns:
+        tuple: (CPF com 11 dígitos, nome ou None)
+
+    Raises:
+        ValueError: Se o conteúdo não estiver no formato P1 ou a verificação falhar
+    """
+    code, _, nome = qr_data.strip().partition('|')
+    code = code.upper()
+    if not code.startswith(PAYLOAD_PREFIX) or len(code) != _CODE_LENGTH:
+        raise ValueError(f"Conteúdo não está no formato {PAYLOAD_PREFIX}")
+    if any(char not in _ALPHABET for char in code[len(PAYLOAD_PREFIX):]):
+        raise ValueError("Caractere inválido no conteúdo compacto")
+    if _checksum(code[:-1]) != code[-1]:
+        raise ValueError("Verificação do conteúdo compacto falhou")
+
+    cpf = str(int(code[len(PAYLOAD_PREFIX):-1], 36)).zfill(11)
+    return cpf, nome.strip() or None
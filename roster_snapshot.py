@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+roster_snapshot.py - Snapshot do cadastro para inicialização rápida do terminal
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato; snapshots de outra versão são ignorados
+SNAPSHOT_VERSION = 1
+
+
+def save_snapshot(db, snapshot_file):
+    """
+    Grava o cadastro completo (com a situação a bordo), o evento ativo e as presenças
+    do evento, lidos do banco junto com o contador de alterações que os valida.
+
+    Args:
+        db: Database de onde o estado é lido (as leituras pendentes do diário são confirmadas antes)
+        snapshot_file: Arquivo do snapshot
+
+    Returns:
+        int: Número de pessoas gravadas
+    """
+    db.flush()
+    database_id, changes = db.get_change_counter()
+    active_event = db.get_active_event()
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'database_id': database_id,
+        'changes': changes,
+        'saved': datetime.now().isoformat(timespec="seconds"),
+        'active_event': active_event,
+        'people': [list(person) for person in db.get_all_people()],
+        'checked': sorted(db.get_checks_in_event(active_event)),
+    }
+
+    temp_file = snapshot_file + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_file, snapshot_file)
+    return len(snapshot['people'])
+
+
+def load_snapshot(db, snapshot_file):
+    """
+    Carrega o snapshot se ele ainda corresponde ao banco.
+
+    Returns:
+        dict: Snapshot com 'people' ([CPF, nome, grupo, Onshore]), 'active_event' e 'checked',
+            ou None se não existir, for de outra versão ou estiver desatualizado
+    """
+    if not os.path.exists(snapshot_file):
+        return None
+
+    try:
+        with open(snapshot_file, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Snapshot %s ilegível, carregando do banco: %s", snapshot_file, e)
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        logger.info("Snapshot %s de outra versão, carregando do banco", snapshot_file)
+        return None
+
+    if [snapshot.get('database_id'), snapshot.get('changes')] != list(db.get_change_counter()):
+        logger.info("Snapshot %s desatualizado, carregando do banco", snapshot_file)
+        return None
+
+    logger.info("Cadastro carregado do snapshot de %s (%s pessoas)", snapshot['saved'], len(snapshot['people']))
+    return snapshot
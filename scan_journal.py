@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+scan_journal.py - Diário de leituras somente-anexação, gravado em disco antes do SQLite
+"""
+
+import json
+import logging
+import os
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Tamanho a partir do qual o diário é esvaziado após um commit no banco
+COMPACT_SIZE = 64 * 1024
+
+
+def _sync(fd):
+    """Força os dados do arquivo para o disco (fdatasync quando disponível)."""
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(fd)
+    else:
+        os.fsync(fd)
+
+
+class ScanJournal:
+    """
+    Diário somente-anexação das leituras aceitas. Cada entrada é uma linha
+    "seq<TAB>JSON<TAB>crc32", com número de sequência crescente e soma de verificação;
+    uma linha incompleta ou corrompida no final (queda de energia durante a escrita)
+    é descartada ao abrir. Gravar e sincronizar uma linha custa um único fdatasync de
+    um arquivo pequeno, bem menos que um commit do SQLite.
+    """
+
+    def __init__(self, path):
+        """
+        Abre (ou cria) o diário e posiciona a próxima sequência após a última entrada válida.
+
+        Args:
+            path: Arquivo do diário
+        """
+        self.path = path
+        self.entries = []  # Entradas válidas lidas na abertura (para replay)
+        self.next_seq = 1
+        self.sync_count = 0
+
+        valid_size = self._load()
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        if os.fstat(self.fd).st_size > valid_size:
+            logger.warning("Diário %s: final incompleto descartado (%s bytes)",
+                           path, os.fstat(self.fd).st_size - valid_size)
+            os.ftruncate(self.fd, valid_size)
+            _sync(self.fd)
+        os.lseek(self.fd, 0, os.SEEK_END)
+
+    @staticmethod
+    def _encode(seq, entry):
+        body = f"{seq}\t{json.dumps(entry, ensure_ascii=False, separators=(',', ':'))}"
+        crc = zlib.crc32(body.encode("utf-8"))
+        return f"{body}\t{crc:08x}\n".encode("utf-8")
+
+    @staticmethod
+    def _decode(line):
+        """Retorna (seq, entrada) de uma linha íntegra, ou None."""
+        try:
+            body, crc = line.decode("utf-8").rsplit("\t", 1)
+            if zlib.crc32(body.encode("utf-8")) != int(crc, 16):
+                return None
+            seq, payload = body.split("\t", 1)
+            return int(seq), json.loads(payload)
+        except ValueError:
+            return None
+
+    def _load(self):
+        """Lê as entradas válidas. Retorna o tamanho (bytes) da parte válida do arquivo."""
+        if not os.path.exists(self.path):
+            return 0
+        valid_size = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                decoded = self._decode(line[:-1]) if line.endswith(b"\n") else None
+                if decoded is None or decoded[0] < self.next_seq:
+                    break
+                seq, entry = decoded
+                entry['seq'] = seq
+                self.entries.append(entry)
+                self.next_seq = seq + 1
+                valid_size += len(line)
+        return valid_size
+
+    def append(self, entry, sync=True):
+        """
+        Anexa uma entrada ao diário.
+
+        Args:
+            entry: Dicionário serializável em JSON
+            sync: Sincroniza com o disco agora (False deixa para sync(), em grupo)
+
+        Returns:
+            int: Número de sequência da entrada
+        """
+        seq = self.next_seq
+        os.write(self.fd, self._encode(seq, entry))
+        self.next_seq += 1
+        if sync:
+            self.sync()
+        return seq
+
+    def sync(self):
+        """Sincroniza com o disco as entradas já anexadas."""
+        _sync(self.fd)
+        self.sync_count += 1
+
+    def mark(self):
+        """Posição atual do diário, para desfazer as entradas seguintes com rollback()."""
+        return os.lseek(self.fd, 0, os.SEEK_END), self.next_seq
+
+    def rollback(self, mark):
+        """Descarta as entradas anexadas após mark (operação desfeita no banco)."""
+        size, next_seq = mark
+        os.ftruncate(self.fd, size)
+        os.lseek(self.fd, 0, os.SEEK_END)
+        self.next_seq = next_seq
+        _sync(self.fd)
+
+    def size(self):
+        """Tamanho atual do arquivo (bytes)."""
+        return os.lseek(self.fd, 0, os.SEEK_END)
+
+    def truncate(self):
+        """Esvazia o diário (todas as entradas já confirmadas no banco). A sequência continua."""
+        os.ftruncate(self.fd, 0)
+        os.lseek(self.fd, 0, os.SEEK_END)
+        _sync(self.fd)
+        self.entries = []
+
+    def close(self):
+        """Fecha o arquivo do diário."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -95,7 +95,7 @@ def test_database_functionality():
         test_db_file = "test_temp_pobchecker.sqlite3"
         db = Database(test_db_file)
         tests_passed = 0
-        total_tests = 4
+        total_tests = 5
         
         # Teste 1: Adição de pessoa
         try:
@@ -141,6 +141,18 @@ def test_database_functionality():
         except Exception as e:
             print(f"✗ Erro na limpeza de CPF: {e}")
         
+        # Teste 5: Check out mantém a pessoa no cadastro, fora da contagem a bordo
+        try:
+            db.remove_person_from_pob("12345678901")
+            if (db.find_person_by_cpf("12345678901") and not db.is_person_in_pob("12345678901")
+                    and db.count_people_on_board() == 0):
+                print("✓ Check out mantém o cadastro")
+                tests_passed += 1
+            else:
+                print("✗ Falha no check out")
+        except Exception as e:
+            print(f"✗ Erro no check out: {e}")
+        
         # Limpa o arquivo de teste
         db.conn.close()
         if os.path.exists(test_db_file):
@@ -150,8 +162,491 @@ def test_database_functionality():
         
     except Exception as e:
         print(f"✗ Erro geral no teste de banco: {e}")
+        return 0, 5
+
+def test_database_transaction():
+    """Testa o agrupamento de várias leituras em uma única transação"""
+    print("\nTestando transações em lote do banco de dados...")
+    
+    try:
+        from database import Database
+        
+        test_db_file = "test_temp_transaction.sqlite3"
+        if os.path.exists(test_db_file):
+            os.remove(test_db_file)
+        db = Database(test_db_file)
+        tests_passed = 0
+        total_tests = 2
+        
+        # Teste 1: Lote de check-ins confirmado com um único commit
+        try:
+            with db.transaction():
+                db.add_person_to_pob("11111111111", "Pessoa Um", 1)
+                db.add_person_to_pob("22222222222", "Pessoa Dois", 1)
+                pending = db.conn.in_transaction
+            db.cursor.execute("SELECT COUNT(*) FROM CHECK_IN_OUT")
+            if pending and not db.conn.in_transaction and db.cursor.fetchone()[0] == 2:
+                print("✓ Lote de leituras gravado em uma única transação")
+                tests_passed += 1
+            else:
+                print("✗ Falha na gravação do lote de leituras")
+        except Exception as e:
+            print(f"✗ Erro na gravação do lote: {e}")
+        
+        # Teste 2: Erro dentro do lote desfaz todas as operações
+        try:
+            try:
+                with db.transaction():
+                    db.add_person_to_pob("33333333333", "Pessoa Três", 1)
+                    raise RuntimeError("falha simulada")
+            except RuntimeError:
+                pass
+            if not db.check_person_exists("33333333333"):
+                print("✓ Rollback do lote funcionando")
+                tests_passed += 1
+            else:
+                print("✗ Falha no rollback do lote")
+        except Exception as e:
+            print(f"✗ Erro no rollback do lote: {e}")
+        
+        db.conn.close()
+        if os.path.exists(test_db_file):
+            os.remove(test_db_file)
+        
+        return tests_passed, total_tests
+        
+    except Exception as e:
+        print(f"✗ Erro geral no teste de transações: {e}")
+        return 0, 2
+
+def test_qr_payload():
+    """Testa o formato compacto do QR Code e a compatibilidade com os formatos antigos"""
+    print("\nTestando formato do conteúdo do QR Code...")
+    
+    try:
+        from database import Database
+        from qr_payload import encode_payload
+        
+        test_db_file = "test_temp_payload.sqlite3"
+        if os.path.exists(test_db_file):
+            os.remove(test_db_file)
+        db = Database(test_db_file)
+        db.add_person_to_pob("52998224725", "Maria da Conceição", 1)
+        tests_passed = 0
+        total_tests = 3
+        
+        # Teste 1: Formato compacto sem nome, nome obtido pelo cadastro
+        code = encode_payload("529.982.247-25")
+        if len(code) == 11 and db.parse_qr_data(code) == ("52998224725", "Maria da Conceição"):
+            print("✓ Formato compacto P1 funcionando")
+            tests_passed += 1
+        else:
+            print(f"✗ Falha no formato compacto: {code}")
+        
+        # Teste 2: Formatos antigos CPF|NOME e apenas CPF
+        if (db.parse_qr_data("52998224725|Maria da Conceição") == ("52998224725", "Maria da Conceição")
+                and db.parse_qr_data("52998224725") == ("52998224725", "Maria da Conceição")):
+            print("✓ Formatos antigos continuam aceitos")
+            tests_passed += 1
+        else:
+            print("✗ Falha nos formatos antigos")
+        
+        # Teste 3: Caractere de verificação rejeita leitura corrompida
+        corrupted = code[:-2] + ("0" if code[-2] != "0" else "1") + code[-1]
+        if db.parse_qr_data(corrupted) == (None, None):
+            print("✓ Conteúdo compacto corrompido rejeitado")
+            tests_passed += 1
+        else:
+            print("✗ Conteúdo compacto corrompido aceito")
+        
+        db.conn.close()
+        if os.path.exists(test_db_file):
+            os.remove(test_db_file)
+        
+        return tests_passed, total_tests
+        
+    except Exception as e:
+        print(f"✗ Erro geral no teste de formato do QR Code: {e}")
+        return 0, 3
+
+def test_scan_journal():
+    """Testa o diário de leituras: recuperação após queda e descarte de final corrompido"""
+    print("\nTestando diário de leituras...")
+    
+    test_db_file = "test_temp_journal.sqlite3"
+    journal_file = test_db_file + ".scans"
+    
+    def cleanup():
+        for path in (test_db_file, journal_file):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    try:
+        from database import Database
+        from scan_journal import ScanJournal
+        
+        cleanup()
+        tests_passed = 0
+        total_tests = 5
+        
+        # Teste 1: Leituras sem commit (queda de energia) são aplicadas ao reabrir
+        db = Database(test_db_file, journal_file=journal_file)
+        db.add_person_to_pob("52998224725", "Maria da Conceição", 1)
+        event_id = db.create_event()
+        db.record_check_event("52998224725", "Maria da Conceição", event_id)
+        db.conn.close()  # Fecha sem flush(): o check de presença não chegou ao banco
+        db.journal.close()
+        
+        db = Database(test_db_file, journal_file=journal_file)
+        if db.is_person_in_pob("52998224725") and db.is_person_checked_in_event("52998224725", event_id):
+            print("✓ Leituras pendentes recuperadas do diário")
+            tests_passed += 1
+        else:
+            print("✗ Leituras pendentes perdidas")
+        
+        # Teste 2: O replay não duplica leituras já confirmadas
+        db.conn.close()
+        db.journal.close()
+        db = Database(test_db_file, journal_file=journal_file)
+        db.cursor.execute("SELECT COUNT(*) FROM CHECK_IN_OUT")
+        if db.cursor.fetchone()[0] == 1:
+            print("✓ Replay aplica cada leitura uma única vez")
+            tests_passed += 1
+        else:
+            print("✗ Replay duplicou leituras")
+        
+        # Teste 3: Linha incompleta no final do diário é descartada
+        db.remove_check_event("52998224725", event_id)
+        db.conn.close()
+        db.journal.close()
+        with open(journal_file, "ab") as f:
+            f.write(b"99\t{\"op\":\"check_out\"")
+        db = Database(test_db_file, journal_file=journal_file)
+        if (not db.is_person_checked_in_event("52998224725", event_id)
+                and db.is_person_in_pob("52998224725")):
+            print("✓ Final corrompido do diário descartado")
+            tests_passed += 1
+        else:
+            print("✗ Falha ao tratar final corrompido do diário")
+        
+        # Teste 4: Leitura que falha dentro de transaction() sai do diário mesmo com o bloco seguindo
+        with db.transaction():
+            try:
+                db.add_person_to_pob("11144477735", None, 1)  # Nome obrigatório: falha no banco
+            except Exception:
+                pass
+            db.remove_person_from_pob("52998224725")
+        with open(journal_file, "rb") as f:
+            journal_content = f.read()
+        if b"11144477735" not in journal_content and b"check_out" in journal_content:
+            print("✓ Leitura com erro descartada do diário dentro da transação")
+            tests_passed += 1
+        else:
+            print("✗ Leitura com erro ficou no diário")
+        
+        # Teste 5: Entrada que falha no meio do replay não deixa nada aplicado; as seguintes são aplicadas
+        db.conn.close()
+        db.journal.close()
+        journal = ScanJournal(journal_file)
+        journal.append({'op': 'check_in', 'cpf': "11144477735", 'nome': "João", 'grupo': 1, 'ts': None,
+                        'epoch': 1})  # Horário obrigatório no histórico: falha após gravar no POB
+        journal.append({'op': 'check_in', 'cpf': "39053344705", 'nome': "Ana", 'grupo': 1,
+                        'ts': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+        journal.close()
+        db = Database(test_db_file, journal_file=journal_file)
+        if not db.check_person_exists("11144477735") and db.is_person_in_pob("39053344705"):
+            print("✓ Entrada com erro no replay desfeita por completo")
+            tests_passed += 1
+        else:
+            print("✗ Entrada com erro no replay ficou aplicada pela metade")
+        
+        db.conn.close()
+        db.journal.close()
+        cleanup()
+        
+        return tests_passed, total_tests
+        
+    except Exception as e:
+        print(f"✗ Erro geral no teste do diário de leituras: {e}")
+        cleanup()
+        return 0, 5
+
+def test_db_migrations():
+    """Testa as migrações versionadas de um banco antigo (coluna Group e horários em texto)"""
+    print("\nTestando migrações do banco...")
+    
+    test_db_file = "test_temp_epoch.sqlite3"
+    if os.path.exists(test_db_file):
+        os.remove(test_db_file)
+    
+    try:
+        import sqlite3
+        from datetime import timedelta
+        from database import Database
+        
+        tests_passed = 0
+        total_tests = 4
+        
+        # Banco no formato antigo: coluna Group e horários só em texto
+        recent = datetime.now().replace(microsecond=0)
+        old = recent - timedelta(days=200)
+        conn = sqlite3.connect(test_db_file)
+        conn.execute('CREATE TABLE POB (CPF TEXT PRIMARY KEY, Name TEXT NOT NULL, "Group" INTEGER NOT NULL, '
+                     'Onshore INTEGER DEFAULT 1)')
+        conn.execute("INSERT INTO POB VALUES ('52998224725', 'Maria', 3, 0)")
+        conn.execute("CREATE TABLE CHECK_IN_OUT (ID INTEGER PRIMARY KEY AUTOINCREMENT, CPF TEXT, Name TEXT, "
+                     "Type TEXT NOT NULL, Timestamp TEXT NOT NULL)")
+        conn.executemany("INSERT INTO CHECK_IN_OUT (CPF, Name, Type, Timestamp) VALUES (?, ?, 'IN', ?)",
+                         [("52998224725", "Maria", moment.strftime('%Y-%m-%d %H:%M:%S'))
+                          for moment in [old] * 3 + [recent] * 4])
+        conn.commit()
+        conn.close()
+        
+        # Teste 1: Lotes pequenos convertem tudo, preservando o horário
+        db = Database(test_db_file)
+        batches = 0
+        while db.migrate_step(batch_size=2):
+            batches += 1
+        db.cursor.execute("SELECT Epoch FROM CHECK_IN_OUT ORDER BY ID DESC LIMIT 1")
+        if batches == 4 and db.cursor.fetchone()[0] == int(recent.timestamp()):
+            print("✓ Horários convertidos em lotes")
+            tests_passed += 1
+        else:
+            print("✗ Falha na conversão em lotes")
+        
+        # Teste 2: Limpeza por faixa de época remove só os registros antigos
+        db.clean_old_records()
+        db.cursor.execute("SELECT COUNT(*) FROM CHECK_IN_OUT")
+        if db.cursor.fetchone()[0] == 4:
+            print("✓ Limpeza por época")
+            tests_passed += 1
+        else:
+            print("✗ Falha na limpeza por época")
+        
+        # Teste 3: Novos registros já são gravados com época
+        db.add_person_to_pob("52998224725", "Maria", 1)
+        db.cursor.execute("SELECT COUNT(*) FROM CHECK_IN_OUT WHERE Epoch IS NULL")
+        if db.cursor.fetchone()[0] == 0 and not db.migrations.pending():
+            print("✓ Novos registros com época")
+            tests_passed += 1
+        else:
+            print("✗ Novos registros sem época")
+        
+        # Teste 4: Versão do esquema registrada e coluna renomeada sem perder o cadastro
+        if (db.migrations.version() == db.migrations.latest_version()
+                and db.find_person_by_cpf("52998224725") == ("52998224725", "Maria", 3)):
+            print("✓ Versão do esquema atualizada")
+            tests_passed += 1
+        else:
+            print("✗ Falha na versão do esquema")
+        
+        db.conn.close()
+        os.remove(test_db_file)
+        
+        return tests_passed, total_tests
+        
+    except Exception as e:
+        print(f"✗ Erro geral no teste de migrações do banco: {e}")
+        if os.path.exists(test_db_file):
+            os.remove(test_db_file)
+        return 0, 4
+
+def test_roster_snapshot():
+    """Testa o snapshot do cadastro: uso na inicialização e descarte quando o banco mudou"""
+    print("\nTestando snapshot do cadastro...")
+    
+    test_db_file = "test_temp_snapshot.sqlite3"
+    snapshot_file = test_db_file + ".snapshot"
+    
+    def cleanup():
+        for path in (test_db_file, snapshot_file):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    try:
+        from database import Database
+        from roster_snapshot import save_snapshot, load_snapshot
+        
+        cleanup()
+        tests_passed = 0
+        total_tests = 3
+        
+        # Teste 1: Snapshot gravado é aceito enquanto o banco não muda
+        db = Database(test_db_file)
+        db.add_person_to_pob("52998224725", "Maria da Conceição", 2)
+        event_id = db.create_event()
+        db.record_check_event("52998224725", "Maria da Conceição", event_id)
+        save_snapshot(db, snapshot_file)
+        db.conn.close()
+        
+        db = Database(test_db_file)
+        snapshot = load_snapshot(db, snapshot_file)
+        if (snapshot and snapshot['active_event'] == event_id
+                and snapshot['people'] == [["52998224725", "Maria da Conceição", 2, 0]]
+                and snapshot['checked'] == ["52998224725"]):
+            print("✓ Snapshot válido carregado")
+            tests_passed += 1
+        else:
+            print("✗ Snapshot válido não carregado")
+        
+        # Teste 2: Qualquer alteração no cadastro invalida o snapshot
+        db.remove_person_from_pob("52998224725")
+        if load_snapshot(db, snapshot_file) is None:
+            print("✓ Snapshot desatualizado descartado")
+            tests_passed += 1
+        else:
+            print("✗ Snapshot desatualizado aceito")
+        
+        # Teste 3: Snapshot de outro banco com o mesmo contador é descartado
+        save_snapshot(db, snapshot_file)
+        _, changes = db.get_change_counter()
+        db.conn.close()
+        os.remove(test_db_file)
+        db = Database(test_db_file)
+        db.cursor.execute("UPDATE CHANGE_COUNTER SET Changes = ?", (changes,))
+        if load_snapshot(db, snapshot_file) is None:
+            print("✓ Snapshot de outro banco descartado")
+            tests_passed += 1
+        else:
+            print("✗ Snapshot de outro banco aceito")
+        
+        db.conn.close()
+        cleanup()
+        
+        return tests_passed, total_tests
+        
+    except Exception as e:
+        print(f"✗ Erro geral no teste do snapshot do cadastro: {e}")
+        cleanup()
+        return 0, 3
+
+def test_ui_dispatcher():
+    """Testa a fila da interface: agrupamento, ordem de prioridade e descarte com fila cheia"""
+    print("\nTestando fila de chamadas da interface...")
+    
+    class FakeWidget:
+        """Substitui o widget Tk: after() só registra, a rotina é executada pelo teste."""
+        def after(self, ms, func):
+            return "job"
+        
+        def after_cancel(self, job):
+            pass
+    
+    try:
+        from ui_dispatcher import UIDispatcher, PRIORITY_SCAN, PRIORITY_STATUS, PRIORITY_PREVIEW
+        
+        tests_passed = 0
+        total_tests = 4
+        executed = []
+        
+        def record(*args):
+            executed.append(args)
+        
+        # Teste 1: Chamadas com a mesma chave executam só a mais recente
+        dispatcher = UIDispatcher(FakeWidget())
+        for frame in range(3):
+            dispatcher.post(record, "preview", frame, key="preview", priority=PRIORITY_PREVIEW)
+        dispatcher._pump()
+        if executed == [("preview", 2)] and dispatcher.coalesced == 2:
+            print("✓ Chamadas com a mesma chave agrupadas")
+            tests_passed += 1
+        else:
+            print(f"✗ Falha no agrupamento: {executed}")
+        
+        # Teste 2: Leituras antes de mensagens e mensagens antes do preview
+        executed.clear()
+        dispatcher.post(record, "preview", priority=PRIORITY_PREVIEW)
+        dispatcher.post(record, "status", priority=PRIORITY_STATUS)
+        dispatcher.post(record, "scan", priority=PRIORITY_SCAN)
+        dispatcher._pump()
+        if executed == [("scan",), ("status",), ("preview",)]:
+            print("✓ Ordem de prioridade respeitada")
+            tests_passed += 1
+        else:
+            print(f"✗ Falha na ordem de prioridade: {executed}")
+        
+        # Teste 3: Fila cheia descarta o preview mais antigo por uma mensagem e recusa outro preview
+        executed.clear()
+        dispatcher = UIDispatcher(FakeWidget(), max_size=2)
+        dispatcher.post(record, "preview", 1, priority=PRIORITY_PREVIEW)
+        dispatcher.post(record, "status", 1, priority=PRIORITY_STATUS)
+        evicted = dispatcher.post(record, "status", 2, priority=PRIORITY_STATUS)
+        refused = not dispatcher.post(record, "preview", 2, priority=PRIORITY_PREVIEW)
+        dispatcher._pump()
+        if evicted and refused and executed == [("status", 1), ("status", 2)] and dispatcher.dropped == 2:
+            print("✓ Fila cheia descarta apenas mensagens e previews")
+            tests_passed += 1
+        else:
+            print(f"✗ Falha no descarte com fila cheia: {executed}")
+        
+        # Teste 4: Leituras de QR nunca são descartadas, mesmo com a fila cheia de leituras
+        executed.clear()
+        dispatcher = UIDispatcher(FakeWidget(), max_size=2)
+        accepted = all(dispatcher.post(record, "scan", n, priority=PRIORITY_SCAN) for n in range(4))
+        dispatcher._pump()
+        if accepted and executed == [("scan", n) for n in range(4)] and dispatcher.dropped == 0:
+            print("✓ Leituras de QR nunca descartadas")
+            tests_passed += 1
+        else:
+            print(f"✗ Leitura de QR descartada: {executed}")
+        
+        return tests_passed, total_tests
+        
+    except Exception as e:
+        print(f"✗ Erro geral no teste da fila da interface: {e}")
         return 0, 4
 
+def test_log_rate_limit():
+    """Testa o limite de mensagens repetidas do log (rajada, supressão e aviso na janela seguinte)"""
+    print("\nTestando limite de mensagens repetidas do log...")
+    
+    try:
+        import logging
+        from unittest import mock
+        from log_manager import RateLimitFilter
+        
+        tests_passed = 0
+        total_tests = 3
+        rate_filter = RateLimitFilter(period=10.0, burst=3)
+        clock = [100.0]
+        
+        def record(lineno, msg="Câmera %s sem frames"):
+            return logging.LogRecord("camera_manager", logging.WARNING, __file__, lineno, msg, (0,), None)
+        
+        with mock.patch("log_manager.time.monotonic", lambda: clock[0]):
+            # Teste 1: Rajada de burst mensagens passa, as seguintes da mesma linha são suprimidas
+            passed = [rate_filter.filter(record(10)) for _ in range(5)]
+            other_line = rate_filter.filter(record(20))
+            if passed == [True, True, True, False, False] and other_line and rate_filter.suppressed_total == 2:
+                print("✓ Rajada aceita e repetições suprimidas por ponto de log")
+                tests_passed += 1
+            else:
+                print(f"✗ Falha na supressão: {passed}")
+            
+            # Teste 2: A primeira mensagem da janela seguinte informa quantas foram suprimidas
+            clock[0] += 10.0
+            first = record(10)
+            if rate_filter.filter(first) and first.getMessage() == "Câmera 0 sem frames (+2 mensagens iguais suprimidas)":
+                print("✓ Mensagem da janela seguinte informa as suprimidas")
+                tests_passed += 1
+            else:
+                print(f"✗ Falha no aviso de suprimidas: {first.getMessage()}")
+            
+            # Teste 3: Na nova janela a contagem recomeça, sem repetir o aviso
+            clock[0] += 1.0
+            second = record(10)
+            if rate_filter.filter(second) and second.getMessage() == "Câmera 0 sem frames":
+                print("✓ Contagem reiniciada na nova janela")
+                tests_passed += 1
+            else:
+                print(f"✗ Falha ao reiniciar a janela: {second.getMessage()}")
+        
+        return tests_passed, total_tests
+        
+    except Exception as e:
+        print(f"✗ Erro geral no teste do limite de mensagens do log: {e}")
+        return 0, 3
+
 def test_config_values():
     """Testa se as configurações estão corretas"""
     print("\nTestando valores de configuração...")
@@ -201,6 +696,13 @@ def run_all_tests():
         test_imports,
         test_file_structure,
         test_database_functionality,
+        test_database_transaction,
+        test_qr_payload,
+        test_scan_journal,
+        test_roster_snapshot,
+        test_db_migrations,
+        test_ui_dispatcher,
+        test_log_rate_limit,
         test_config_values
     ]
     
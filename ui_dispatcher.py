@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+ui_dispatcher.py - Fila limitada de chamadas das threads de fundo para a thread do Tk
+"""
+
+import collections
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Prioridades das chamadas (menor valor é executado primeiro)
+PRIORITY_SCAN = 0
+PRIORITY_STATUS = 1
+PRIORITY_PREVIEW = 2
+
+
+class UIDispatcher:
+    """
+    Entrega à thread principal as chamadas feitas pelas threads de câmera e de supervisão.
+    As threads apenas colocam a chamada em uma fila limitada (post); uma única rotina
+    periódica no loop do Tk executa as pendentes por ordem de prioridade: leituras de QR
+    antes de mensagens e estas antes do preview. Chamadas com a mesma chave são agrupadas
+    e só a mais recente é executada (ex.: apenas o último frame do preview). Com a fila cheia,
+    mensagens e previews podem ser descartados; leituras de QR nunca são.
+    """
+
+    def __init__(self, widget, interval_ms=15, max_size=64, max_per_pump=32):
+        """
+        Inicializa o despachante.
+
+        Args:
+            widget: Widget Tk usado para agendar a rotina periódica (after)
+            interval_ms: Intervalo entre execuções da rotina periódica
+            max_size: Máximo de chamadas pendentes na fila (leituras de QR podem ultrapassá-lo)
+            max_per_pump: Máximo de chamadas executadas por execução da rotina
+        """
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.max_size = max_size
+        self.max_per_pump = max_per_pump
+
+        self._lock = threading.Lock()
+        self._queues = {priority: collections.deque()
+                        for priority in (PRIORITY_SCAN, PRIORITY_STATUS, PRIORITY_PREVIEW)}
+        self._keyed = {}  # chave -> entrada pendente [horário, função, argumentos, chave]
+        self._size = 0
+        self._job = None
+        self.running = False
+
+        # Métricas
+        self.posted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.scan_overflow = 0  # Leituras aceitas com a fila já cheia
+        self.max_depth = 0
+        self.max_wait = 0.0
+
+    def start(self):
+        """Inicia a rotina periódica (deve ser chamado na thread principal)."""
+        if not self.running:
+            self.running = True
+            self._job = self.widget.after(self.interval_ms, self._pump)
+
+    def stop(self):
+        """Para a rotina periódica; chamadas ainda pendentes são descartadas."""
+        self.running = False
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass  # Janela já destruída
+            self._job = None
+
+    def post(self, func, *args, key=None, priority=PRIORITY_STATUS):
+        """
+        Agenda func(*args) na thread principal. Pode ser chamado de qualquer thread.
+
+        Args:
+            func: Função a executar
+            key: Chave de agrupamento; uma chamada pendente com a mesma chave é substituída
+            priority: PRIORITY_SCAN, PRIORITY_STATUS ou PRIORITY_PREVIEW
+
+        Returns:
+            bool: False se a chamada foi descartada por fila cheia (nunca com PRIORITY_SCAN)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.posted += 1
+
+            if key is not None:
+                entry = self._keyed.get(key)
+                if entry is not None:
+                    entry[0], entry[1], entry[2] = now, func, args
+                    self.coalesced += 1
+                    return True
+
+            if self._size >= self.max_size and not self._evict_below(priority):
+                if priority != PRIORITY_SCAN:
+                    self.dropped += 1
+                    return False
+                # Uma leitura descartada seria um check in perdido (e bloqueada pelo cooldown)
+                self.scan_overflow += 1
+
+            entry = [now, func, args, key]
+            self._queues[priority].append(entry)
+            if key is not None:
+                self._keyed[key] = entry
+            self._size += 1
+            self.max_depth = max(self.max_depth, self._size)
+        return True
+
+    def _evict_below(self, priority):
+        """Descarta a chamada mais antiga de prioridade menor que a informada (com o lock)."""
+        for level in sorted(self._queues, reverse=True):
+            if level <= priority:
+                break
+            if self._queues[level]:
+                entry = self._queues[level].popleft()
+                if entry[3] is not None:
+                    self._keyed.pop(entry[3], None)
+                self._size -= 1
+                self.dropped += 1
+                return True
+        return False
+
+    def _take(self, count):
+        """Retira até count chamadas pendentes por ordem de prioridade."""
+        entries = []
+        with self._lock:
+            for level in sorted(self._queues):
+                queue = self._queues[level]
+                while queue and len(entries) < count:
+                    entry = queue.popleft()
+                    if entry[3] is not None:
+                        self._keyed.pop(entry[3], None)
+                    entries.append(entry)
+            self._size -= len(entries)
+        return entries
+
+    def _pump(self):
+        """Executa as chamadas pendentes na thread principal e se reagenda."""
+        self._job = None
+        for queued_at, func, args, _ in self._take(self.max_per_pump):
+            self.max_wait = max(self.max_wait, time.monotonic() - queued_at)
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error("Erro ao executar chamada na interface: %s", e)
+            self.executed += 1
+
+        if self.running:
+            self._job = self.widget.after(self.interval_ms, self._pump)
+
+    def depth(self):
+        """Número de chamadas pendentes."""
+        with self._lock:
+            return self._size
+
+    def get_stats(self):
+        """Retorna as métricas da fila."""
+        with self._lock:
+            depth_by_priority = {level: len(queue) for level, queue in self._queues.items()}
+            return {
+                'depth': self._size,
+                'depth_scan': depth_by_priority[PRIORITY_SCAN],
+                'depth_status': depth_by_priority[PRIORITY_STATUS],
+                'depth_preview': depth_by_priority[PRIORITY_PREVIEW],
+                'max_depth': self.max_depth,
+                'posted': self.posted,
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'scan_overflow': self.scan_overflow,
+                'max_wait_ms': self.max_wait * 1000,
+            }
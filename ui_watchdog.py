@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+ui_watchdog.py - Detector de travamentos da interface com amostragem da pilha da thread principal
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Quadros mais internos da pilha usados para identificar a origem de um travamento
+STACK_DEPTH = 8
+
+
+class UIWatchdog:
+    """
+    Detecta travamentos do loop principal do Tk. Um batimento agendado com after()
+    marca o horário a cada heartbeat_ms; uma thread verifica esse horário e, quando o
+    batimento atrasa mais que threshold_ms, amostra a pilha da thread principal
+    (sys._current_frames) até o loop voltar a responder. Cada travamento é atribuído à
+    pilha mais amostrada e os totais por pilha são gravados em um arquivo JSON,
+    acumulando entre execuções.
+    """
+
+    def __init__(self, root, threshold_ms=100, heartbeat_ms=50, sample_interval_ms=20,
+                 report_file="ui_stalls.json", flush_interval=60):
+        """
+        Inicializa o detector.
+
+        Args:
+            root: Janela Tk cujo loop principal é supervisionado
+            threshold_ms: Atraso do batimento a partir do qual há travamento
+            heartbeat_ms: Intervalo do batimento na thread principal
+            sample_interval_ms: Intervalo de verificação (e de amostragem durante um travamento)
+            report_file: Arquivo JSON com o relatório agregado (None não grava)
+            flush_interval: Segundos entre gravações do relatório quando há novos travamentos
+        """
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.sample_interval = sample_interval_ms / 1000
+        self.report_file = report_file
+        self.flush_interval = flush_interval
+
+        self.running = False
+        self.thread = None
+        self._job = None
+        self._main_thread_id = None
+        self._last_beat = 0.0
+        self._lock = threading.Lock()
+
+        # Travamento em andamento: pilha -> amostras
+        self._current_samples = None
+        self._stall_started = 0.0
+
+        # Relatório agregado: pilha -> métricas
+        self.stacks = self._load_report()
+        self.stall_count = 0
+        self.max_stall = 0.0
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def start(self):
+        """Inicia o batimento e a thread de supervisão (chamar na thread do Tk)."""
+        self.running = True
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._job = self.root.after(self.heartbeat_ms, self._beat)
+        self.thread = threading.Thread(target=self._run, daemon=True, name="ui-watchdog")
+        self.thread.start()
+        logger.info("Supervisão da interface iniciada (limite %.0fms)", self.threshold * 1000)
+
+    def stop(self):
+        """Para a supervisão e grava o relatório."""
+        self.running = False
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass  # Janela já destruída
+            self._job = None
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        self.flush()
+
+    def _beat(self):
+        """Batimento na thread principal."""
+        self._last_beat = time.monotonic()
+        if self.running:
+            self._job = self.root.after(self.heartbeat_ms, self._beat)
+
+    def _run(self):
+        """Loop da thread de supervisão."""
+        heartbeat = self.heartbeat_ms / 1000
+        while self.running:
+            time.sleep(self.sample_interval)
+            now = time.monotonic()
+            last_beat = self._last_beat
+            delay = now - last_beat - heartbeat
+
+            if delay > self.threshold:
+                if self._current_samples is None:
+                    self._current_samples = {}
+                    self._stall_started = last_beat + heartbeat
+                self._sample_main_stack()
+            elif self._current_samples is not None:
+                # O loop voltou a responder: encerra o travamento no último batimento
+                self._finish_stall(last_beat - self._stall_started)
+
+            if self._dirty and now - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def _sample_main_stack(self):
+        """Registra uma amostra da pilha atual da thread principal."""
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None and len(stack) < STACK_DEPTH:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}")
+            frame = frame.f_back
+        key = " <- ".join(stack)
+        self._current_samples[key] = self._current_samples.get(key, 0) + 1
+
+    def _finish_stall(self, duration):
+        """Atribui o travamento encerrado à pilha mais amostrada."""
+        samples, self._current_samples = self._current_samples, None
+        if not samples:
+            return
+        key = max(samples, key=samples.get)
+        duration_ms = max(duration, self.threshold) * 1000
+
+        with self._lock:
+            entry = self.stacks.setdefault(key, {
+                'stack': key.split(" <- "), 'stalls': 0, 'samples': 0,
+                'total_ms': 0.0, 'max_ms': 0.0, 'last_seen': None,
+            })
+            entry['stalls'] += 1
+            entry['samples'] += sum(samples.values())
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['last_seen'] = datetime.now().isoformat(timespec="seconds")
+            self.stall_count += 1
+            self.max_stall = max(self.max_stall, duration_ms)
+            self._dirty = True
+
+        logger.warning("Interface travada por %.0fms em %s", duration_ms, entry['stack'][0])
+
+    def _load_report(self):
+        """Carrega o relatório de execuções anteriores, se existir."""
+        if not self.report_file or not os.path.exists(self.report_file):
+            return {}
+        try:
+            with open(self.report_file, "r", encoding="utf-8") as f:
+                report = json.load(f)
+            return {" <- ".join(entry['stack']): entry for entry in report.get('stacks', [])}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Relatório %s ignorado: %s", self.report_file, e)
+            return {}
+
+    def flush(self):
+        """Grava o relatório agregado (pilhas ordenadas pelo tempo total travado)."""
+        self._last_flush = time.monotonic()
+        if not self.report_file or not self._dirty:
+            return
+        with self._lock:
+            stacks = sorted(self.stacks.values(), key=lambda entry: entry['total_ms'], reverse=True)
+            report = {
+                'updated': datetime.now().isoformat(timespec="seconds"),
+                'threshold_ms': self.threshold * 1000,
+                'stacks': stacks,
+            }
+            self._dirty = False
+
+        temp_file = self.report_file + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=1)
+            os.replace(temp_file, self.report_file)
+        except OSError as e:
+            logger.error("Erro ao gravar relatório de travamentos: %s", e)
+
+    def get_stats(self):
+        """Retorna as métricas da execução atual."""
+        return {
+            'stalls': self.stall_count,
+            'max_stall_ms': self.max_stall,
+            'stalled_now': self._current_samples is not None,
+            'distinct_stacks': len(self.stacks),
+        }